@@ -4,6 +4,8 @@ Add missing features to the dataset for model prediction
 
 import pandas as pd
 
+from src.utils.dataframe_io import load_dataset
+
 def add_missing_features():
     """Add listing_per, listing_pbr, listing_eps features"""
     print("=" * 80)
@@ -13,7 +15,7 @@ def add_missing_features():
 
     # Load dataset
     file_path = "data/raw/ipo_full_dataset_2022_2025.csv"
-    df = pd.read_csv(file_path)
+    df = load_dataset(file_path)
 
     print(f"Loaded {len(df)} records from {file_path}")
     print()
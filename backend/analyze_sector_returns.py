@@ -8,6 +8,8 @@ import numpy as np
 from scipy.stats import spearmanr
 import matplotlib.pyplot as plt
 
+from src.utils.dataframe_io import load_dataset
+
 
 def calculate_returns(df):
     """Calculate return metrics"""
@@ -62,7 +64,7 @@ def main():
     print()
 
     # Load full dataset
-    df = pd.read_csv("data/raw/ipo_full_dataset_2022_2025.csv")
+    df = load_dataset("data/raw/ipo_full_dataset_2022_2025.csv")
 
     # Load sector data from 38.co.kr
     sector_data = pd.read_csv("data/raw/38_subscription_data.csv")
@@ -100,6 +100,9 @@ def main():
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Release the pooled keep-alive HTTP connections
+        collector.close()
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@ Collect Full IPO Data (2022-2025)
 Uses optimized collection with caching and progress monitoring
 """
 
+import argparse
 from src.data_collection.ipo_collector import IPODataCollector
 from src.config.settings import settings
 import logging
@@ -19,6 +20,14 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Collect full IPO dataset for 2022-2025"""
+    parser = argparse.ArgumentParser(description="Collect full IPO dataset")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached KRX responses from earlier runs and re-fetch them",
+    )
+    args = parser.parse_args()
+
     print("=" * 80)
     print("IPO DATA COLLECTION (2022-2025)")
     print("=" * 80)
@@ -35,7 +44,10 @@ def main():
     print()
 
     # Initialize collector
-    collector = IPODataCollector(use_sample_data=False)
+    collector = IPODataCollector(use_sample_data=False, refresh_cache=args.refresh)
+    output_file = collector.full_dataset_file(
+        settings.DATA_START_YEAR, settings.DATA_END_YEAR
+    )
 
     try:
         # Collect full dataset with optimization
@@ -55,9 +67,7 @@ def main():
         print("COLLECTION COMPLETE")
         print("=" * 80)
         print(f"Total IPOs collected: {len(full_df)}")
-        print(
-            f"Output file: data/raw/ipo_full_dataset_{settings.DATA_START_YEAR}_{settings.DATA_END_YEAR}.csv"
-        )
+        print(f"Output file: {output_file}")
 
         # Show API usage
         if hasattr(collector, "krx_client"):
@@ -149,9 +159,7 @@ def main():
         print("=" * 80)
         print(f"End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print()
-        print(
-            f"Data saved to: data/raw/ipo_full_dataset_{settings.DATA_START_YEAR}_{settings.DATA_END_YEAR}.csv"
-        )
+        print(f"Data saved to: {output_file}")
         print()
 
     except Exception as e:
@@ -169,6 +177,9 @@ def main():
         print()
         print("You can resume collection by running this script again.")
         print("Completed data is cached and will not be re-fetched.")
+    finally:
+        # Release the pooled keep-alive HTTP connections
+        collector.close()
 
 
 if __name__ == "__main__":
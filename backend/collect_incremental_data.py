@@ -6,6 +6,7 @@ Only collect new IPOs since last run
 from src.data_collection.ipo_collector import IPODataCollector
 from src.utils.last_run_tracker import LastRunTracker
 from src.config.settings import settings
+from src.utils.dataframe_io import load_dataset, parquet_path
 import logging
 from datetime import datetime, date
 import pandas as pd
@@ -118,12 +119,12 @@ def main():
         # Load existing data and merge
         main_file = Path(f"data/raw/ipo_full_dataset_{settings.DATA_START_YEAR}_{settings.DATA_END_YEAR}.csv")
 
-        if main_file.exists():
+        if main_file.exists() or parquet_path(main_file).exists():
             print("=" * 80)
             print("MERGING WITH EXISTING DATA")
             print("=" * 80)
 
-            existing_df = pd.read_csv(main_file)
+            existing_df = load_dataset(main_file)
             print(f"Existing records: {len(existing_df)}")
             print(f"New records: {len(new_df)}")
 
@@ -207,6 +208,9 @@ def main():
 
         import traceback
         traceback.print_exc()
+    finally:
+        # Release the pooled keep-alive HTTP connections
+        collector.close()
 
 
 if __name__ == "__main__":
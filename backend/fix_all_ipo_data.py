@@ -5,17 +5,19 @@ Fix all IPO data discrepancies by updating with 38.co.kr data
 import pandas as pd
 from pathlib import Path
 
+from src.utils.dataframe_io import load_dataset, parquet_path, save_dataset
+
 
 def fix_dataset(dataset_path: str, subscription_data: pd.DataFrame) -> int:
     """Fix a single dataset file and return number of updates"""
-    if not Path(dataset_path).exists():
+    if not Path(dataset_path).exists() and not parquet_path(dataset_path).exists():
         print(f"⏭️  Skipping {dataset_path} (not found)")
         return 0
 
     print(f"\n📄 Processing {Path(dataset_path).name}")
 
     # Load dataset
-    full_dataset = pd.read_csv(dataset_path)
+    full_dataset = load_dataset(dataset_path)
     print(f"   Records: {len(full_dataset)}")
 
     # Convert code columns to string for comparison
@@ -68,7 +70,7 @@ def fix_dataset(dataset_path: str, subscription_data: pd.DataFrame) -> int:
                 full_dataset.at[idx, "shares_offered"] = sub_row["shares_offered"]
 
     # Save updated dataset
-    full_dataset.to_csv(dataset_path, index=False, encoding="utf-8-sig")
+    save_dataset(full_dataset, dataset_path, bom=True)
 
     print(f"   ✅ Updated {price_updates} IPO prices")
     return price_updates
@@ -5,6 +5,8 @@ Fix 명인제약 IPO data with correct values from 38.co.kr
 import pandas as pd
 from pathlib import Path
 
+from src.utils.dataframe_io import load_dataset, parquet_path, save_dataset
+
 # Correct values from 38.co.kr no=2220
 CORRECT_DATA = {
     "code": "317450",
@@ -19,14 +21,14 @@ CORRECT_DATA = {
 
 def fix_csv_file(file_path: Path):
     """Fix 명인제약 data in a CSV file"""
-    if not file_path.exists():
+    if not file_path.exists() and not parquet_path(file_path).exists():
         print(f"⏭️  Skipping {file_path} (not found)")
         return False
 
     print(f"\n📄 Processing {file_path.name}")
 
-    # Read CSV
-    df = pd.read_csv(file_path)
+    # Read dataset (Parquet copy if current)
+    df = load_dataset(file_path)
 
     # Check if 명인제약 exists
     mask = df["code"].astype(str) == CORRECT_DATA["code"]
@@ -48,7 +50,7 @@ def fix_csv_file(file_path: Path):
             df.loc[mask, col] = value
 
     # Save back
-    df.to_csv(file_path, index=False, encoding="utf-8-sig")
+    save_dataset(df, file_path, bom=True)
 
     print(f"   ✅ Updated to correct values:")
     print(f"     price_lower: {CORRECT_DATA['ipo_price_lower']}")
@@ -3,9 +3,11 @@ Generate predictions for frontend using expanded 2018-2025 dataset
 Creates ipo_precomputed.json with predictions for all historical IPOs
 """
 
+import logging
+
 import pandas as pd
 import numpy as np
-import json
+import orjson
 from pathlib import Path
 from datetime import datetime
 import sys
@@ -14,56 +16,238 @@ sys.path.append(str(Path(__file__).parent))
 
 from src.features.feature_engineering import IPOFeatureEngineer
 from src.models.ipo_predictor import IPOPricePredictor
+from src.utils.dataframe_io import load_dataset
+
+logger = logging.getLogger(__name__)
+
+# Columns exported to the frontend JSON
+OUTPUT_COLUMNS = [
+    "code",
+    "company_name",
+    "listing_date",
+    "industry",
+    "theme",
+    "ipo_price",
+    "ipo_price_lower",
+    "ipo_price_upper",
+    "ipo_price_confirmed",
+    "shares_offered",
+    "institutional_demand_rate",
+    "subscription_competition_rate",
+    "lockup_ratio",
+    "day0_high",
+    "day0_close",
+    "day1_close",
+]
+
+# Raw columns read by IPOFeatureEngineer before feature selection
+ENGINEER_INPUT_COLUMNS = [
+    "paid_in_capital",
+    "estimated_market_cap",
+    "allocation_ratio_equal",
+    "allocation_ratio_proportional",
+    "listing_method",
+]
+
+
+# Exported columns cast once to nullable dtypes (missing values become pd.NA)
+INT_OUTPUT_COLUMNS = [
+    "ipo_price",
+    "ipo_price_confirmed",
+    "ipo_price_lower",
+    "ipo_price_upper",
+    "shares_offered",
+    "day0_high",
+    "day0_close",
+    "day1_close",
+]
+FLOAT_OUTPUT_COLUMNS = [
+    "institutional_demand_rate",
+    "subscription_competition_rate",
+    "lockup_ratio",
+]
+
+
+def prepare_output_columns(df_filtered):
+    """
+    Cast exported columns to nullable Int64/Float64 in one pass per column
+
+    Missing optional columns are added as all-NA, and empty industry/theme
+    values are replaced with their defaults.
+    """
+    out = df_filtered.reindex(
+        columns=[
+            "code",
+            "company_name",
+            "listing_date",
+            "industry",
+            "theme",
+            *INT_OUTPUT_COLUMNS,
+            *FLOAT_OUTPUT_COLUMNS,
+        ]
+    )
 
+    ints = out[INT_OUTPUT_COLUMNS].apply(pd.to_numeric, errors="coerce")
+    ints = ints.replace([np.inf, -np.inf], np.nan)
+    out[INT_OUTPUT_COLUMNS] = np.trunc(ints).astype("Int64")
+    out[FLOAT_OUTPUT_COLUMNS] = (
+        out[FLOAT_OUTPUT_COLUMNS]
+        .apply(pd.to_numeric, errors="coerce")
+        .astype("Float64")
+    )
 
-def safe_value(val):
-    """Convert value to JSON-safe format (handle NaN, None, etc.)"""
-    if pd.isna(val):
-        return None
-    return val
+    # Zero or missing ipo_price falls back to the confirmed price
+    out["ipo_price"] = out["ipo_price"].where(
+        out["ipo_price"].fillna(0) != 0, out["ipo_price_confirmed"]
+    )
 
+    for col, default in (("industry", "기타"), ("theme", "주권")):
+        out[col] = out[col].where(out[col].notna() & (out[col] != ""), default)
 
-def safe_int(val):
-    """Safely convert to int or return None"""
-    if pd.isna(val):
-        return None
-    try:
-        return int(val)
-    except:
-        return None
+    return out
 
 
-def safe_float(val):
-    """Safely convert to float or return None"""
-    if pd.isna(val):
-        return None
-    try:
-        return float(val)
-    except:
+def _json_default(obj):
+    """Encode pandas missing values left by nullable dtypes as null"""
+    if obj is pd.NA:
         return None
+    raise TypeError
+
+
+def iter_ipo_records(df_out, predictions):
+    """Yield one frontend IPO record per row of prepare_output_columns() output"""
+    for idx, row in enumerate(df_out.itertuples(index=False)):
+        ipo_price = None if row.ipo_price is pd.NA else int(row.ipo_price)
+        pred_day0_high = int(round(predictions["day0_high"][idx]))
+        pred_day0_close = int(round(predictions["day0_close"][idx]))
+        pred_day1_close = int(round(predictions["day1_close"][idx]))
+
+        ipo_dict = {
+            "id": idx,
+            "code": str(row.code),
+            "company_name": str(row.company_name),
+            "listing_date": str(row.listing_date),
+            "industry": row.industry,
+            "theme": row.theme,
+            "ipo_price_lower": row.ipo_price_lower,
+            "ipo_price_upper": row.ipo_price_upper,
+            "ipo_price_confirmed": ipo_price,
+            "shares_offered": row.shares_offered,
+            "institutional_demand_rate": row.institutional_demand_rate,
+            "subscription_competition_rate": row.subscription_competition_rate,
+            "lockup_ratio": row.lockup_ratio,
+            "predicted_day0_high": pred_day0_high,
+            "predicted_day0_close": pred_day0_close,
+            "predicted_day1_close": pred_day1_close,
+        }
+
+        # Calculate return percentages
+        if ipo_price:
+            ipo_dict["predicted_day0_high_return"] = round(
+                (pred_day0_high - ipo_price) / ipo_price * 100, 2
+            )
+            ipo_dict["predicted_day0_close_return"] = round(
+                (pred_day0_close - ipo_price) / ipo_price * 100, 2
+            )
+            ipo_dict["predicted_day1_close_return"] = round(
+                (pred_day1_close - ipo_price) / ipo_price * 100, 2
+            )
+            ipo_dict["predicted_day0_to_day1_return"] = round(
+                (pred_day1_close - pred_day0_close) / pred_day0_close * 100, 2
+            )
+
+        # Add actual values if available (check each value individually)
+        actual_day0_high = row.day0_high
+        actual_day0_close = row.day0_close
+        actual_day1_close = row.day1_close
+        if (
+            actual_day0_high is not pd.NA
+            and actual_day0_close is not pd.NA
+            and actual_day1_close is not pd.NA
+        ):
+            actual_day0_high = int(actual_day0_high)
+            actual_day0_close = int(actual_day0_close)
+            actual_day1_close = int(actual_day1_close)
+
+            ipo_dict["actual_day0_high"] = actual_day0_high
+            ipo_dict["actual_day0_close"] = actual_day0_close
+            ipo_dict["actual_day1_close"] = actual_day1_close
+
+            # Calculate actual returns
+            if ipo_price:
+                ipo_dict["actual_day0_high_return"] = round(
+                    (actual_day0_high - ipo_price) / ipo_price * 100, 2
+                )
+                ipo_dict["actual_day0_close_return"] = round(
+                    (actual_day0_close - ipo_price) / ipo_price * 100, 2
+                )
+                ipo_dict["actual_day1_close_return"] = round(
+                    (actual_day1_close - ipo_price) / ipo_price * 100, 2
+                )
+
+        yield ipo_dict
+
+
+def write_predictions_json(output_path, metadata, records):
+    """
+    Stream predictions JSON to disk, encoding one record at a time
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(output_path, "wb", buffering=1 << 20) as f:
+        f.write(b'{"metadata":' + orjson.dumps(metadata) + b',"ipos":[')
+        for record in records:
+            if count:
+                f.write(b",")
+            f.write(
+                orjson.dumps(
+                    record,
+                    default=_json_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                )
+            )
+            count += 1
+        f.write(b"]}")
+    return count
 
 
 def main():
     """Generate predictions for frontend"""
-    print("=" * 80)
-    print("GENERATING FRONTEND PREDICTIONS (2018-2025)")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("GENERATING FRONTEND PREDICTIONS (2018-2025)")
+    logger.info("=" * 80)
+    logger.info("")
+
+    # 1. Load trained models and transformers
+    logger.info("Loading trained models and transformers...")
+    predictor = IPOPricePredictor(model_type="random_forest")
+    predictor.load_models("models")
+
+    engineer = IPOFeatureEngineer()
+    engineer.load_transformers("data/processed")
+    logger.info("✅ Loaded models and transformers")
+    logger.info("")
 
-    # 1. Load expanded dataset
-    print("Loading dataset...")
+    # 2. Load expanded dataset (only the columns exported or used as features)
+    logger.info("Loading dataset...")
     input_file = "data/raw/ipo_full_dataset_2018_2025.csv"
-    df = pd.read_csv(input_file)
-    print(f"✅ Loaded {len(df)} IPO records")
-    print()
+    wanted = set(OUTPUT_COLUMNS) | set(ENGINEER_INPUT_COLUMNS)
+    wanted.update(engineer.feature_names)
+    df = load_dataset(
+        input_file, usecols=lambda col: col in wanted, dtype={"code": str}
+    )
+    logger.info(f"✅ Loaded {len(df)} IPO records")
+    logger.info("")
 
     # Merge ipo_price columns (2018-2021 uses 'ipo_price', 2022-2025 uses 'ipo_price_confirmed')
     if "ipo_price" in df.columns and "ipo_price_confirmed" in df.columns:
         df["ipo_price"] = df["ipo_price"].fillna(df["ipo_price_confirmed"])
     elif "ipo_price_confirmed" in df.columns:
         df["ipo_price"] = df["ipo_price_confirmed"]
-    print(f"✅ Merged ipo_price columns")
-    print()
+    logger.info(f"✅ Merged ipo_price columns")
+    logger.info("")
 
     # Filter to only rows with necessary data for prediction
     required_cols = [
@@ -79,27 +263,17 @@ def main():
 
     # Check which columns exist and filter
     df_filtered = df.dropna(subset=required_cols).reset_index(drop=True)
-    print(f"After filtering for complete data: {len(df_filtered)} records")
+    logger.info(f"After filtering for complete data: {len(df_filtered)} records")
 
     # Show distribution by year
     year_counts = df_filtered["listing_date"].str[:4].value_counts().sort_index()
-    print("Distribution by year:")
+    logger.info("Distribution by year:")
     for year, count in year_counts.items():
-        print(f"  {year}: {count} IPOs")
-    print()
-
-    # 2. Load trained models and transformers
-    print("Loading trained models and transformers...")
-    predictor = IPOPricePredictor(model_type="random_forest")
-    predictor.load_models("models")
-
-    engineer = IPOFeatureEngineer()
-    engineer.load_transformers("data/processed")
-    print("✅ Loaded models and transformers")
-    print()
+        logger.info(f"  {year}: {count} IPOs")
+    logger.info("")
 
     # 3. Prepare features
-    print("Engineering features...")
+    logger.info("Engineering features...")
 
     # Rename columns to match expected names
     df_renamed = df_filtered.copy()
@@ -113,170 +287,93 @@ def main():
         df_renamed["theme"] = "주권"
 
     features_df = engineer.engineer_features(df_renamed, fit=False)
-    X = features_df[engineer.feature_names].values
-    print(f"✅ Feature matrix: {X.shape}")
-    print()
+    # Tree models cast to float32 internally; hand them a contiguous float32 matrix
+    X = np.ascontiguousarray(
+        features_df[engineer.feature_names].to_numpy(dtype=np.float32)
+    )
+    logger.info(f"✅ Feature matrix: {X.shape}")
+    logger.info("")
 
     # 4. Generate predictions
-    print("Generating predictions...")
+    logger.info("Generating predictions...")
     predictions = predictor.predict(X)
-    print("✅ Generated predictions for all targets")
-    print()
-
-    # 5. Create output JSON (matching frontend expected format)
-    print("Creating output JSON...")
-
-    ipos_list = []
-    for idx, row in df_filtered.iterrows():
-        ipo_price = safe_int(row.get("ipo_price")) or safe_int(
-            row.get("ipo_price_confirmed")
-        )
-        pred_day0_high = int(round(predictions["day0_high"][idx]))
-        pred_day0_close = int(round(predictions["day0_close"][idx]))
-        pred_day1_close = int(round(predictions["day1_close"][idx]))
-
-        ipo_dict = {
-            "id": int(idx),
-            "code": str(row["code"]),
-            "company_name": str(row["company_name"]),
-            "listing_date": str(row["listing_date"]),
-            "industry": safe_value(row.get("industry", "기타")) or "기타",
-            "theme": safe_value(row.get("theme", "주권")) or "주권",
-            "ipo_price_lower": safe_int(row.get("ipo_price_lower")),
-            "ipo_price_upper": safe_int(row.get("ipo_price_upper")),
-            "ipo_price_confirmed": ipo_price,
-            "shares_offered": safe_int(row.get("shares_offered")),
-            "institutional_demand_rate": safe_float(
-                row.get("institutional_demand_rate")
-            ),
-            "subscription_competition_rate": safe_float(
-                row.get("subscription_competition_rate")
-            ),
-            "lockup_ratio": safe_float(row.get("lockup_ratio")),
-            "predicted_day0_high": pred_day0_high,
-            "predicted_day0_close": pred_day0_close,
-            "predicted_day1_close": pred_day1_close,
-        }
-
-        # Calculate return percentages
-        if ipo_price:
-            ipo_dict["predicted_day0_high_return"] = round(
-                (pred_day0_high - ipo_price) / ipo_price * 100, 2
-            )
-            ipo_dict["predicted_day0_close_return"] = round(
-                (pred_day0_close - ipo_price) / ipo_price * 100, 2
-            )
-            ipo_dict["predicted_day1_close_return"] = round(
-                (pred_day1_close - ipo_price) / ipo_price * 100, 2
-            )
-            ipo_dict["predicted_day0_to_day1_return"] = round(
-                (pred_day1_close - pred_day0_close) / pred_day0_close * 100, 2
-            )
-
-        # Add actual values if available (check each value individually)
-        if (
-            "day0_high" in row
-            and pd.notna(row.get("day0_high"))
-            and "day0_close" in row
-            and pd.notna(row.get("day0_close"))
-            and "day1_close" in row
-            and pd.notna(row.get("day1_close"))
-        ):
-            actual_day0_high = int(row["day0_high"])
-            actual_day0_close = int(row["day0_close"])
-            actual_day1_close = int(row["day1_close"])
-
-            ipo_dict["actual_day0_high"] = actual_day0_high
-            ipo_dict["actual_day0_close"] = actual_day0_close
-            ipo_dict["actual_day1_close"] = actual_day1_close
-
-            # Calculate actual returns
-            if ipo_price:
-                ipo_dict["actual_day0_high_return"] = round(
-                    (actual_day0_high - ipo_price) / ipo_price * 100, 2
-                )
-                ipo_dict["actual_day0_close_return"] = round(
-                    (actual_day0_close - ipo_price) / ipo_price * 100, 2
-                )
-                ipo_dict["actual_day1_close_return"] = round(
-                    (actual_day1_close - ipo_price) / ipo_price * 100, 2
-                )
-
-        ipos_list.append(ipo_dict)
-
-    # Create output structure (matching frontend expected format)
-    output = {
-        "metadata": {
-            "generated_at": datetime.now().isoformat(),
-            "model_version": "v2.1",
-            "total_ipos": len(ipos_list),
-            "date_range": {
-                "start": df_filtered["listing_date"].min(),
-                "end": df_filtered["listing_date"].max(),
-            },
-            "features_used": engineer.feature_names,
-            "model_type": "random_forest",
+    logger.info("✅ Generated predictions for all targets")
+    logger.info("")
+
+    # 5. Create output metadata (matching frontend expected format)
+    metadata = {
+        "generated_at": datetime.now().isoformat(),
+        "model_version": "v2.1",
+        "total_ipos": len(df_filtered),
+        "date_range": {
+            "start": df_filtered["listing_date"].min(),
+            "end": df_filtered["listing_date"].max(),
         },
-        "ipos": ipos_list,
+        "features_used": engineer.feature_names,
+        "model_type": "random_forest",
     }
 
-    # 6. Save to frontend public directory
+    # 6. Stream records to frontend public directory
+    logger.info("Writing output JSON...")
     output_path = Path("../frontend/public/ipo_precomputed.json")
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    total_ipos = write_predictions_json(
+        output_path,
+        metadata,
+        iter_ipo_records(prepare_output_columns(df_filtered), predictions),
+    )
 
-    print(f"✅ Saved {len(ipos_list)} IPO predictions to {output_path}")
-    print()
+    logger.info(f"✅ Saved {total_ipos} IPO predictions to {output_path}")
+    logger.info("")
 
     # 7. Show statistics
-    print("=" * 80)
-    print("PREDICTION STATISTICS")
-    print("=" * 80)
-    print(f"Total IPOs: {len(ipos_list)}")
-    print(
-        f"Date range: {output['metadata']['date_range']['start']} to {output['metadata']['date_range']['end']}"
+    logger.info("=" * 80)
+    logger.info("PREDICTION STATISTICS")
+    logger.info("=" * 80)
+    logger.info(f"Total IPOs: {total_ipos}")
+    logger.info(
+        f"Date range: {metadata['date_range']['start']} to {metadata['date_range']['end']}"
     )
-    print()
-
-    # Calculate prediction ranges
-    day0_highs = [p["predicted_day0_high"] for p in ipos_list]
-    day0_closes = [p["predicted_day0_close"] for p in ipos_list]
-    day1_closes = [p["predicted_day1_close"] for p in ipos_list]
-
-    print("Predicted Day 0 High:")
-    print(f"  Mean: ₩{np.mean(day0_highs):,.0f}")
-    print(f"  Median: ₩{np.median(day0_highs):,.0f}")
-    print(f"  Range: ₩{np.min(day0_highs):,.0f} - ₩{np.max(day0_highs):,.0f}")
-    print()
-
-    print("Predicted Day 1 Close:")
-    print(f"  Mean: ₩{np.mean(day1_closes):,.0f}")
-    print(f"  Median: ₩{np.median(day1_closes):,.0f}")
-    print(f"  Range: ₩{np.min(day1_closes):,.0f} - ₩{np.max(day1_closes):,.0f}")
-    print()
+    logger.info("")
+
+    # Calculate prediction ranges (rounded like the exported values)
+    for label, target in [
+        ("Predicted Day 0 High", "day0_high"),
+        ("Predicted Day 1 Close", "day1_close"),
+    ]:
+        values = np.rint(predictions[target])
+        low, median, high = np.quantile(values, [0.0, 0.5, 1.0])
+
+        logger.info(f"{label}:")
+        logger.info(f"  Mean: ₩{values.mean():,.0f}")
+        logger.info(f"  Median: ₩{median:,.0f}")
+        logger.info(f"  Range: ₩{low:,.0f} - ₩{high:,.0f}")
+        logger.info("")
 
     # Show distribution by year
-    years = {}
-    for ipo in ipos_list:
-        year = ipo["listing_date"][:4]
-        years[year] = years.get(year, 0) + 1
-
-    print("Distribution by year:")
-    for year in sorted(years.keys()):
-        print(f"  {year}: {years[year]} IPOs")
-    print()
+    logger.info("Distribution by year:")
+    for year, count in year_counts.items():
+        logger.info(f"  {year}: {count} IPOs")
+    logger.info("")
 
     # Show counts with actual data
-    with_actual = sum(1 for p in ipos_list if "actual_day0_high" in p)
-    print(f"IPOs with actual price data: {with_actual}/{len(ipos_list)}")
-    print()
+    actual_cols = ["day0_high", "day0_close", "day1_close"]
+    if set(actual_cols).issubset(df_filtered.columns):
+        with_actual = int(df_filtered[actual_cols].notna().all(axis=1).sum())
+    else:
+        with_actual = 0
+    logger.info(f"IPOs with actual price data: {with_actual}/{total_ipos}")
+    logger.info("")
 
-    print("=" * 80)
-    print("FRONTEND PREDICTIONS GENERATION COMPLETE")
-    print("=" * 80)
+    logger.info("=" * 80)
+    logger.info("FRONTEND PREDICTIONS GENERATION COMPLETE")
+    logger.info("=" * 80)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO if "-v" in sys.argv else logging.WARNING,
+        format="%(message)s",
+    )
     main()
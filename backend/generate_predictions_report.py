@@ -3,53 +3,62 @@ Generate Predictions Comparison Report
 Compare actual vs predicted values for trained IPO dataset
 """
 
+import logging
+import sys
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import pickle
 from src.features.feature_engineering import IPOFeatureEngineer
 from src.models.ipo_predictor import IPOPricePredictor
+from src.utils.dataframe_io import load_dataset, write_csv
+
+logger = logging.getLogger(__name__)
 
 
 def main():
     """Generate predictions comparison CSV"""
-    print("=" * 80)
-    print("GENERATING PREDICTIONS COMPARISON REPORT")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("GENERATING PREDICTIONS COMPARISON REPORT")
+    logger.info("=" * 80)
+    logger.info("")
 
     # 1. Load dataset
-    print("Loading dataset...")
+    logger.info("Loading dataset...")
     input_file = "data/raw/ipo_full_dataset_2022_2024_enhanced.csv"
-    df = pd.read_csv(input_file)
-    print(f"✅ Loaded {len(df)} IPO records")
-    print()
+    df = load_dataset(input_file, dtype={"code": str})
+    logger.info(f"✅ Loaded {len(df)} IPO records")
+    logger.info("")
 
     # 2. Load trained models and transformers
-    print("Loading trained models and transformers...")
+    logger.info("Loading trained models and transformers...")
     predictor = IPOPricePredictor(model_type="random_forest")
     predictor.load_models("models")
 
     engineer = IPOFeatureEngineer()
     engineer.load_transformers("data/processed")
-    print("✅ Loaded models and transformers")
-    print()
+    logger.info("✅ Loaded models and transformers")
+    logger.info("")
 
     # 3. Prepare features
-    print("Engineering features...")
+    logger.info("Engineering features...")
     features_df = engineer.engineer_features(df, fit=False)
-    X = features_df[engineer.feature_names].values
-    print(f"✅ Feature matrix: {X.shape}")
-    print()
+    # Tree models cast to float32 internally; hand them a contiguous float32 matrix
+    X = np.ascontiguousarray(
+        features_df[engineer.feature_names].to_numpy(dtype=np.float32)
+    )
+    logger.info(f"✅ Feature matrix: {X.shape}")
+    logger.info("")
 
     # 4. Generate predictions
-    print("Generating predictions...")
+    logger.info("Generating predictions...")
     predictions = predictor.predict(X)
-    print("✅ Generated predictions for all targets")
-    print()
+    logger.info("✅ Generated predictions for all targets")
+    logger.info("")
 
     # 5. Create comparison DataFrame
-    print("Creating comparison DataFrame...")
+    logger.info("Creating comparison DataFrame...")
     comparison = pd.DataFrame({
         "company_name": df["company_name"],
         "code": df["code"],
@@ -86,68 +95,72 @@ def main():
     comparison["abs_error_day0_close"] = comparison["error_day0_close"].abs()
     comparison["abs_error_day1_close"] = comparison["error_day1_close"].abs()
 
-    print(f"✅ Created comparison with {len(comparison)} records")
-    print()
+    logger.info(f"✅ Created comparison with {len(comparison)} records")
+    logger.info("")
 
     # 6. Save to CSV
     output_file = "reports/predictions_comparison.csv"
-    comparison.to_csv(output_file, index=False, encoding="utf-8-sig")
-    print("=" * 80)
-    print("SAVED PREDICTIONS COMPARISON")
-    print("=" * 80)
-    print(f"Output file: {output_file}")
-    print(f"Records: {len(comparison)}")
-    print()
+    write_csv(comparison, output_file, bom=True)
+    logger.info("=" * 80)
+    logger.info("SAVED PREDICTIONS COMPARISON")
+    logger.info("=" * 80)
+    logger.info(f"Output file: {output_file}")
+    logger.info(f"Records: {len(comparison)}")
+    logger.info("")
 
     # 7. Show statistics
-    print("=" * 80)
-    print("PREDICTION ERROR STATISTICS")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("PREDICTION ERROR STATISTICS")
+    logger.info("=" * 80)
+    logger.info("")
 
     for target in ["day0_high", "day0_close", "day1_close"]:
-        print(f"Target: {target}")
-        print("-" * 80)
+        logger.info(f"Target: {target}")
+        logger.info("-" * 80)
 
         mae = comparison[f"abs_error_{target}"].mean()
         rmse = np.sqrt((comparison[f"error_{target}"] ** 2).mean())
         mape = comparison[f"error_pct_{target}"].abs().mean()
 
-        print(f"  Mean Absolute Error (MAE):  {mae:>10,.2f} KRW")
-        print(f"  Root Mean Squared Error:    {rmse:>10,.2f} KRW")
-        print(f"  Mean Abs Percentage Error:  {mape:>10.2f}%")
-        print()
+        logger.info(f"  Mean Absolute Error (MAE):  {mae:>10,.2f} KRW")
+        logger.info(f"  Root Mean Squared Error:    {rmse:>10,.2f} KRW")
+        logger.info(f"  Mean Abs Percentage Error:  {mape:>10.2f}%")
+        logger.info("")
 
     # 8. Show best/worst predictions
-    print("=" * 80)
-    print("BEST PREDICTIONS (Lowest Absolute Error)")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("BEST PREDICTIONS (Lowest Absolute Error)")
+    logger.info("=" * 80)
+    logger.info("")
 
     best_predictions = comparison.nsmallest(5, "abs_error_day0_close")[
         ["company_name", "listing_date", "actual_day0_close",
          "predicted_day0_close", "error_day0_close"]
     ]
-    print(best_predictions.to_string(index=False))
-    print()
+    logger.info(best_predictions.to_string(index=False))
+    logger.info("")
 
-    print("=" * 80)
-    print("WORST PREDICTIONS (Highest Absolute Error)")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("WORST PREDICTIONS (Highest Absolute Error)")
+    logger.info("=" * 80)
+    logger.info("")
 
     worst_predictions = comparison.nlargest(5, "abs_error_day0_close")[
         ["company_name", "listing_date", "actual_day0_close",
          "predicted_day0_close", "error_day0_close"]
     ]
-    print(worst_predictions.to_string(index=False))
-    print()
+    logger.info(worst_predictions.to_string(index=False))
+    logger.info("")
 
-    print("=" * 80)
-    print("REPORT GENERATION COMPLETE")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("REPORT GENERATION COMPLETE")
+    logger.info("=" * 80)
+    logger.info("")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO if "-v" in sys.argv else logging.WARNING,
+        format="%(message)s",
+    )
     main()
@@ -3,21 +3,41 @@ Generate return calculator data for frontend
 Calculates expected returns based on subscription competition rate and lockup ratio
 """
 
+import logging
+import sys
+
 import pandas as pd
 import numpy as np
-import json
+import orjson
 from pathlib import Path
 
+from src.utils.dataframe_io import load_dataset
+
+logging.basicConfig(
+    level=logging.INFO if "-v" in sys.argv else logging.WARNING,
+    format="%(message)s",
+)
+logger = logging.getLogger(__name__)
+
 # Load data
-df = pd.read_csv("data/raw/ipo_full_dataset_2018_2025.csv")
+df = load_dataset(
+    "data/raw/ipo_full_dataset_2018_2025.csv",
+    usecols=[
+        "ipo_price",
+        "day1_close",
+        "subscription_competition_rate",
+        "lockup_ratio",
+    ],
+    dtype="float64",
+)
 df["day1_return"] = (df["day1_close"] - df["ipo_price"]) / df["ipo_price"] * 100
 df = df[df["day1_return"].notna()].copy()
 
-print("=" * 80)
-print("GENERATING RETURN CALCULATOR DATA")
-print("=" * 80)
-print(f"Total records: {len(df)}")
-print()
+logger.info("=" * 80)
+logger.info("GENERATING RETURN CALCULATOR DATA")
+logger.info("=" * 80)
+logger.info(f"Total records: {len(df)}")
+logger.info("")
 
 # 1. Create bins for heatmap
 df["comp_bin"] = pd.cut(
@@ -32,27 +52,26 @@ df["lockup_bin"] = pd.cut(
     labels=["Low (<30%)", "Medium (30-60%)", "High (>60%)"],
 )
 
-# 2. Calculate heatmap data
+# 2. Calculate heatmap data (one grouped pass over all bin combinations)
+heatmap_stats = df.groupby(["comp_bin", "lockup_bin"], observed=False)[
+    "day1_return"
+].agg(["mean", "median", "std", "count"])
+
 heatmap_data = []
 
 for comp_level in ["Low (<500)", "Medium (500-1K)", "High (1K-2K)", "Very High (>2K)"]:
     for lockup_level in ["Low (<30%)", "Medium (30-60%)", "High (>60%)"]:
-        subset = df[(df["comp_bin"] == comp_level) & (df["lockup_bin"] == lockup_level)]
-
-        if len(subset) >= 3:  # At least 3 samples
-            mean_return = subset["day1_return"].mean()
-            median_return = subset["day1_return"].median()
-            std_return = subset["day1_return"].std()
-            count = len(subset)
+        stats = heatmap_stats.loc[(comp_level, lockup_level)]
 
+        if stats["count"] >= 3:  # At least 3 samples
             heatmap_data.append(
                 {
                     "competition": comp_level,
                     "lockup": lockup_level,
-                    "mean_return": round(mean_return, 2),
-                    "median_return": round(median_return, 2),
-                    "std_return": round(std_return, 2),
-                    "count": int(count),
+                    "mean_return": round(stats["mean"], 2),
+                    "median_return": round(stats["median"], 2),
+                    "std_return": round(stats["std"], 2),
+                    "count": int(stats["count"]),
                 }
             )
         else:
@@ -68,97 +87,86 @@ for comp_level in ["Low (<500)", "Medium (500-1K)", "High (1K-2K)", "Very High (
                 }
             )
 
-print("Heatmap data points generated:", len(heatmap_data))
-print()
+logger.info(f"Heatmap data points generated: {len(heatmap_data)}")
+logger.info("")
 
 # 3. Calculate price adjustment factors
-price_bins = {
-    "0-10K": (0, 10000),
-    "10-20K": (10000, 20000),
-    "20-50K": (20000, 50000),
-    "50K+": (50000, float("inf")),
-}
+price_stats = df.groupby(
+    pd.cut(
+        df["ipo_price"],
+        bins=[0, 10000, 20000, 50000, float("inf")],
+        labels=["0-10K", "10-20K", "20-50K", "50K+"],
+        right=False,
+    ),
+    observed=False,
+)["day1_return"].agg(["mean", "count"])
+price_stats = price_stats[price_stats["count"] >= 5]
 
-price_factors = {}
 overall_mean = df["day1_return"].mean()
+# Factor = bin_mean / overall_mean
+factors = price_stats["mean"] / overall_mean if overall_mean != 0 else 1.0
+
+price_factors = pd.DataFrame(
+    {
+        "factor": np.round(factors, 3),
+        "mean_return": price_stats["mean"].round(2),
+        "count": price_stats["count"].astype(int),
+    },
+    index=price_stats.index.astype(str),
+).to_dict("index")
+
+logger.info(f"Price adjustment factors calculated: {len(price_factors)}")
+logger.info("")
 
-for label, (min_price, max_price) in price_bins.items():
-    subset = df[(df["ipo_price"] >= min_price) & (df["ipo_price"] < max_price)]
-
-    if len(subset) >= 5:
-        bin_mean = subset["day1_return"].mean()
-        # Factor = bin_mean / overall_mean
-        factor = bin_mean / overall_mean if overall_mean != 0 else 1.0
-        price_factors[label] = {
-            "factor": round(factor, 3),
-            "mean_return": round(bin_mean, 2),
-            "count": int(len(subset)),
-        }
 
-print("Price adjustment factors calculated:", len(price_factors))
-print()
+def bin_means(values: pd.Series, edges: list) -> np.ndarray:
+    """Mean day-1 return per [edge_i, edge_i+1) bin, open-ended at both ends"""
+    bins = pd.cut(values, bins=[-np.inf, *edges, np.inf], right=False)
+    return df.groupby(bins, observed=False)["day1_return"].mean().to_numpy()
+
 
 # 4. Calculate competition rate impact (detailed)
+comp_edges = [500, 1000, 2000]
+comp_means = bin_means(df["subscription_competition_rate"], comp_edges)
+
 comp_detailed = []
 for rate in range(0, 3100, 100):  # 0 to 3000 in steps of 100
-    if rate < 500:
-        base_return = df[df["subscription_competition_rate"] < 500][
-            "day1_return"
-        ].mean()
-    elif rate < 1000:
-        base_return = df[
-            (df["subscription_competition_rate"] >= 500)
-            & (df["subscription_competition_rate"] < 1000)
-        ]["day1_return"].mean()
-    elif rate < 2000:
-        base_return = df[
-            (df["subscription_competition_rate"] >= 1000)
-            & (df["subscription_competition_rate"] < 2000)
-        ]["day1_return"].mean()
-    else:
-        base_return = df[df["subscription_competition_rate"] >= 2000][
-            "day1_return"
-        ].mean()
-
+    base_return = comp_means[np.searchsorted(comp_edges, rate, side="right")]
     comp_detailed.append({"rate": rate, "expected_return": round(base_return, 2)})
 
 # 5. Calculate lockup impact (detailed)
+lockup_edges = [30, 60]
+lockup_means = bin_means(df["lockup_ratio"], lockup_edges)
+
 lockup_detailed = []
 for ratio in range(0, 105, 5):  # 0 to 100 in steps of 5
-    if ratio < 30:
-        base_return = df[df["lockup_ratio"] < 30]["day1_return"].mean()
-    elif ratio < 60:
-        base_return = df[(df["lockup_ratio"] >= 30) & (df["lockup_ratio"] < 60)][
-            "day1_return"
-        ].mean()
-    else:
-        base_return = df[df["lockup_ratio"] >= 60]["day1_return"].mean()
-
+    base_return = lockup_means[np.searchsorted(lockup_edges, ratio, side="right")]
     lockup_detailed.append({"ratio": ratio, "expected_return": round(base_return, 2)})
 
 # 6. Top combinations
 top_combinations = []
 combo_stats = (
-    df.groupby(["comp_bin", "lockup_bin"])["day1_return"]
+    df.groupby(["comp_bin", "lockup_bin"], observed=False)["day1_return"]
     .agg(["mean", "count"])
     .reset_index()
+    .rename(columns={"count": "sample_count"})  # avoid shadowing tuple.count
 )
-combo_stats = combo_stats[combo_stats["count"] >= 3].sort_values(
+combo_stats = combo_stats[combo_stats["sample_count"] >= 3].sort_values(
     "mean", ascending=False
 )
 
-for _, row in combo_stats.head(5).iterrows():
+for row in combo_stats.head(5).itertuples(index=False):
     top_combinations.append(
         {
-            "competition": str(row["comp_bin"]),
-            "lockup": str(row["lockup_bin"]),
-            "expected_return": round(row["mean"], 2),
-            "sample_count": int(row["count"]),
+            "competition": str(row.comp_bin),
+            "lockup": str(row.lockup_bin),
+            "expected_return": round(row.mean, 2),
+            "sample_count": int(row.sample_count),
         }
     )
 
-print("Top 5 combinations identified")
-print()
+logger.info("Top 5 combinations identified")
+logger.info("")
 
 # 7. Compile output
 output = {
@@ -179,34 +187,35 @@ output = {
 output_path = Path("../frontend/public/calculator_data.json")
 output_path.parent.mkdir(parents=True, exist_ok=True)
 
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
+output_path.write_bytes(
+    orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+)
 
-print(f"✅ Calculator data saved to: {output_path}")
-print()
+logger.info(f"✅ Calculator data saved to: {output_path}")
+logger.info("")
 
 # 9. Display summary
-print("=" * 80)
-print("SUMMARY")
-print("=" * 80)
-print(f"Overall mean return: {output['metadata']['overall_mean_return']:.2f}%")
-print(
+logger.info("=" * 80)
+logger.info("SUMMARY")
+logger.info("=" * 80)
+logger.info(f"Overall mean return: {output['metadata']['overall_mean_return']:.2f}%")
+logger.info(
     f"Heatmap cells: {len([h for h in heatmap_data if h['count'] > 0])}/{len(heatmap_data)} with data"
 )
-print(f"Price factors: {len(price_factors)}")
-print()
+logger.info(f"Price factors: {len(price_factors)}")
+logger.info("")
 
-print("Sample heatmap values:")
+logger.info("Sample heatmap values:")
 for item in heatmap_data[:6]:
     if item["count"] > 0:
-        print(
+        logger.info(
             f"  {item['competition']:20} + {item['lockup']:20} = {item['mean_return']:6.2f}% (n={item['count']})"
         )
-print()
+logger.info("")
 
-print("Price factors:")
+logger.info("Price factors:")
 for label, data in price_factors.items():
-    print(
+    logger.info(
         f"  {label:10} : factor={data['factor']:.3f}, mean={data['mean_return']:6.2f}% (n={data['count']})"
     )
-print()
+logger.info("")
@@ -1,68 +1,88 @@
 """Inspect actual KRX API response fields"""
+import logging
+import sys
+
 import requests
+import orjson
 from src.config.settings import settings
-import json
 
-print("="*80)
-print("KRX API FIELD INSPECTION")
-print("="*80)
+if "--debug" in sys.argv:
+    log_level = logging.DEBUG
+elif "-v" in sys.argv:
+    log_level = logging.INFO
+else:
+    log_level = logging.WARNING
+logging.basicConfig(level=log_level, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+logger.info("="*80)
+logger.info("KRX API FIELD INSPECTION")
+logger.info("="*80)
 
 url = "https://data-dbg.krx.co.kr/svc/apis/sto/ksq_isu_base_info"
-headers = {
-    "AUTH_KEY": settings.KRX_API_KEY,
-    "Content-Type": "application/json",
-}
+session = requests.Session()
+session.headers.update(
+    {
+        "AUTH_KEY": settings.KRX_API_KEY,
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip",
+    }
+)
 
 # Get recent data
 params = {"basDd": "20241231"}
 
-print(f"\nCalling KRX API: {url}")
-print(f"Params: {params}")
-print()
+logger.info(f"\nCalling KRX API: {url}")
+logger.info(f"Params: {params}")
+logger.info("")
 
-response = requests.get(url, params=params, headers=headers, timeout=30)
+response = session.get(url, params=params, timeout=30)
 
 if response.status_code == 200:
-    data = response.json()
+    data = orjson.loads(response.content)
     stocks = data.get("OutBlock_1", [])
 
-    print(f"✅ Retrieved {len(stocks)} stocks")
-    print()
+    logger.info(f"✅ Retrieved {len(stocks)} stocks")
+    logger.info("")
 
     # Find a recent IPO
-    recent_ipos = [s for s in stocks if s.get("LIST_DD", "").startswith("2024")]
+    recent_ipos = [s for s in stocks if s.get("LIST_DD", "")[:4] == "2024"]
 
     if recent_ipos:
-        print(f"Found {len(recent_ipos)} IPOs from 2024")
-        print()
+        logger.info(f"Found {len(recent_ipos)} IPOs from 2024")
+        logger.info("")
 
         # Show first 5 IPOs with all fields
-        print("Sample IPO Records (all fields):")
-        print("-"*80)
+        logger.info("Sample IPO Records (all fields):")
+        logger.info("-"*80)
 
         for i, ipo in enumerate(recent_ipos[:5], 1):
-            print(f"\n{i}. {ipo.get('ISU_NM', 'N/A')} ({ipo.get('ISU_SRT_CD', 'N/A')})")
-            print(f"   Listing date: {ipo.get('LIST_DD', 'N/A')}")
-            print(f"   SECUGRP_NM (industry): '{ipo.get('SECUGRP_NM', 'N/A')}'")
-            print(f"   SECT_TP_NM (theme): '{ipo.get('SECT_TP_NM', 'N/A')}'")
-            print(f"   MKT_TP_NM (market): '{ipo.get('MKT_TP_NM', 'N/A')}'")
-
-        print("\n" + "-"*80)
-        print("All available fields in response:")
-        print("-"*80)
+            logger.info(f"\n{i}. {ipo.get('ISU_NM', 'N/A')} ({ipo.get('ISU_SRT_CD', 'N/A')})")
+            logger.info(f"   Listing date: {ipo.get('LIST_DD', 'N/A')}")
+            logger.info(f"   SECUGRP_NM (industry): '{ipo.get('SECUGRP_NM', 'N/A')}'")
+            logger.info(f"   SECT_TP_NM (theme): '{ipo.get('SECT_TP_NM', 'N/A')}'")
+            logger.info(f"   MKT_TP_NM (market): '{ipo.get('MKT_TP_NM', 'N/A')}'")
+
+        logger.info("\n" + "-"*80)
+        logger.info("All available fields in response:")
+        logger.info("-"*80)
         if recent_ipos:
             fields = list(recent_ipos[0].keys())
             for field in sorted(fields):
-                print(f"  - {field}")
+                logger.info(f"  - {field}")
 
-        print("\n" + "-"*80)
-        print("Sample full record (JSON):")
-        print("-"*80)
-        print(json.dumps(recent_ipos[0], indent=2, ensure_ascii=False))
+        # Pretty-printing a full record is only worth it with --debug
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n" + "-"*80)
+            logger.debug("Sample full record (JSON):")
+            logger.debug("-"*80)
+            logger.debug(
+                orjson.dumps(recent_ipos[0], option=orjson.OPT_INDENT_2).decode()
+            )
 
     else:
-        print("No 2024 IPOs found")
+        logger.warning("No 2024 IPOs found")
 
 else:
-    print(f"❌ API Error: {response.status_code}")
-    print(response.text)
+    logger.error(f"❌ API Error: {response.status_code}")
+    logger.error(response.text)
@@ -1,33 +1,46 @@
 """
 Merge 38.co.kr financial metrics into enhanced dataset
 """
+import logging
+import sys
+
 import pandas as pd
 import numpy as np
 
+from src.utils.dataframe_io import load_dataset, save_dataset
+
+logger = logging.getLogger(__name__)
+
 def merge_financial_metrics():
     """Merge 38.co.kr financial data with enhanced dataset"""
 
-    print("=" * 80)
-    print("MERGING 38.CO.KR FINANCIAL METRICS")
-    print("=" * 80)
-    print()
+    logger.info("=" * 80)
+    logger.info("MERGING 38.CO.KR FINANCIAL METRICS")
+    logger.info("=" * 80)
+    logger.info("")
 
     # Load datasets
-    print("Loading enhanced dataset...")
-    df_main = pd.read_csv("data/raw/ipo_full_dataset_2022_2024_enhanced.csv")
-    print(f"✓ Loaded {len(df_main)} IPO records")
+    logger.info("Loading enhanced dataset...")
+    df_main = load_dataset(
+        "data/raw/ipo_full_dataset_2022_2024_enhanced.csv", dtype={"code": str}
+    )
+    logger.info(f"✓ Loaded {len(df_main)} IPO records")
 
-    print("Loading 38.co.kr financial metrics...")
-    df_financial = pd.read_csv("data/raw/38_financial_metrics.csv")
-    print(f"✓ Loaded {len(df_financial)} financial records")
-    print()
+    logger.info("Loading 38.co.kr financial metrics...")
+    df_financial = pd.read_csv(
+        "data/raw/38_financial_metrics.csv",
+        usecols=["code", "per", "pbr", "eps", "roe"],
+        dtype={"code": str},
+    )
+    logger.info(f"✓ Loaded {len(df_financial)} financial records")
+    logger.info("")
 
     # Ensure code is string with 6 digits
     df_main["code"] = df_main["code"].astype(str).str.zfill(6)
     df_financial["code"] = df_financial["code"].astype(str).str.zfill(6)
 
     # Merge on code
-    print("Merging datasets on stock code...")
+    logger.info("Merging datasets on stock code...")
     df_merged = df_main.merge(
         df_financial[["code", "per", "pbr", "eps", "roe"]],
         on="code",
@@ -46,32 +59,34 @@ def merge_financial_metrics():
     if "day0_per" in df_merged.columns:
         df_merged = df_merged.drop(columns=["day0_per", "day0_pbr", "day0_eps", "day0_market_cap"])
 
-    print(f"✓ Merged successfully")
-    print()
+    logger.info(f"✓ Merged successfully")
+    logger.info("")
 
     # Statistics
     total = len(df_merged)
-    with_per = df_merged["listing_per"].notna().sum()
-    with_pbr = df_merged["listing_pbr"].notna().sum()
-    with_eps = df_merged["listing_eps"].notna().sum()
-    with_roe = df_merged["listing_roe"].notna().sum()
-
-    print("FINANCIAL DATA COVERAGE:")
-    print(f"  PER: {with_per}/{total} ({with_per/total*100:.1f}%)")
-    print(f"  PBR: {with_pbr}/{total} ({with_pbr/total*100:.1f}%)")
-    print(f"  EPS: {with_eps}/{total} ({with_eps/total*100:.1f}%)")
-    print(f"  ROE: {with_roe}/{total} ({with_roe/total*100:.1f}%)")
-    print()
+    coverage = df_merged[
+        ["listing_per", "listing_pbr", "listing_eps", "listing_roe"]
+    ].notna().sum()
+
+    logger.info("FINANCIAL DATA COVERAGE:")
+    for name, count in coverage.items():
+        label = name.removeprefix("listing_").upper()
+        logger.info(f"  {label}: {count}/{total} ({count/total*100:.1f}%)")
+    logger.info("")
 
     # Save
     output_file = "data/raw/ipo_full_dataset_2022_2024_with_financials.csv"
-    df_merged.to_csv(output_file, index=False, encoding="utf-8-sig")
-    print(f"✅ Saved merged dataset: {output_file}")
-    print(f"   Total columns: {len(df_merged.columns)}")
-    print()
+    save_dataset(df_merged, output_file)
+    logger.info(f"✅ Saved merged dataset: {output_file}")
+    logger.info(f"   Total columns: {len(df_merged.columns)}")
+    logger.info("")
 
     return df_merged
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO if "-v" in sys.argv else logging.WARNING,
+        format="%(message)s",
+    )
     merge_financial_metrics()
@@ -3,19 +3,29 @@ Merge all IPO datasets: 2018-2021 historical + 2022-2025 current
 Handles overlapping 2019 data by deduplicating on stock code
 """
 
+import logging
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 
+from src.utils.dataframe_io import load_dataset, save_dataset
 
-def main():
-    print("=" * 80)
-    print("MERGING ALL IPO DATASETS (2018-2025)")
-    print("=" * 80)
-    print()
-
-    # 1. Load 2018-2019 data
-    print("Loading 2018-2019 historical data...")
-    df_38_2018 = pd.read_csv("data/raw/38_historical_2018_2021.csv")
-    df_yf_2018 = pd.read_csv("data/raw/yfinance_historical_2018_2021.csv")
+logger = logging.getLogger(__name__)
+
+# SPAC (special purpose acquisition company) listings, excluded from the dataset
+SPAC_PATTERN = re.compile("스팩|SPAC|기업인수목적", re.IGNORECASE)
+
+
+def load_2018() -> pd.DataFrame:
+    """Load 2018-2019 historical data (38.co.kr + yfinance), SPACs removed"""
+    df_38_2018 = pd.read_csv(
+        "data/raw/38_historical_2018_2021.csv", dtype={"code": str}
+    )
+    df_yf_2018 = pd.read_csv(
+        "data/raw/yfinance_historical_2018_2021.csv", dtype={"code": str}
+    )
     df_2018 = pd.merge(df_38_2018, df_yf_2018, on="code", how="left")
 
     # Convert date format
@@ -24,18 +34,13 @@ def main():
     ).dt.strftime("%Y-%m-%d")
 
     # Filter SPACs
-    df_2018 = df_2018[
-        ~df_2018["company_name"].str.contains(
-            "스팩|SPAC|기업인수목적", na=False, case=False
-        )
-    ]
-
-    print(f"  2018-2019: {len(df_2018)} IPOs")
-
-    # 2. Load 2019-2021 data (new collection)
-    print("Loading 2019-2021 data...")
-    df_38_2020 = pd.read_csv("data/raw/38_2020_2021.csv")
-    df_yf_2020 = pd.read_csv("data/raw/yfinance_2020_2021.csv")
+    return df_2018[~df_2018["company_name"].str.contains(SPAC_PATTERN, na=False)]
+
+
+def load_2020() -> pd.DataFrame:
+    """Load 2019-2021 data (new collection)"""
+    df_38_2020 = pd.read_csv("data/raw/38_2020_2021.csv", dtype={"code": str})
+    df_yf_2020 = pd.read_csv("data/raw/yfinance_2020_2021.csv", dtype={"code": str})
     df_2020 = pd.merge(df_38_2020, df_yf_2020, on="code", how="left")
 
     # Convert date format
@@ -43,52 +48,74 @@ def main():
         df_2020["listing_date"], format="%Y.%m.%d"
     ).dt.strftime("%Y-%m-%d")
 
-    print(f"  2019-2021: {len(df_2020)} IPOs")
+    return df_2020
+
+
+def load_2022() -> pd.DataFrame:
+    """Load 2022-2025 data"""
+    return load_dataset("data/raw/ipo_full_dataset_2022_2025.csv", dtype={"code": str})
+
 
-    # 3. Load 2022-2025 data
-    print("Loading 2022-2025 data...")
-    df_2022 = pd.read_csv("data/raw/ipo_full_dataset_2022_2025.csv")
-    print(f"  2022-2025: {len(df_2022)} IPOs")
+def main():
+    logger.info("=" * 80)
+    logger.info("MERGING ALL IPO DATASETS (2018-2025)")
+    logger.info("=" * 80)
+    logger.info("")
+
+    # 1-3. Load the three independent periods in parallel
+    logger.info("Loading 2018-2019, 2019-2021 and 2022-2025 data...")
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        future_2018 = executor.submit(load_2018)
+        future_2020 = executor.submit(load_2020)
+        future_2022 = executor.submit(load_2022)
+        df_2018 = future_2018.result()
+        df_2020 = future_2020.result()
+        df_2022 = future_2022.result()
+
+    logger.info(f"  2018-2019: {len(df_2018)} IPOs")
+    logger.info(f"  2019-2021: {len(df_2020)} IPOs")
+    logger.info(f"  2022-2025: {len(df_2022)} IPOs")
 
     # 4. Combine all datasets
-    print("\nCombining datasets...")
+    logger.info("\nCombining datasets...")
     df_combined = pd.concat([df_2018, df_2020, df_2022], ignore_index=True)
-    print(f"  Before deduplication: {len(df_combined)} IPOs")
+    logger.info(f"  Before deduplication: {len(df_combined)} IPOs")
 
     # 5. Remove duplicates (keep first occurrence by date)
-    df_combined = df_combined.sort_values("listing_date")
-    df_combined = df_combined.drop_duplicates(subset=["code"], keep="first")
-    print(f"  After deduplication: {len(df_combined)} IPOs")
-
-    # 6. Sort by listing date
-    df_combined = df_combined.sort_values("listing_date").reset_index(drop=True)
+    # Stable sort on parsed dates, so the deduplicated frame is already ordered
+    df_combined = (
+        df_combined.sort_values("listing_date", kind="mergesort", key=pd.to_datetime)
+        .drop_duplicates(subset=["code"], keep="first")
+        .reset_index(drop=True)
+    )
+    logger.info(f"  After deduplication: {len(df_combined)} IPOs")
 
-    # 7. Show year distribution
-    print("\nYear distribution:")
+    # 6. Show year distribution
+    logger.info("\nYear distribution:")
     for year in [2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025]:
         count = df_combined[
             df_combined["listing_date"].str.startswith(str(year))
         ].shape[0]
-        print(f"  {year}: {count:3} IPOs")
+        logger.info(f"  {year}: {count:3} IPOs")
 
-    # 8. Save merged dataset
+    # 7. Save merged dataset
     output_file = "data/raw/ipo_full_dataset_2018_2025.csv"
-    df_combined.to_csv(output_file, index=False)
+    save_dataset(df_combined, output_file)
 
-    print()
-    print(f"✅ Saved to: {output_file}")
-    print(f"   Total records: {len(df_combined)}")
+    logger.info("")
+    logger.info(f"✅ Saved to: {output_file}")
+    logger.info(f"   Total records: {len(df_combined)}")
 
-    # 9. Show sample records
-    print("\nSample records:")
-    print("-" * 80)
-    print(
+    # 8. Show sample records
+    logger.info("\nSample records:")
+    logger.info("-" * 80)
+    logger.info(
         df_combined[["code", "company_name", "listing_date", "ipo_price"]]
         .head(10)
         .to_string()
     )
-    print()
-    print(
+    logger.info("")
+    logger.info(
         df_combined[["code", "company_name", "listing_date", "ipo_price"]]
         .tail(10)
         .to_string()
@@ -96,4 +123,8 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO if "-v" in sys.argv else logging.WARNING,
+        format="%(message)s",
+    )
     main()
@@ -3,9 +3,43 @@ Merge Daily Indicators with Main Dataset
 Combine KIS API data with existing IPO dataset
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from src.utils.dataframe_io import load_dataset, save_dataset
+
+
+def compute_daily_features(df):
+    """
+    Compute turnover rates and day 0 volatility on raw float64 arrays
+
+    Returns:
+        Dict of feature name -> ndarray, aligned with df rows
+    """
+
+    def column(name):
+        return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    shares = column("shares_offered")
+    day0_open = column("day0_open_kis")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        day0_turnover_rate = column("day0_volume_kis") / shares
+        day1_turnover_rate = column("day1_volume") / shares
+        day0_volatility = column("day0_high_kis") - column("day0_low_kis")
+        day0_volatility /= day0_open
+
+    for values in (day0_turnover_rate, day1_turnover_rate, day0_volatility):
+        values *= 100
+
+    return {
+        "day0_turnover_rate": day0_turnover_rate,
+        "day1_turnover_rate": day1_turnover_rate,
+        "day0_volatility": day0_volatility,
+    }
+
+
 def merge_daily_indicators():
     """Merge daily indicators with main dataset"""
     print("=" * 80)
@@ -15,15 +49,16 @@ def merge_daily_indicators():
 
     # Load main dataset
     main_file = "data/raw/ipo_full_dataset_2022_2024_complete.csv"
-    df_main = pd.read_csv(main_file)
+    df_main = load_dataset(main_file, engine="pyarrow")
     print(f"Loaded main dataset: {len(df_main)} IPOs")
 
     # Filter out SPAC companies
     initial_count = len(df_main)
-    df_main = df_main[
-        (~df_main["company_name"].str.contains("기업인수목적", na=False)) &
-        (~df_main["industry"].str.contains("SPAC", na=False))
-    ]
+    # Plain substring search; no regex needed for literal keywords
+    is_spac = df_main["company_name"].str.contains(
+        "기업인수목적", na=False, regex=False
+    ) | df_main["industry"].str.contains("SPAC", na=False, regex=False)
+    df_main = df_main.loc[~is_spac]
     spac_count = initial_count - len(df_main)
     print(f"Filtered out {spac_count} SPAC companies")
     print(f"Remaining IPOs: {len(df_main)}")
@@ -31,10 +66,18 @@ def merge_daily_indicators():
 
     # Load daily indicators
     indicators_file = "data/raw/daily_indicators/ipo_daily_indicators_2022_2024.csv"
-    df_indicators = pd.read_csv(indicators_file)
+    df_indicators = pd.read_csv(indicators_file, engine="pyarrow")
     print(f"Loaded daily indicators: {len(df_indicators)} records")
     print()
 
+    # Share one categorical dtype for the merge key, so sorting, grouping and
+    # merging on code work on integer category codes instead of raw values
+    code_dtype = df_main["code"].dtype
+    all_codes = pd.concat([df_main["code"], df_indicators["code"]]).dropna()
+    code_categories = pd.CategoricalDtype(pd.Index(all_codes.unique()).sort_values())
+    df_main["code"] = df_main["code"].astype(code_categories)
+    df_indicators["code"] = df_indicators["code"].astype(code_categories)
+
     # Parse dates
     df_indicators["date"] = pd.to_datetime(df_indicators["date"])
     df_main["listing_date"] = pd.to_datetime(df_main["listing_date"])
@@ -42,41 +85,46 @@ def merge_daily_indicators():
     # Separate day 0 and day 1 data
     print("Separating day 0 and day 1 data...")
 
-    # Group by code and get first 2 records
+    # Rank each IPO's trading days once; rank 0 is day 0, rank 1 is day 1
     df_indicators_sorted = df_indicators.sort_values(["code", "date"])
+    day_rank = df_indicators_sorted.groupby(
+        "code", sort=False, observed=True
+    ).cumcount()
 
     # Day 0 (first record per IPO)
-    df_day0 = df_indicators_sorted.groupby("code").first().reset_index()
-    df_day0 = df_day0.rename(columns={
-        "volume": "day0_volume_kis",
-        "trading_value": "day0_trading_value",
-        "open": "day0_open_kis",
-        "high": "day0_high_kis",
-        "low": "day0_low_kis",
-        "close": "day0_close_kis",
-        # Financial metrics
-        "per": "day0_per",
-        "pbr": "day0_pbr",
-        "eps": "day0_eps",
-        "market_cap": "day0_market_cap",
-        "listed_shares": "day0_listed_shares",
-    })
+    df_day0 = df_indicators_sorted[day_rank == 0].rename(
+        columns={
+            "volume": "day0_volume_kis",
+            "trading_value": "day0_trading_value",
+            "open": "day0_open_kis",
+            "high": "day0_high_kis",
+            "low": "day0_low_kis",
+            "close": "day0_close_kis",
+            # Financial metrics
+            "per": "day0_per",
+            "pbr": "day0_pbr",
+            "eps": "day0_eps",
+            "market_cap": "day0_market_cap",
+            "listed_shares": "day0_listed_shares",
+        }
+    )
 
     # Day 1 (second record per IPO)
-    df_day1 = df_indicators_sorted.groupby("code").nth(1).reset_index()
-    df_day1 = df_day1.rename(columns={
-        "volume": "day1_volume",
-        "trading_value": "day1_trading_value",
-        "open": "day1_open",
-        "high": "day1_high_kis",
-        "low": "day1_low",
-        "close": "day1_close_kis",
-        # Financial metrics
-        "per": "day1_per",
-        "pbr": "day1_pbr",
-        "eps": "day1_eps",
-        "market_cap": "day1_market_cap",
-    })
+    df_day1 = df_indicators_sorted[day_rank == 1].rename(
+        columns={
+            "volume": "day1_volume",
+            "trading_value": "day1_trading_value",
+            "open": "day1_open",
+            "high": "day1_high_kis",
+            "low": "day1_low",
+            "close": "day1_close_kis",
+            # Financial metrics
+            "per": "day1_per",
+            "pbr": "day1_pbr",
+            "eps": "day1_eps",
+            "market_cap": "day1_market_cap",
+        }
+    )
 
     print(f"Day 0 records: {len(df_day0)}")
     print(f"Day 1 records: {len(df_day1)}")
@@ -95,35 +143,19 @@ def merge_daily_indicators():
 
     # Merge with main dataset
     print("Merging with main dataset...")
-    df_merged = df_main.copy()
-
-    # Merge day 0 data
-    df_merged = df_merged.merge(df_day0_merge, on="code", how="left")
-
-    # Merge day 1 data
-    df_merged = df_merged.merge(df_day1_merge, on="code", how="left")
+    # Combine day 0 and day 1 data into one lookup, then merge once
+    lookup = df_day0_merge.merge(df_day1_merge, on="code", how="outer")
+    df_merged = df_main.merge(lookup, on="code", how="left")
 
+    df_merged["code"] = df_merged["code"].astype(code_dtype)
     print(f"Merged dataset: {len(df_merged)} IPOs")
     print()
 
     # Calculate additional features
     print("Calculating additional features...")
 
-    # Day 0 turnover rate (거래량 회전율)
-    df_merged["day0_turnover_rate"] = (
-        df_merged["day0_volume_kis"] / df_merged["shares_offered"]
-    ) * 100
-
-    # Day 1 turnover rate
-    df_merged["day1_turnover_rate"] = (
-        df_merged["day1_volume"] / df_merged["shares_offered"]
-    ) * 100
-
-    # Price volatility (day 0)
-    df_merged["day0_volatility"] = (
-        (df_merged["day0_high_kis"] - df_merged["day0_low_kis"]) /
-        df_merged["day0_open_kis"]
-    ) * 100
+    # Turnover rates (거래량 회전율) and day 0 price volatility, in one fused pass
+    df_merged = df_merged.assign(**compute_daily_features(df_merged))
 
     print("✅ Added calculated features:")
     print("   - day0_turnover_rate")
@@ -143,15 +175,15 @@ def merge_daily_indicators():
         "day1_per", "day1_pbr", "day1_eps", "day1_market_cap"
     ]
 
-    for col in new_cols:
-        non_null = df_merged[col].notna().sum()
-        print(f"{col:30}: {non_null}/{len(df_merged)} ({non_null/len(df_merged)*100:.1f}%) non-null")
+    total = len(df_merged)
+    for col, non_null in df_merged[new_cols].notna().sum().items():
+        print(f"{col:30}: {non_null}/{total} ({non_null/total*100:.1f}%) non-null")
 
     print()
 
     # Save merged dataset
     output_file = "data/raw/ipo_full_dataset_2022_2024_enhanced.csv"
-    df_merged.to_csv(output_file, index=False, encoding="utf-8-sig")
+    save_dataset(df_merged, output_file)
 
     print("=" * 80)
     print("MERGE COMPLETE")
@@ -5,37 +5,42 @@ Merge 38.co.kr subscription data into existing datasets
 import pandas as pd
 import numpy as np
 
+from src.utils.dataframe_io import load_dataset, save_dataset
 
-def normalize_company_name(name):
-    """Normalize company name for matching"""
-    if pd.isna(name):
-        return ""
-    # Remove whitespace and special characters
-    return name.strip().replace(" ", "").replace("(주)", "").replace("㈜", "")
 
+def normalize_code(codes):
+    """Format stock codes (Series) as 6-digit strings"""
+    # Skip the string rebuild when codes were already read as 6-char strings
+    if pd.api.types.is_string_dtype(codes) and codes.str.len().eq(6).all():
+        return codes
+    return codes.astype(str).str.zfill(6)
 
-def normalize_listing_date(date_str):
-    """Normalize listing date to YYYY-MM-DD format"""
-    if pd.isna(date_str):
-        return ""
 
-    date_str = str(date_str).strip()
+def normalize_company_name(names):
+    """Normalize company names (Series) for matching"""
+    # Remove whitespace and special characters
+    return (
+        names.fillna("")
+        .str.strip()
+        .str.replace(" ", "", regex=False)
+        .str.replace("(주)", "", regex=False)
+        .str.replace("㈜", "", regex=False)
+    )
 
-    # Handle format: "2022.01.20" -> "2022-01-20"
-    if "." in date_str:
-        parts = date_str.split(".")
-        if len(parts) == 3:
-            year, month, day = parts
-            # Handle 2-digit year
-            if len(year) == 2:
-                year = "20" + year
-            return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
 
-    # Already in YYYY-MM-DD format
-    if "-" in date_str and len(date_str) == 10:
-        return date_str
+def normalize_listing_date(dates):
+    """Normalize listing dates (Series) to YYYY-MM-DD format"""
+    dates = dates.where(dates.notna(), "").astype(str).str.strip()
 
-    return date_str
+    # Handle format: "2022.01.20" -> "2022-01-20"
+    parts = dates.str.extract(r"^([^.]*)\.([^.]*)\.([^.]*)$")
+    year, month, day = parts[0], parts[1], parts[2]
+    # Handle 2-digit year
+    year = year.where(year.str.len() != 2, "20" + year)
+    dotted = year + "-" + month.str.zfill(2) + "-" + day.str.zfill(2)
+
+    # Anything else (e.g. already YYYY-MM-DD) is kept as is
+    return dotted.where(parts[0].notna(), dates)
 
 
 def merge_subscription_data():
@@ -48,26 +53,27 @@ def merge_subscription_data():
 
     # Load 38.co.kr subscription data
     print("Loading 38.co.kr subscription data...")
-    df_38 = pd.read_csv("data/raw/38_subscription_data.csv")
+    # C engine: the pyarrow engine parses codes as ints before the str cast,
+    # dropping their leading zeros
+    df_38 = pd.read_csv("data/raw/38_subscription_data.csv", dtype={"code": str})
     print(f"  Loaded {len(df_38)} records from 38.co.kr")
     print()
 
     # Normalize for matching
-    df_38["company_name_norm"] = df_38["company_name"].apply(normalize_company_name)
-    df_38["listing_date_norm"] = df_38["listing_date"].apply(normalize_listing_date)
-    df_38["code"] = df_38["code"].astype(str).str.zfill(6)
-
-    # Create lookup key: code + listing_date
-    df_38["lookup_key"] = df_38["code"] + "_" + df_38["listing_date_norm"]
+    df_38["company_name_norm"] = normalize_company_name(df_38["company_name"])
+    df_38["listing_date_norm"] = normalize_listing_date(df_38["listing_date"])
+    df_38["code"] = normalize_code(df_38["code"])
 
-    # Select columns to merge
+    # Select columns to merge (matched on code + listing_date)
+    merge_keys = ["code", "listing_date_norm"]
     subscription_cols = [
-        "lookup_key",
+        *merge_keys,
         "institutional_demand_rate",
         "subscription_competition_rate",
         "lockup_ratio",
     ]
-    df_38_lookup = df_38[subscription_cols].copy()
+    # Read-only lookup; merge builds a fresh frame, so no defensive copy
+    df_38_lookup = df_38[subscription_cols]
 
     # Datasets to update
     datasets = [
@@ -80,13 +86,12 @@ def merge_subscription_data():
         print("-" * 80)
 
         # Load dataset
-        df = pd.read_csv(dataset_file)
+        df = load_dataset(dataset_file, dtype={"code": str})
         print(f"  Original records: {len(df)}")
 
         # Normalize dataset
-        df["code"] = df["code"].astype(str).str.zfill(6)
-        df["listing_date_norm"] = df["listing_date"].apply(normalize_listing_date)
-        df["lookup_key"] = df["code"] + "_" + df["listing_date_norm"]
+        df["code"] = normalize_code(df["code"])
+        df["listing_date_norm"] = normalize_listing_date(df["listing_date"])
 
         # Count existing non-zero values
         before_nonzero = {
@@ -112,7 +117,7 @@ def merge_subscription_data():
         )
 
         # Merge with 38.co.kr data
-        df = df.merge(df_38_lookup, on="lookup_key", how="left")
+        df = df.merge(df_38_lookup, on=merge_keys, how="left")
 
         # Fill NaN with 0.0 for unmatched records
         df["institutional_demand_rate"] = df["institutional_demand_rate"].fillna(0.0)
@@ -136,10 +141,10 @@ def merge_subscription_data():
             print(f"    {field:35}: {count} (+{improvement})")
 
         # Drop temporary columns
-        df = df.drop(columns=["listing_date_norm", "lookup_key"])
+        df = df.drop(columns=["listing_date_norm"])
 
         # Save updated dataset
-        df.to_csv(dataset_file, index=False)
+        save_dataset(df, dataset_file)
         print(f"\n  ✅ Saved updated dataset to {dataset_file}")
         print()
 
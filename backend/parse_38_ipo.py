@@ -1,126 +1,165 @@
 """Parse detailed IPO data from 38.co.kr HTML"""
 
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree, html as lxml_html
 import re
+import traceback
+
+# Value cell next to a label cell (leaf cells only, so the label text of a
+# nested table does not also match its enclosing cell)
+LABEL_VALUE_XPATH = etree.XPath(
+    "//td[not(.//table)][contains(normalize-space(.), $label)]/following-sibling::td[1]"
+)
+
+# 38.co.kr pages are EUC-KR; libxml2 decodes the raw bytes while parsing
+EUC_KR_PARSER = lxml_html.HTMLParser(encoding='euc-kr')
+
+# Value patterns, compiled once and applied to the narrow value cell text
+STOCK_CODE_RE = re.compile(r'([A-Z0-9]{6})')
+TITLE_NAME_RE = re.compile(r'([가-힣A-Za-z0-9().,\s]+?)\s*[-|]')
+LISTING_DATE_RE = re.compile(r'([\d.년월일]+)')
+DATE_UNIT_RE = re.compile(r'년|월|일')
+IPO_PRICE_RE = re.compile(r'([\d,]+)\s*원')
+INST_RATE_RE = re.compile(r'([\d,]+\.?\d*)')  # "1234.56:", "1234.56대", "1234.56"
+SUBSCRIPTION_RATE_RE = re.compile(r'(?:일반\s*)*([\d,]+\.?\d*)\s*[:대]')
+LOCKUP_RATIO_RE = re.compile(r'([\d,]+\.?\d*)\s*%')
+
+
+def _label_value(tree, *labels):
+    """Return whitespace-normalized text of the cell after the first matching label"""
+    for label in labels:
+        cells = LABEL_VALUE_XPATH(tree, label=label)
+        if cells:
+            return ' '.join(cells[0].text_content().split())
+    return None
+
+
+def _search_float(pattern, text):
+    """Return the pattern match in text parsed as float, or None"""
+    match = pattern.search(text) if text else None
+    if match:
+        try:
+            return float(match.group(1).replace(',', ''))
+        except ValueError:
+            pass
+    return None
+
 
 def parse_ipo_html(filename):
     """Parse 38.co.kr IPO HTML file"""
 
-    with open(filename, 'r', encoding='euc-kr', errors='ignore') as f:
-        html = f.read()
+    with open(filename, 'rb') as f:
+        content = f.read()
 
-    soup = BeautifulSoup(html, 'html.parser')
-    text = soup.get_text()
+    tree = lxml_html.fromstring(content, parser=EUC_KR_PARSER)
 
     data = {}
 
     # 1. 종목코드
-    match = re.search(r'종목코드[:\s]*([A-Z0-9]{6})', text)
+    cell = _label_value(tree, '종목코드')
+    match = STOCK_CODE_RE.search(cell) if cell else None
     if match:
         data['stock_code'] = match.group(1)
 
     # 2. 기업명 (회사명)
-    match = re.search(r'기업명[:\s]*([가-힣A-Za-z0-9().,\s]+?)(?:\n|기업구분|종목코드)', text)
-    if not match:
-        # Try company name from title or other location
-        match = re.search(r'<title>([가-힣A-Za-z0-9().,\s]+?)\s*[-|]', html)
-    if match:
-        data['company_name'] = match.group(1).strip()
+    company_name = _label_value(tree, '기업명')
+    if not company_name:
+        # Try company name from title
+        match = TITLE_NAME_RE.match(tree.findtext('.//title') or '')
+        company_name = match.group(1) if match else None
+    if company_name:
+        data['company_name'] = company_name.strip()
 
     # 3. 상장일
-    match = re.search(r'상장[예정]*일[:\s]*([\d.년월일]+)', text)
+    cell = _label_value(tree, '상장일', '상장예정일')
+    match = LISTING_DATE_RE.search(cell) if cell else None
     if match:
-        listing_date = match.group(1)
         # Clean up format: "2024.05.23" or "24.05.23"
-        listing_date = re.sub(r'년|월|일', '', listing_date).strip()
-        data['listing_date'] = listing_date
+        data['listing_date'] = DATE_UNIT_RE.sub('', match.group(1)).strip()
 
     # 4. 확정공모가
-    match = re.search(r'확정공모가[:\s]*([\d,]+)\s*원', text)
+    cell = _label_value(tree, '확정공모가')
+    match = IPO_PRICE_RE.search(cell) if cell else None
     if match:
-        ipo_price = match.group(1).replace(',', '')
-        data['ipo_price'] = int(ipo_price)
+        data['ipo_price'] = int(match.group(1).replace(',', ''))
 
     # 5. 기관경쟁률
-    patterns = [
-        r'기관경쟁률[:\s]*([\d,]+\.?\d*)\s*:',  # "기관경쟁률 1234.56:"
-        r'기관경쟁률[:\s]*([\d,]+\.?\d*)\s*대',  # "기관경쟁률 1234.56대"
-        r'기관경쟁률[:\s]*([\d,]+\.?\d*)',       # "기관경쟁률 1234.56"
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            rate = match.group(1).replace(',', '')
-            try:
-                data['institutional_demand_rate'] = float(rate)
-                break
-            except:
-                pass
+    rate = _search_float(INST_RATE_RE, _label_value(tree, '기관경쟁률'))
+    if rate is not None:
+        data['institutional_demand_rate'] = rate
 
     # 6. 청약경쟁률 (일반 청약)
-    patterns = [
-        r'일반청약[:\s]*([\d,]+\.?\d*)\s*:',
-        r'일반청약[:\s]*([\d,]+\.?\d*)\s*대',
-        r'청약경쟁률[:\s]*(?:일반\s*)*([\d,]+\.?\d*)\s*:',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            rate = match.group(1).replace(',', '')
-            try:
-                data['subscription_competition_rate'] = float(rate)
-                break
-            except:
-                pass
+    rate = _search_float(
+        SUBSCRIPTION_RATE_RE, _label_value(tree, '일반청약', '청약경쟁률')
+    )
+    if rate is not None:
+        data['subscription_competition_rate'] = rate
 
     # 7. 의무보유비율
-    patterns = [
-        r'의무보유확약[:\s]*([\d,]+\.?\d*)\s*%',
-        r'의무보유[^:\n]{0,20}([\d,]+\.?\d*)\s*%',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            ratio = match.group(1).replace(',', '')
-            try:
-                data['lockup_ratio'] = float(ratio)
-                break
-            except:
-                pass
+    ratio = _search_float(
+        LOCKUP_RATIO_RE, _label_value(tree, '의무보유확약', '의무보유')
+    )
+    if ratio is not None:
+        data['lockup_ratio'] = ratio
 
     return data
 
 
-# Test parsing
-print("="*80)
-print("PARSING 38.CO.KR IPO DATA")
-print("="*80)
-print()
+def _parse_ipo_html_safe(filename):
+    """Parse one file, returning (filename, data, error) instead of raising"""
+    try:
+        return filename, parse_ipo_html(filename), None
+    except Exception:
+        # Tracebacks are dropped when pickled back from the worker, so format here
+        return filename, None, traceback.format_exc()
+
+
+def parse_ipo_files(filenames, max_workers=None, chunksize=32):
+    """
+    Parse IPO HTML files in a process pool
+
+    Returns:
+        List of (filename, data, error) in input order; error is the formatted
+        traceback of a failed parse, or None on success
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(_parse_ipo_html_safe, filenames, chunksize=chunksize)
+        )
+
+
+def main():
+    """Test parsing"""
+    print("="*80)
+    print("PARSING 38.CO.KR IPO DATA")
+    print("="*80)
+    print()
+
+    files = [
+        '38_ipo_2000.html',
+        '38_ipo_1900.html',
+        '38_ipo_1800.html',
+    ]
 
-files = [
-    '38_ipo_2000.html',
-    '38_ipo_1900.html',
-    '38_ipo_1800.html',
-]
+    for filename, data, error in parse_ipo_files(files):
+        print(f"Parsing: {filename}")
+        print("-"*80)
 
-for filename in files:
-    print(f"Parsing: {filename}")
-    print("-"*80)
+        if error is None:
+            for key, value in data.items():
+                print(f"  {key:30}: {value}")
 
-    try:
-        data = parse_ipo_html(filename)
+            print()
 
-        for key, value in data.items():
-            print(f"  {key:30}: {value}")
+        else:
+            print(f"  Error: {error.splitlines()[-1]}")
+            print(error, end="")
+            print()
 
-        print()
+    print("="*80)
+    print("PARSING COMPLETE")
+    print("="*80)
 
-    except Exception as e:
-        print(f"  Error: {e}")
-        import traceback
-        traceback.print_exc()
-        print()
 
-print("="*80)
-print("PARSING COMPLETE")
-print("="*80)
+if __name__ == "__main__":
+    main()
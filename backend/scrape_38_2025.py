@@ -2,51 +2,104 @@
 Scrape current IPO data from 38.co.kr including price bands
 """
 
-import subprocess
-from bs4 import BeautifulSoup
+import requests
+import urllib3
+from lxml import html as lxml_html
 import pandas as pd
 import re
 
+# 38.co.kr certificate does not verify; skip verification like `curl -k`
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def parse_price(price_str):
-    """Parse price string to extract lower and upper bounds"""
-    if not price_str or price_str == "-":
-        return None, None
+# IPO list table (matched on one of its class tokens, like BeautifulSoup)
+IPO_TABLE_XPATH = (
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' tbl_style01 ')]"
+)
+CODE_RE = re.compile(r"code=(\d+)")
 
+# 38.co.kr serves EUC-KR; let libxml2 decode the raw bytes while parsing
+EUC_KR_PARSER = lxml_html.HTMLParser(encoding="euc-kr")
+
+# Raw text columns following the company cell, in table order
+RAW_COLUMNS = [
+    "listing_date",
+    "price_range",  # 공모희망가
+    "final_price",  # 확정공모가
+    "institutional_rate",  # 기관경쟁률
+    "subscription_rate",  # 청약경쟁률
+    "lockup",  # 의무보유확약
+]
+
+
+def parse_price(prices):
+    """
+    Parse price strings (Series) into lower and upper bounds
+
+    Ranges like "45,000~58,000" give both bounds; a single price is used
+    for both. Empty, "-" or unparseable values become NaN.
+    """
     # Remove commas and spaces
-    price_str = price_str.replace(",", "").replace(" ", "")
+    prices = prices.str.replace(r"[, ]", "", regex=True)
 
     # Check if it's a range (e.g., "45000~58000")
-    if "~" in price_str:
-        parts = price_str.split("~")
-        lower = int(parts[0])
-        upper = int(parts[1])
-        return lower, upper
-    else:
-        # Single price
-        price = int(price_str)
-        return price, price
+    parts = prices.str.split("~")
+    lower = pd.to_numeric(parts.str[0], errors="coerce")
+    upper = pd.to_numeric(parts.str[1], errors="coerce")
+    upper = upper.where(prices.str.contains("~", regex=False), lower)
+    return lower, upper
+
+
+def parse_rate(rates):
+    """Parse rate strings (Series, e.g. '488.95:1' or '62.08%'), invalid as 0.0"""
+    rates = (
+        rates.str.replace(",", "", regex=False)
+        .str.strip()
+        # Remove :1 and % suffixes
+        .str.replace(":1", "", regex=False)
+        .str.replace("%", "", regex=False)
+    )
+    return pd.to_numeric(rates, errors="coerce").fillna(0.0)
+
 
+def read_ipo_table(content):
+    """
+    Extract the 38.co.kr IPO table as raw cell text
 
-def parse_rate(rate_str):
-    """Parse rate string (e.g., '488.95:1' or '62.08%')"""
-    if not rate_str or rate_str == "-":
-        return 0.0
+    Args:
+        content: EUC-KR encoded page bytes
 
-    rate_str = rate_str.replace(",", "").strip()
+    Returns:
+        DataFrame with company_name, code and RAW_COLUMNS, or None if the
+        table is missing
+    """
+    tree = (
+        lxml_html.fromstring(content, parser=EUC_KR_PARSER) if content.strip() else None
+    )
+    tables = tree.xpath(IPO_TABLE_XPATH) if tree is not None else []
+    if not tables:
+        return None
 
-    # Remove :1 suffix
-    if ":1" in rate_str:
-        rate_str = rate_str.replace(":1", "")
+    records = []
+    for row in tables[0].xpath(".//tr")[1:]:  # Skip header
+        cols = row.xpath(".//td")
+        if len(cols) < 8:
+            continue
 
-    # Remove % suffix
-    if "%" in rate_str:
-        rate_str = rate_str.replace("%", "")
+        # Extract company name and code (from onclick)
+        company_link = cols[0].find(".//a")
+        if company_link is None:
+            continue
+        code_match = CODE_RE.search(company_link.get("onclick", ""))
 
-    try:
-        return float(rate_str)
-    except ValueError:
-        return 0.0
+        records.append(
+            [
+                company_link.text_content().strip(),
+                code_match.group(1) if code_match else None,
+                *(col.text_content().strip() for col in cols[1:7]),
+            ]
+        )
+
+    return pd.DataFrame(records, columns=["company_name", "code", *RAW_COLUMNS])
 
 
 def scrape_38_data():
@@ -55,76 +108,37 @@ def scrape_38_data():
 
     print("Fetching data from 38.co.kr...")
 
-    # Use curl to bypass SSL issues
-    result = subprocess.run(["curl", "-k", "-s", url], capture_output=True)
-
-    # Decode with EUC-KR encoding
-    html = result.stdout.decode("euc-kr", errors="ignore")
-
-    soup = BeautifulSoup(html, "html.parser")
+    try:
+        response = requests.get(url, timeout=30, verify=False)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ Failed to fetch 38.co.kr: {e}")
+        return pd.DataFrame()
 
     # Find the IPO table
-    table = soup.find("table", {"class": "tbl_style01"})
-    if not table:
+    raw = read_ipo_table(response.content)
+    if raw is None:
         print("❌ Could not find IPO table")
         return pd.DataFrame()
 
-    rows = table.find_all("tr")[1:]  # Skip header
-
-    data = []
-    for row in rows:
-        cols = row.find_all("td")
-        if len(cols) < 8:
-            continue
-
-        # Extract company name and code
-        company_cell = cols[0]
-        company_link = company_cell.find("a")
-        if not company_link:
-            continue
-
-        company_name = company_link.text.strip()
-
-        # Extract code from onclick or href
-        onclick = company_link.get("onclick", "")
-        code_match = re.search(r"code=(\d+)", onclick)
-        if code_match:
-            code = code_match.group(1)
-        else:
-            code = None
-
-        # Extract other fields
-        listing_date = cols[1].text.strip()
-        price_range = cols[2].text.strip()  # 공모희망가
-        final_price = cols[3].text.strip()  # 확정공모가
-        institutional_rate = cols[4].text.strip()  # 기관경쟁률
-        subscription_rate = cols[5].text.strip()  # 청약경쟁률
-        lockup = cols[6].text.strip()  # 의무보유확약
-
-        # Parse prices
-        price_lower, price_upper = parse_price(price_range)
-        final_price_val = parse_price(final_price)[0]  # Get single value
-
-        # Parse rates
-        institutional_demand_rate = parse_rate(institutional_rate)
-        subscription_competition_rate = parse_rate(subscription_rate)
-        lockup_ratio = parse_rate(lockup)
-
-        data.append(
-            {
-                "company_name": company_name,
-                "code": code,
-                "listing_date": listing_date,
-                "ipo_price_lower": price_lower,
-                "ipo_price_upper": price_upper,
-                "ipo_price_confirmed": final_price_val,
-                "institutional_demand_rate": institutional_demand_rate,
-                "subscription_competition_rate": subscription_competition_rate,
-                "lockup_ratio": lockup_ratio,
-            }
-        )
-
-    df = pd.DataFrame(data)
+    # Parse prices
+    price_lower, price_upper = parse_price(raw["price_range"])
+    final_price, _ = parse_price(raw["final_price"])  # Get single value
+
+    df = pd.DataFrame(
+        {
+            "company_name": raw["company_name"],
+            "code": raw["code"],
+            "listing_date": raw["listing_date"],
+            "ipo_price_lower": price_lower,
+            "ipo_price_upper": price_upper,
+            "ipo_price_confirmed": final_price,
+            # Parse rates
+            "institutional_demand_rate": parse_rate(raw["institutional_rate"]),
+            "subscription_competition_rate": parse_rate(raw["subscription_rate"]),
+            "lockup_ratio": parse_rate(raw["lockup"]),
+        }
+    )
 
     # Convert listing_date to standard format
     df["listing_date"] = pd.to_datetime(
@@ -154,7 +168,9 @@ def main():
     # Filter out SPAC companies
     if len(df) > 0:
         initial_count = len(df)
-        df = df[~df["company_name"].str.contains("기업인수목적", na=False)]
+        df = df.loc[
+            ~df["company_name"].str.contains("기업인수목적", na=False, regex=False)
+        ]
         spac_count = initial_count - len(df)
         if spac_count > 0:
             print(f"Filtered out {spac_count} SPAC companies")
@@ -163,7 +179,7 @@ def main():
 
     # Save to CSV
     output_file = "data/raw/38_2025_ipo_data.csv"
-    df.to_csv(output_file, index=False, encoding="utf-8-sig")
+    df.to_csv(output_file, index=False)
 
     print(f"✅ Saved to: {output_file}")
     print()
@@ -0,0 +1,36 @@
+"""
+API Response Frames
+Convert API record lists into typed DataFrames in one vectorized pass
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+
+def records_to_frame(records: List[Dict], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Build a DataFrame from API records and parse numeric string fields
+
+    Numeric fields arrive as strings (sometimes with thousands separators).
+    Each listed column present in the records is parsed at once; blank or
+    malformed values become 0, matching how collectors default missing
+    fields.
+
+    Args:
+        records: List of API record dictionaries
+        dtypes: Column name -> target dtype (e.g. "float32", "int64")
+
+    Returns:
+        DataFrame with numeric columns cast to their target dtypes
+    """
+    df = pd.DataFrame(records)
+
+    parsed = {}
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        values = df[col].astype(str).str.replace(",", "", regex=False)
+        parsed[col] = pd.to_numeric(values, errors="coerce").fillna(0).astype(dtype)
+
+    return df.assign(**parsed)
@@ -3,26 +3,121 @@ Korea Investment Securities (KIS) OpenAPI Client
 Handles authentication and data retrieval for intraday stock data
 """
 
+import asyncio
+import functools
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import json
+import orjson
+import os
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+    wait_random,
+)
+from src.api.retry import call_with_retry
+import pandas as pd
+from src.api.frames import records_to_frame
 from src.config.settings import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, token refreshes are locked per process
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on pages followed for paginated (cts) endpoints
+MAX_PAGES = 100
+
+# Refresh tokens this long before they expire
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+# Fallback token refresh lock where fcntl is unavailable (threads only)
+_TOKEN_REFRESH_LOCK = threading.Lock()
+
+# API endpoint path for each transaction ID (tr_id)
+ENDPOINTS = {
+    # 주식당일분봉조회
+    "FHKST03010200": "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice",
+    # 국내주식기간별시세 (일/주/월/년)
+    "FHKST03010100": "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+    # 주식현재가 시간대별체결
+    "FHKST03010300": "/uapi/domestic-stock/v1/quotations/inquire-time-itemconclusion",
+    # 주식현재가 시세
+    "FHKST01010100": "/uapi/domestic-stock/v1/quotations/inquire-price",
+    # 예탁원정보 공모주청약일정
+    "HHKDB669108C0": "/uapi/domestic-stock/v1/ksdinfo/pub-offer",
+}
+
+# Numeric fields parsed when responses are returned as DataFrames
+MINUTE_CANDLE_DTYPES = {
+    "stck_prpr": "float32",  # 현재가 (종가)
+    "stck_oprc": "float32",  # 시가
+    "stck_hgpr": "float32",  # 고가
+    "stck_lwpr": "float32",  # 저가
+    "cntg_vol": "int64",  # 체결 거래량
+    "acml_tr_pbmn": "int64",  # 누적 거래대금
+}
+DAILY_OHLCV_DTYPES = {
+    "stck_clpr": "float32",  # 종가
+    "stck_oprc": "float32",  # 시가
+    "stck_hgpr": "float32",  # 고가
+    "stck_lwpr": "float32",  # 저가
+    "acml_vol": "int64",  # 누적 거래량
+    "acml_tr_pbmn": "int64",  # 누적 거래대금
+}
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check if a request error is worth retrying (network, timeout, 429, 5xx)"""
+    if isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        status_code = error.response.status_code if error.response is not None else 0
+        return status_code == 429 or status_code >= 500
+    return False
+
 
 class KISApiClient:
     """Client for Korea Investment Securities OpenAPI"""
 
+    __slots__ = (
+        "app_key",
+        "app_secret",
+        "base_url",
+        "auth_url",
+        "timeout",
+        "_urls",
+        "_session",
+        "_content_encoding_logged",
+        "access_token",
+        "token_expires_at",
+        "_token_refresh_at",
+        "token_cache_file",
+        "token_lock_file",
+        "_auth_prefetch",
+    )
+
     def __init__(
         self,
         app_key: Optional[str] = None,
         app_secret: Optional[str] = None,
         timeout: int = 30,
+        prefetch_auth: bool = False,
     ):
         """
         Initialize KIS API client
@@ -31,6 +126,9 @@ class KISApiClient:
             app_key: KIS App Key (defaults to settings)
             app_secret: KIS App Secret (defaults to settings)
             timeout: Request timeout in seconds
+            prefetch_auth: Fetch the access token on a background thread so
+                it overlaps with caller setup instead of delaying the first
+                request
         """
         self.app_key = app_key or settings.KIS_APP_KEY
         self.app_secret = app_secret or settings.KIS_APP_SECRET
@@ -38,23 +136,71 @@ class KISApiClient:
         self.auth_url = settings.KIS_AUTH_URL
         self.timeout = timeout
 
+        # Full request URL per transaction ID, built once
+        self._urls = {
+            tr_id: f"{self.base_url}{endpoint}" for tr_id, endpoint in ENDPOINTS.items()
+        }
+
         if not self.app_key or not self.app_secret:
             raise ValueError("KIS_APP_KEY and KIS_APP_SECRET are required")
 
+        # Pooled session: keep-alive reuses TCP/TLS connections across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.API_POOL_CONNECTIONS,
+            pool_maxsize=settings.API_POOL_MAXSIZE,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(
+            {
+                "Content-Type": "application/json; charset=utf-8",
+                "Accept-Encoding": "gzip, deflate",
+                "appkey": self.app_key,
+                "appsecret": self.app_secret,
+            }
+        )
+        # Confirm once (at DEBUG) that the server honors gzip
+        self._content_encoding_logged = False
+
         self.access_token = None
         self.token_expires_at = None
+        # time.monotonic() deadline for refreshing the token (cheap hot-path check)
+        self._token_refresh_at = 0.0
         self.token_cache_file = Path("data/cache/kis_token.json")
+        self.token_lock_file = self.token_cache_file.with_suffix(".lock")
         self.token_cache_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Load cached token if available
-        self._load_cached_token()
+        self._auth_prefetch = None
+        if not self._load_cached_token() and prefetch_auth:
+            self._auth_prefetch = threading.Thread(
+                target=self._prefetch_token, name="kis-auth-prefetch", daemon=True
+            )
+            self._auth_prefetch.start()
 
         logger.info("Initialized KISApiClient")
 
-    def _load_cached_token(self):
-        """Load cached token from file if available and not expired"""
+    def close(self):
+        """Close pooled HTTP connections"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _load_cached_token(self) -> bool:
+        """
+        Load cached token from file if available and not expired
+
+        Returns:
+            True if a valid cached token was loaded
+        """
         if not self.token_cache_file.exists():
-            return
+            return False
 
         try:
             with open(self.token_cache_file, "r") as f:
@@ -65,19 +211,44 @@ class KISApiClient:
             if expires_at_str:
                 expires_at = datetime.fromisoformat(expires_at_str)
 
-                # Check if token is still valid
-                if datetime.now() < expires_at:
-                    self.access_token = cache_data.get("access_token")
-                    self.token_expires_at = expires_at
+                # Check if token is still valid (with refresh margin)
+                if datetime.now() < expires_at - TOKEN_EXPIRY_MARGIN:
+                    self._set_access_token(cache_data.get("access_token"), expires_at)
                     logger.info(
                         f"✅ Loaded cached token, expires at {expires_at.strftime('%Y-%m-%d %H:%M:%S')}"
                     )
+                    return True
                 else:
                     logger.info("Cached token expired, will request new one")
 
         except Exception as e:
             logger.warning(f"Failed to load cached token: {e}")
 
+        return False
+
+    def _set_access_token(self, access_token: str, expires_at: datetime):
+        """Store the token and attach it to every session request"""
+        self.access_token = access_token
+        self.token_expires_at = expires_at
+        remaining = expires_at - TOKEN_EXPIRY_MARGIN - datetime.now()
+        self._token_refresh_at = time.monotonic() + remaining.total_seconds()
+        self._session.headers["authorization"] = f"Bearer {access_token}"
+
+    @contextmanager
+    def _token_file_lock(self):
+        """Hold an exclusive lock so concurrent workers refresh the token once"""
+        if fcntl is None:
+            with _TOKEN_REFRESH_LOCK:
+                yield
+            return
+
+        with open(self.token_lock_file, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
     def _save_token_to_cache(self):
         """Save current token to cache file"""
         if not self.access_token or not self.token_expires_at:
@@ -89,14 +260,26 @@ class KISApiClient:
                 "expires_at": self.token_expires_at.isoformat(),
             }
 
-            with open(self.token_cache_file, "w") as f:
+            # Token grants account access; keep the file private to the owner
+            fd = os.open(
+                self.token_cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(fd, "w") as f:
                 json.dump(cache_data, f, indent=2)
+            os.chmod(self.token_cache_file, 0o600)
 
             logger.info(f"Token cached to {self.token_cache_file}")
 
         except Exception as e:
             logger.warning(f"Failed to save token to cache: {e}")
 
+    @retry(
+        stop=stop_after_attempt(3) | stop_after_delay(60),
+        # Jitter keeps concurrent workers from retrying in lockstep
+        wait=wait_exponential(multiplier=1, min=2, max=10) + wait_random(0, 2),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True,
+    )
     def authenticate(self) -> str:
         """
         Get OAuth2 access token
@@ -115,16 +298,17 @@ class KISApiClient:
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.auth_url, json=payload, headers=headers, timeout=self.timeout
             )
             response.raise_for_status()
 
             data = response.json()
-            self.access_token = data["access_token"]
             expires_in = int(data.get("expires_in", 86400))  # Default 24 hours
 
-            self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            self._set_access_token(
+                data["access_token"], datetime.now() + timedelta(seconds=expires_in)
+            )
 
             # Save token to cache
             self._save_token_to_cache()
@@ -139,55 +323,73 @@ class KISApiClient:
             logger.error(f"Failed to authenticate: {e}")
             raise
 
+    def _refresh_token(self):
+        """Load a token another worker cached, or authenticate"""
+        with self._token_file_lock():
+            # Another worker may have refreshed the token while we waited
+            if not self._load_cached_token():
+                self.authenticate()
+
+    def _prefetch_token(self):
+        """Background token fetch; failures are retried by the first request"""
+        try:
+            self._refresh_token()
+        except Exception as e:
+            logger.warning(f"Background authentication failed: {e}")
+
     def _ensure_authenticated(self):
         """Ensure we have a valid access token"""
-        # Only re-authenticate if token is missing or expired
-        if not self.access_token:
-            self.authenticate()
-        elif self.token_expires_at and datetime.now() >= self.token_expires_at:
+        prefetch = self._auth_prefetch
+        if prefetch is not None:
+            # Wait for the token fetch started at construction
+            prefetch.join()
+            self._auth_prefetch = None
+
+        # Token is still valid, no need to re-authenticate
+        if self.access_token and time.monotonic() < self._token_refresh_at:
+            return
+
+        if self.access_token:
             logger.info("Access token expired, re-authenticating...")
-            self.authenticate()
-        else:
-            # Token is still valid, no need to re-authenticate
-            pass
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
-    def _make_request(
-        self, endpoint: str, params: Dict[str, Any], tr_id: str
-    ) -> Dict[str, Any]:
+        self._refresh_token()
+
+    def _make_request(self, tr_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Make authenticated API request
+        Make authenticated API request, retrying transient failures
+
+        API errors (rt_cd != "0"), auth failures and other 4xx fail fast.
 
         Args:
-            endpoint: API endpoint path
+            tr_id: Transaction ID for the API (selects the endpoint)
             params: Query parameters
-            tr_id: Transaction ID for the API
 
         Returns:
             API response data
         """
-        self._ensure_authenticated()
+        return call_with_retry(
+            lambda: self._request_once(tr_id, params), _is_transient_error
+        )
 
-        url = f"{self.base_url}{endpoint}"
+    def _request_once(self, tr_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Make a single authenticated API request"""
+        self._ensure_authenticated()
 
-        headers = {
-            "Content-Type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id,
-        }
+        url = self._urls[tr_id]
 
         try:
-            response = requests.get(
-                url, params=params, headers=headers, timeout=self.timeout
+            # appkey, appsecret and authorization are set on the session
+            response = self._session.get(
+                url, params=params, headers={"tr_id": tr_id}, timeout=self.timeout
             )
             response.raise_for_status()
 
-            data = response.json()
+            if not self._content_encoding_logged:
+                encoding = response.headers.get("Content-Encoding")
+                logger.debug(f"Response Content-Encoding: {encoding}")
+                self._content_encoding_logged = True
+
+            data = orjson.loads(response.content)
 
             # Check for API error
             if data.get("rt_cd") != "0":
@@ -202,8 +404,12 @@ class KISApiClient:
             raise
 
     def get_minute_candles(
-        self, stock_code: str, date: str, interval: str = "1"
-    ) -> List[Dict[str, Any]]:
+        self,
+        stock_code: str,
+        date: str,
+        interval: str = "1",
+        return_dataframe: bool = False,
+    ) -> Union[List[Dict[str, Any]], pd.DataFrame]:
         """
         Get minute candle data for a specific date
 
@@ -211,13 +417,13 @@ class KISApiClient:
             stock_code: 6-digit stock code (e.g., "005930" for Samsung)
             date: Date in YYYYMMDD format
             interval: Candle interval ("1", "3", "5", "10", "30", "60")
+            return_dataframe: Return a DataFrame with numeric price/volume columns
 
         Returns:
-            List of candle data dictionaries
+            List of candle data dictionaries (or DataFrame)
         """
         logger.info(f"Fetching {interval}-minute candles for {stock_code} on {date}...")
 
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
         tr_id = "FHKST03010200"
 
         params = {
@@ -229,18 +435,20 @@ class KISApiClient:
         }
 
         try:
-            response = self._make_request(endpoint, params, tr_id)
+            response = self._make_request(tr_id, params)
 
             # Extract output data
             candles = response.get("output2", [])
 
             logger.info(f"Retrieved {len(candles)} candle records")
 
+            if return_dataframe:
+                return records_to_frame(candles, MINUTE_CANDLE_DTYPES)
             return candles
 
         except Exception as e:
             logger.error(f"Failed to get minute candles: {e}")
-            return []
+            return pd.DataFrame() if return_dataframe else []
 
     def get_daily_ohlcv(
         self,
@@ -249,7 +457,8 @@ class KISApiClient:
         end_date: str,
         period_code: str = "D",
         adj_price: str = "1",
-    ) -> List[Dict[str, Any]]:
+        return_dataframe: bool = False,
+    ) -> Union[List[Dict[str, Any]], pd.DataFrame]:
         """
         Get daily OHLCV data with additional indicators (PER, EPS, PBR, etc.)
 
@@ -259,15 +468,16 @@ class KISApiClient:
             end_date: End date in YYYYMMDD format
             period_code: Period type - "D" (daily), "W" (weekly), "M" (monthly), "Y" (yearly)
             adj_price: Price adjustment - "0" (adjusted), "1" (original)
+            return_dataframe: Return a DataFrame with numeric price/volume columns
 
         Returns:
             List of daily data dictionaries with PER, EPS, PBR, volume, etc.
+            (or DataFrame)
         """
         logger.info(
             f"Fetching daily data for {stock_code} from {start_date} to {end_date}..."
         )
 
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
         tr_id = "FHKST03010100"
 
         params = {
@@ -280,18 +490,20 @@ class KISApiClient:
         }
 
         try:
-            response = self._make_request(endpoint, params, tr_id)
+            response = self._make_request(tr_id, params)
 
             # Extract output data (output2 contains the daily records)
             daily_data = response.get("output2", [])
 
             logger.info(f"Retrieved {len(daily_data)} daily records")
 
+            if return_dataframe:
+                return records_to_frame(daily_data, DAILY_OHLCV_DTYPES)
             return daily_data
 
         except Exception as e:
             logger.error(f"Failed to get daily data: {e}")
-            return []
+            return pd.DataFrame() if return_dataframe else []
 
     def get_time_based_trades(self, stock_code: str, date: str) -> List[Dict[str, Any]]:
         """
@@ -306,7 +518,6 @@ class KISApiClient:
         """
         logger.info(f"Fetching time-based trades for {stock_code} on {date}...")
 
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-time-itemconclusion"
         tr_id = "FHKST03010300"
 
         params = {
@@ -316,7 +527,7 @@ class KISApiClient:
         }
 
         try:
-            response = self._make_request(endpoint, params, tr_id)
+            response = self._make_request(tr_id, params)
 
             # Extract output data
             trades = response.get("output2", [])
@@ -341,7 +552,6 @@ class KISApiClient:
         """
         logger.info(f"Fetching current price for {stock_code}...")
 
-        endpoint = "/uapi/domestic-stock/v1/quotations/inquire-price"
         tr_id = "FHKST01010100"
 
         params = {
@@ -350,7 +560,7 @@ class KISApiClient:
         }
 
         try:
-            response = self._make_request(endpoint, params, tr_id)
+            response = self._make_request(tr_id, params)
             output = response.get("output", {})
 
             return output
@@ -386,7 +596,6 @@ class KISApiClient:
         """
         logger.info(f"Fetching IPO offering info from {start_date} to {end_date}...")
 
-        endpoint = "/uapi/domestic-stock/v1/ksdinfo/pub-offer"
         tr_id = "HHKDB669108C0"
 
         params = {
@@ -396,19 +605,179 @@ class KISApiClient:
             "t_dt": end_date,  # YYYYMMDD
         }
 
-        try:
-            response = self._make_request(endpoint, params, tr_id)
+        offerings = []
+        seen_tokens = set()
+
+        # Follow the continuation token until the last page; pages share
+        # the pooled session's connection
+        for page in range(MAX_PAGES):
+            try:
+                response = self._make_request(tr_id, params)
+            except Exception as e:
+                if not offerings:
+                    logger.error(f"Failed to get IPO offering info: {e}")
+                    return []
+                # Keep the pages already fetched rather than dropping them
+                logger.warning(
+                    f"Failed to get IPO offering page {page + 1}, returning "
+                    f"{len(offerings)} records from earlier pages: {e}"
+                )
+                return offerings
 
             # Extract output data (output1 for IPO offering API)
-            offerings = response.get("output1", [])
+            offerings.extend(response.get("output1", []))
 
-            logger.info(f"Retrieved {len(offerings)} IPO offering records")
+            cts = (response.get("cts") or response.get("ctx") or "").strip()
+            if not cts or cts in seen_tokens:
+                break
+            seen_tokens.add(cts)
+            params = {**params, "cts": cts}
+        else:
+            logger.warning(f"Stopped IPO offering pagination after {MAX_PAGES} pages")
 
-            return offerings
+        logger.info(f"Retrieved {len(offerings)} IPO offering records")
 
-        except Exception as e:
-            logger.error(f"Failed to get IPO offering info: {e}")
-            return []
+        return offerings
+
+    def get_minute_candles_batch(
+        self,
+        stock_codes: List[str],
+        date: str,
+        interval: str = "1",
+        max_workers: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get minute candle data for many stocks concurrently
+
+        Requests run on a thread pool sharing the pooled session, so network
+        waits overlap instead of adding up.
+
+        Args:
+            stock_codes: 6-digit stock codes
+            date: Date in YYYYMMDD format
+            interval: Candle interval ("1", "3", "5", "10", "30", "60")
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            Dictionary mapping stock code to its candle data
+        """
+        # Authenticate once up front so workers don't race to fetch a token
+        self._ensure_authenticated()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda code: self.get_minute_candles(code, date, interval),
+                stock_codes,
+            )
+            return dict(zip(stock_codes, results))
+
+    def get_daily_ohlcv_batch(
+        self,
+        stock_codes: List[str],
+        start_date: str,
+        end_date: str,
+        max_workers: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get daily OHLCV data for many stocks concurrently
+
+        Args:
+            stock_codes: 6-digit stock codes
+            start_date: Start date in YYYYMMDD format
+            end_date: End date in YYYYMMDD format
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            Dictionary mapping stock code to its daily data
+        """
+        self._ensure_authenticated()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                lambda code: self.get_daily_ohlcv(code, start_date, end_date),
+                stock_codes,
+            )
+            return dict(zip(stock_codes, results))
+
+
+class AsyncKISApiClient:
+    """
+    asyncio facade over KISApiClient
+
+    Each call runs the blocking client method on a thread pool, so callers can
+    overlap many requests with asyncio.gather while sharing one pooled
+    session. requests releases the GIL while waiting on the network.
+    """
+
+    __slots__ = ("_sync", "_executor")
+
+    def __init__(
+        self,
+        app_key: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        timeout: int = 30,
+        max_workers: int = 16,
+        prefetch_auth: bool = False,
+    ):
+        """
+        Initialize async KIS API client
+
+        Args:
+            app_key: KIS App Key (defaults to settings)
+            app_secret: KIS App Secret (defaults to settings)
+            timeout: Request timeout in seconds
+            max_workers: Maximum concurrent requests
+            prefetch_auth: Start fetching the access token right away
+                (see KISApiClient)
+        """
+        self._sync = KISApiClient(app_key, app_secret, timeout, prefetch_auth)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking client method on the thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def authenticate(self) -> str:
+        """Get OAuth2 access token"""
+        return await self._run(self._sync.authenticate)
+
+    async def ready(self):
+        """Wait until a valid access token is available"""
+        await self._run(self._sync._ensure_authenticated)
+
+    async def get_minute_candles(self, *args, **kwargs):
+        """Get minute candle data (see KISApiClient.get_minute_candles)"""
+        return await self._run(self._sync.get_minute_candles, *args, **kwargs)
+
+    async def get_daily_ohlcv(self, *args, **kwargs):
+        """Get daily OHLCV data (see KISApiClient.get_daily_ohlcv)"""
+        return await self._run(self._sync.get_daily_ohlcv, *args, **kwargs)
+
+    async def get_time_based_trades(self, *args, **kwargs):
+        """Get time-based trades (see KISApiClient.get_time_based_trades)"""
+        return await self._run(self._sync.get_time_based_trades, *args, **kwargs)
+
+    async def get_current_price(self, *args, **kwargs):
+        """Get current price (see KISApiClient.get_current_price)"""
+        return await self._run(self._sync.get_current_price, *args, **kwargs)
+
+    async def get_ipo_offering_info(self, *args, **kwargs):
+        """Get IPO offering info (see KISApiClient.get_ipo_offering_info)"""
+        return await self._run(self._sync.get_ipo_offering_info, *args, **kwargs)
+
+    def close(self):
+        """Shut down the thread pool and close pooled HTTP connections"""
+        self._executor.shutdown(wait=True)
+        self._sync.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
 if __name__ == "__main__":
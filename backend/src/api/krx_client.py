@@ -3,15 +3,53 @@ KRX API Client
 Handles API calls to KRX Data API for KOSDAQ stock information
 """
 
+import json
+import threading
+import orjson
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
 import requests
-from typing import Dict, List, Optional
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
+import pandas as pd
+from src.api.frames import records_to_frame
+from src.api.retry import call_with_retry
+from src.config.settings import settings
 from src.data_collection.cache_manager import CacheManager
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, the quota is only shared per process
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Numeric fields parsed when daily trade data is returned as a DataFrame
+DAILY_TRADE_DTYPES = {
+    "TDD_CLSPRC": "float32",  # 종가
+    "CMPPREVDD_PRC": "float32",  # 대비
+    "FLUC_RT": "float32",  # 등락률
+    "TDD_OPNPRC": "float32",  # 시가
+    "TDD_HGPRC": "float32",  # 고가
+    "TDD_LWPRC": "float32",  # 저가
+    "ACC_TRDVOL": "int64",  # 거래량
+    "ACC_TRDVAL": "int64",  # 거래대금
+    "MKTCAP": "int64",  # 시가총액
+    "LIST_SHRS": "int64",  # 상장주식수
+}
+
+# Cached responses for dates this recent may still be corrected by KRX, so they
+# are refetched after RECENT_CACHE_MAX_AGE seconds; older dates never expire
+SETTLED_AFTER_DAYS = 2
+RECENT_CACHE_MAX_AGE = 60 * 60
+
+# Fallback quota file lock where fcntl is unavailable (threads only)
+_QUOTA_FILE_LOCK = threading.Lock()
+
 
 class KRXApiError(Exception):
     """KRX API Error"""
@@ -19,6 +57,130 @@ class KRXApiError(Exception):
     pass
 
 
+class KRXTransientError(KRXApiError):
+    """KRX API error worth retrying (timeout, 429, 5xx)"""
+
+    pass
+
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check if a request error is worth retrying; rate limit and 4xx fail fast"""
+    return isinstance(error, (KRXTransientError, requests.exceptions.ConnectionError))
+
+
+def cache_max_age(base_date: str) -> Optional[float]:
+    """Get the cache max age for a date-keyed response (None: immutable)"""
+    settled_before = datetime.now() - timedelta(days=SETTLED_AFTER_DAYS)
+    if base_date < settled_before.strftime("%Y%m%d"):
+        return None
+    return RECENT_CACHE_MAX_AGE
+
+
+def short_code_from_isu_cd(isu_cd: str) -> str:
+    """
+    Extract the 6-digit short code from an ISU_CD value
+
+    Standard codes look like "KR7123450001" (short code at positions 3-8);
+    anything else is matched on its last 6 characters.
+    """
+    if len(isu_cd) == 12 and isu_cd.startswith("KR"):
+        return isu_cd[3:9]
+    return isu_cd[-6:]
+
+
+@contextmanager
+def _quota_file_lock(f, exclusive: bool = True):
+    """Hold a file lock, or the in-process fallback lock without fcntl"""
+    if fcntl is None:
+        with _QUOTA_FILE_LOCK:
+            yield
+        return
+
+    fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield
+    finally:
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SharedRequestQuota:
+    """
+    Daily per-endpoint request counts shared by all processes
+
+    Counts live in a JSON file per day, updated under an exclusive file lock,
+    so parallel workers draw from one quota instead of each assuming a full
+    daily allowance.
+    """
+
+    __slots__ = ("quota_dir", "limit")
+
+    def __init__(self, quota_dir: str = "data/cache", limit: int = 10000):
+        """
+        Initialize shared quota
+
+        Args:
+            quota_dir: Directory for the daily quota files
+            limit: Maximum requests per endpoint per day
+        """
+        self.quota_dir = Path(quota_dir)
+        self.quota_dir.mkdir(parents=True, exist_ok=True)
+        self.limit = limit
+
+    def _quota_file(self) -> Path:
+        """Get quota file path for today"""
+        return self.quota_dir / f"krx_quota_{datetime.now().strftime('%Y%m%d')}.json"
+
+    def _remove_stale_files(self, quota_file: Path):
+        """Remove quota files left over from earlier days"""
+        for stale_file in self.quota_dir.glob("krx_quota_*.json"):
+            if stale_file.name < quota_file.name:
+                stale_file.unlink(missing_ok=True)
+
+    def acquire(self, endpoint_key: str) -> int:
+        """
+        Reserve one request for an endpoint
+
+        Args:
+            endpoint_key: Endpoint to charge the request to
+
+        Returns:
+            Number of requests used today for the endpoint, including this one
+
+        Raises:
+            KRXApiError: If the daily quota is exhausted
+        """
+        quota_file = self._quota_file()
+        with open(quota_file, "a+") as f, _quota_file_lock(f):
+            f.seek(0)
+            content = f.read()
+            counts = json.loads(content) if content else {}
+            if not counts:
+                self._remove_stale_files(quota_file)
+
+            count = counts.get(endpoint_key, 0)
+            if count >= self.limit:
+                raise KRXApiError(
+                    f"Shared daily rate limit exceeded for {endpoint_key} "
+                    f"({count}/{self.limit} requests)"
+                )
+
+            counts[endpoint_key] = count + 1
+            f.seek(0)
+            f.truncate()
+            json.dump(counts, f)
+
+        return count + 1
+
+    def get_counts(self) -> Dict[str, int]:
+        """Get today's request counts across all processes"""
+        quota_file = self._quota_file()
+        if not quota_file.exists():
+            return {}
+        with open(quota_file, "r") as f, _quota_file_lock(f, exclusive=False):
+            content = f.read()
+        return json.loads(content) if content else {}
+
+
 class KRXApiClient:
     """
     KRX API Client for KOSDAQ data
@@ -26,7 +188,33 @@ class KRXApiClient:
     API Rate Limit: 10,000 requests per day per API
     """
 
-    def __init__(self, api_key: str, timeout: int = 30, use_cache: bool = True):
+    __slots__ = (
+        "api_key",
+        "timeout",
+        "use_cache",
+        "refresh_cache",
+        "base_url",
+        "endpoints",
+        "request_count",
+        "_request_count_lock",
+        "shared_quota",
+        "_response_memo",
+        "_stock_info_index",
+        "_daily_trade_index",
+        "_listing_date_index",
+        "_session",
+        "_content_encoding_logged",
+        "cache_manager",
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 30,
+        use_cache: bool = True,
+        quota_dir: str = "data/cache",
+        refresh_cache: bool = False,
+    ):
         """
         Initialize KRX API Client
 
@@ -34,10 +222,14 @@ class KRXApiClient:
             api_key: KRX API key
             timeout: Request timeout in seconds
             use_cache: Enable response caching (default: True)
+            quota_dir: Directory for the daily request quota shared by workers
+            refresh_cache: Ignore responses cached by earlier runs and re-fetch
+                them (fresh responses are still cached)
         """
         self.api_key = api_key
         self.timeout = timeout
         self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
         self.base_url = "https://data-dbg.krx.co.kr/svc/apis/sto"
 
         # API endpoints
@@ -51,31 +243,93 @@ class KRXApiClient:
             "stock_info": 0,
             "daily_trade": 0,
         }
+        self._request_count_lock = threading.Lock()
+        self.shared_quota = SharedRequestQuota(quota_dir)
+
+        # In-process copy of settled responses, keyed by (endpoint_key, base_date),
+        # so hot lookups skip the disk read and unpickle; recent dates are not
+        # memoized so RECENT_CACHE_MAX_AGE still applies within a process
+        self._response_memo: Dict[Tuple[str, str], List[Dict]] = {}
+
+        # Per-date code -> record indexes for by-code lookups (settled dates only)
+        self._stock_info_index: Dict[str, Dict[str, Dict]] = {}
+        self._daily_trade_index: Dict[str, Dict[str, Dict]] = {}
+        self._listing_date_index: Dict[str, Dict[str, List[Dict]]] = {}
+
+        # Pooled session: keep-alive reuses TCP/TLS connections across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.API_POOL_CONNECTIONS,
+            pool_maxsize=settings.API_POOL_MAXSIZE,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+            }
+        )
+        # Confirm once (at DEBUG) that the server honors gzip
+        self._content_encoding_logged = False
 
         # Cache manager
         if use_cache:
             self.cache_manager = CacheManager()
-            cache_stats = self.cache_manager.get_cache_stats()
+            cache_stats = self.cache_manager.get_cache_stats(include_size=False)
             logger.info(f"Cache enabled: {cache_stats['cache_count']} cached responses")
         else:
             self.cache_manager = None
 
         logger.info("Initialized KRXApiClient")
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers with API key"""
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+    def _read_cached_response(
+        self, cache_key: str, base_date: str
+    ) -> Optional[List[Dict]]:
+        """Read a response cached on disk (skipped when refresh_cache is set)"""
+        if self.refresh_cache:
+            return None
+        return self.cache_manager.get(cache_key, max_age=cache_max_age(base_date))
+
+    def _remember(self, memo_key: Tuple[str, str], data: List[Dict]):
+        """Memoize a response in process if its date is settled"""
+        if cache_max_age(memo_key[1]) is None:
+            self._response_memo[memo_key] = data
+
+    def close(self):
+        """Close pooled HTTP connections"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     def _make_request(self, endpoint_key: str, params: Dict) -> Dict:
         """
-        Make API request with retry logic
+        Make API request, retrying transient failures with jittered backoff
+
+        Args:
+            endpoint_key: Key for endpoint in self.endpoints
+            params: Request parameters
+
+        Returns:
+            API response as dictionary
+
+        Raises:
+            KRXTransientError: If API request keeps timing out or the server is busy
+            KRXApiError: If API request fails
+        """
+        return call_with_retry(
+            lambda: self._request_once(endpoint_key, params), _is_transient_error
+        )
+
+    def _request_once(self, endpoint_key: str, params: Dict) -> Dict:
+        """
+        Make a single API request
 
         Args:
             endpoint_key: Key for endpoint in self.endpoints
@@ -85,6 +339,7 @@ class KRXApiClient:
             API response as dictionary
 
         Raises:
+            KRXTransientError: If API request times out or the server is busy
             KRXApiError: If API request fails
         """
         endpoint = self.endpoints[endpoint_key]
@@ -101,32 +356,43 @@ class KRXApiClient:
                 f"Daily rate limit exceeded for {endpoint_key} (10,000 requests)"
             )
 
+        # Charge the request against the quota shared with other workers
+        self.shared_quota.acquire(endpoint_key)
+
         try:
             logger.debug(f"API Request to {endpoint} with params: {params}")
 
-            response = requests.get(
+            response = self._session.get(
                 endpoint,
                 params=params,
-                headers=self._get_headers(),
                 timeout=self.timeout,
             )
             response.raise_for_status()
 
-            # Increment request counter
-            self.request_count[endpoint_key] += 1
+            if not self._content_encoding_logged:
+                encoding = response.headers.get("Content-Encoding")
+                logger.debug(f"Response Content-Encoding: {encoding}")
+                self._content_encoding_logged = True
 
-            data = response.json()
+            # Increment request counter (shared by batch worker threads)
+            with self._request_count_lock:
+                self.request_count[endpoint_key] += 1
+
+            data = orjson.loads(response.content)
             logger.debug(f"API Response: {len(data.get('OutBlock_1', []))} records")
 
             return data
 
         except requests.exceptions.Timeout:
             logger.error(f"API timeout: {endpoint}")
-            raise KRXApiError("API 요청 시간 초과")
+            raise KRXTransientError("API 요청 시간 초과")
 
         except requests.exceptions.HTTPError as e:
             logger.error(f"API HTTP error: {e}")
-            raise KRXApiError(f"API 오류: {e.response.status_code}")
+            status_code = e.response.status_code
+            if status_code == 429 or status_code >= 500:
+                raise KRXTransientError(f"API 오류: {status_code}")
+            raise KRXApiError(f"API 오류: {status_code}")
 
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
@@ -161,11 +427,16 @@ class KRXApiClient:
         # Check cache
         cache_enabled = self.use_cache if use_cache is None else use_cache
         if cache_enabled and self.cache_manager:
+            memo_key = ("stock_info", base_date)
+            if memo_key in self._response_memo:
+                return self._response_memo[memo_key]
+
             cache_key = self.cache_manager.generate_date_cache_key(
                 "stock_info", base_date
             )
-            cached_data = self.cache_manager.get(cache_key)
+            cached_data = self._read_cached_response(cache_key, base_date)
             if cached_data is not None:
+                self._remember(memo_key, cached_data)
                 logger.info(f"Using cached stock info for date {base_date}")
                 return cached_data
 
@@ -179,12 +450,16 @@ class KRXApiClient:
         # Save to cache
         if cache_enabled and self.cache_manager:
             self.cache_manager.set(cache_key, stocks)
+            self._remember(memo_key, stocks)
 
         return stocks
 
     def get_daily_trade_data(
-        self, base_date: str, use_cache: bool = None
-    ) -> List[Dict]:
+        self,
+        base_date: str,
+        use_cache: bool = None,
+        return_dataframe: bool = False,
+    ) -> Union[List[Dict], pd.DataFrame]:
         """
         Get KOSDAQ daily trading data
 
@@ -194,9 +469,10 @@ class KRXApiClient:
         Args:
             base_date: 기준일자 (YYYYMMDD format)
             use_cache: Override global cache setting for this request
+            return_dataframe: Return a DataFrame with numeric price/volume columns
 
         Returns:
-            List of trading data dictionaries with keys:
+            List of trading data dictionaries (or DataFrame) with keys:
             - BAS_DD: 기준일자
             - ISU_CD: 종목코드
             - ISU_NM: 종목명
@@ -213,14 +489,23 @@ class KRXApiClient:
             - MKTCAP: 시가총액
             - LIST_SHRS: 상장주식수
         """
+        if return_dataframe:
+            trades = self.get_daily_trade_data(base_date, use_cache)
+            return records_to_frame(trades, DAILY_TRADE_DTYPES)
+
         # Check cache
         cache_enabled = self.use_cache if use_cache is None else use_cache
         if cache_enabled and self.cache_manager:
+            memo_key = ("daily_trade", base_date)
+            if memo_key in self._response_memo:
+                return self._response_memo[memo_key]
+
             cache_key = self.cache_manager.generate_date_cache_key(
                 "daily_trade", base_date
             )
-            cached_data = self.cache_manager.get(cache_key)
+            cached_data = self._read_cached_response(cache_key, base_date)
             if cached_data is not None:
+                self._remember(memo_key, cached_data)
                 logger.info(f"Using cached trade data for date {base_date}")
                 return cached_data
 
@@ -234,9 +519,53 @@ class KRXApiClient:
         # Save to cache
         if cache_enabled and self.cache_manager:
             self.cache_manager.set(cache_key, trades)
+            self._remember(memo_key, trades)
 
         return trades
 
+    def get_cached_daily_trade_data(self, base_date: str) -> Optional[List[Dict]]:
+        """
+        Get KOSDAQ daily trading data from the cache only, without an API call
+
+        Args:
+            base_date: 기준일자 (YYYYMMDD format)
+
+        Returns:
+            Cached trading data, or None if it is not cached (or has expired)
+        """
+        if not self.cache_manager:
+            return None
+
+        memo_key = ("daily_trade", base_date)
+        if memo_key in self._response_memo:
+            return self._response_memo[memo_key]
+
+        cache_key = self.cache_manager.generate_date_cache_key("daily_trade", base_date)
+        cached_data = self._read_cached_response(cache_key, base_date)
+        if cached_data is not None:
+            self._remember(memo_key, cached_data)
+        return cached_data
+
+    def get_daily_trade_data_batch(
+        self, base_dates: List[str], max_workers: int = 10
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get KOSDAQ daily trading data for many dates concurrently
+
+        Requests run on a thread pool sharing the pooled session, so network
+        waits overlap instead of adding up.
+
+        Args:
+            base_dates: 기준일자 list (YYYYMMDD format)
+            max_workers: Maximum concurrent requests
+
+        Returns:
+            Dictionary mapping base date to its trading data
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self.get_daily_trade_data, base_dates)
+            return dict(zip(base_dates, results))
+
     def get_stock_info_by_code(self, base_date: str, stock_code: str) -> Optional[Dict]:
         """
         Get stock information for a specific stock code
@@ -248,14 +577,18 @@ class KRXApiClient:
         Returns:
             Stock information dictionary or None if not found
         """
-        stocks = self.get_stock_info(base_date)
-
-        for stock in stocks:
-            if stock.get("ISU_SRT_CD") == stock_code:
-                return stock
-
-        logger.warning(f"Stock {stock_code} not found for date {base_date}")
-        return None
+        index = self._stock_info_index.get(base_date)
+        if index is None:
+            stocks = self.get_stock_info(base_date)
+            # Reversed so the first record wins for duplicate codes
+            index = {stock.get("ISU_SRT_CD"): stock for stock in reversed(stocks)}
+            if cache_max_age(base_date) is None:
+                self._stock_info_index[base_date] = index
+
+        stock = index.get(stock_code)
+        if stock is None:
+            logger.warning(f"Stock {stock_code} not found for date {base_date}")
+        return stock
 
     def get_daily_trade_by_code(
         self, base_date: str, stock_code: str
@@ -270,15 +603,23 @@ class KRXApiClient:
         Returns:
             Trade data dictionary or None if not found
         """
-        trades = self.get_daily_trade_data(base_date)
-
-        for trade in trades:
-            # Match by ISU_CD (종목코드)
-            if stock_code in trade.get("ISU_CD", ""):
-                return trade
-
-        logger.warning(f"Trade data for {stock_code} not found for date {base_date}")
-        return None
+        index = self._daily_trade_index.get(base_date)
+        if index is None:
+            trades = self.get_daily_trade_data(base_date)
+            # Match by the short code within ISU_CD (종목코드)
+            index = {
+                short_code_from_isu_cd(trade.get("ISU_CD", "")): trade
+                for trade in reversed(trades)
+            }
+            if cache_max_age(base_date) is None:
+                self._daily_trade_index[base_date] = index
+
+        trade = index.get(stock_code)
+        if trade is None:
+            logger.warning(
+                f"Trade data for {stock_code} not found for date {base_date}"
+            )
+        return trade
 
     def get_ipo_stocks(self, base_date: str, listing_date: str) -> List[Dict]:
         """
@@ -291,9 +632,7 @@ class KRXApiClient:
         Returns:
             List of newly listed stocks
         """
-        stocks = self.get_stock_info(base_date)
-
-        ipo_stocks = [stock for stock in stocks if stock.get("LIST_DD") == listing_date]
+        ipo_stocks = self._stocks_by_listing_date(base_date).get(listing_date, [])
 
         logger.info(
             f"Found {len(ipo_stocks)} IPO stocks for listing date {listing_date}"
@@ -301,9 +640,43 @@ class KRXApiClient:
 
         return ipo_stocks
 
+    def get_ipo_stocks_range(
+        self, base_date: str, listing_dates: Iterable[str]
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get stocks listed on each of several dates with a single stock info fetch
+
+        Args:
+            base_date: 기준일자 (YYYYMMDD format) - date to query
+            listing_dates: 상장일 list (YYYYMMDD format) - listing dates to filter
+
+        Returns:
+            Dictionary mapping listing date to its newly listed stocks
+        """
+        index = self._stocks_by_listing_date(base_date)
+        return {
+            listing_date: index.get(listing_date, []) for listing_date in listing_dates
+        }
+
+    def _stocks_by_listing_date(self, base_date: str) -> Dict[str, List[Dict]]:
+        """Group stock info for a base date by LIST_DD in one pass"""
+        index = self._listing_date_index.get(base_date)
+        if index is None:
+            grouped = defaultdict(list)
+            for stock in self.get_stock_info(base_date):
+                grouped[stock.get("LIST_DD")].append(stock)
+            index = dict(grouped)
+            if cache_max_age(base_date) is None:
+                self._listing_date_index[base_date] = index
+        return index
+
     def reset_request_counters(self):
         """Reset daily request counters (call at start of each day)"""
         self.request_count = {key: 0 for key in self.request_count}
+        self._response_memo.clear()
+        self._stock_info_index.clear()
+        self._daily_trade_index.clear()
+        self._listing_date_index.clear()
         logger.info("Reset API request counters")
 
     def get_request_stats(self) -> Dict[str, int]:
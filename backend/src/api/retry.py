@@ -0,0 +1,51 @@
+"""
+Request Retry
+Lightweight retry loop for the per-request API hot path
+"""
+
+import logging
+import random
+import time
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    is_transient: Callable[[BaseException], bool],
+    max_attempts: int = 3,
+    max_delay: float = 60,
+) -> T:
+    """
+    Call func, retrying transient failures with jittered exponential backoff
+
+    Waits 2s, 4s, ... (capped at 10s) times a random 1-1.5 factor, so
+    concurrent workers do not retry in lockstep. Non-transient errors and
+    the last failure are raised as is.
+
+    Args:
+        func: Zero-argument callable making one request
+        is_transient: Returns True for errors worth retrying
+        max_attempts: Maximum number of calls
+        max_delay: Stop retrying once this many seconds have elapsed
+
+    Returns:
+        Result of func
+    """
+    start = time.monotonic()
+    for attempt in range(max_attempts):
+        try:
+            return func()
+        except Exception as e:
+            if (
+                attempt == max_attempts - 1
+                or not is_transient(e)
+                or time.monotonic() - start >= max_delay
+            ):
+                raise
+            delay = min(10, 2 ** (attempt + 1)) * (1 + random.random() * 0.5)
+            logger.debug(f"Retrying in {delay:.1f}s after transient error: {e}")
+            time.sleep(delay)
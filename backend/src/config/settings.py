@@ -13,7 +13,15 @@ load_dotenv()
 
 
 class Settings:
-    """Application settings loaded from environment variables"""
+    """
+    Application settings loaded from environment variables
+
+    Values are parsed once at import time and stored on the class. The empty
+    __slots__ leaves instances without a __dict__, so the shared settings
+    object is read-only.
+    """
+
+    __slots__ = ()
 
     # KRX API Configuration
     KRX_API_BASE_URL: str = os.getenv(
@@ -37,6 +45,10 @@ class Settings:
     KIS_API_TIMEOUT: int = int(os.getenv("KIS_API_TIMEOUT", "30"))
     KIS_API_RETRY_ATTEMPTS: int = int(os.getenv("KIS_API_RETRY_ATTEMPTS", "3"))
 
+    # HTTP connection pool (shared by KRX and KIS API clients)
+    API_POOL_CONNECTIONS: int = int(os.getenv("API_POOL_CONNECTIONS", "16"))
+    API_POOL_MAXSIZE: int = int(os.getenv("API_POOL_MAXSIZE", "32"))
+
     # Application Settings
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -49,6 +61,8 @@ class Settings:
     DATA_PROCESSED_DIR: str = os.getenv("DATA_PROCESSED_DIR", "data/processed")
     MODELS_DIR: str = os.getenv("MODELS_DIR", "models")
     OUTPUT_DIR: str = os.getenv("OUTPUT_DIR", "output")
+    # Dataset files: "both" (CSV + Parquet), "csv" or "parquet"
+    OUTPUT_FORMAT: str = os.getenv("OUTPUT_FORMAT", "both").lower()
     PREDICTION_OUTPUT_FILE: str = os.getenv(
         "PREDICTION_OUTPUT_FILE", "../frontend/public/ipo_precomputed.json"
     )
@@ -3,15 +3,64 @@ Cache Manager for KRX API Responses
 Manages caching of API responses and checkpoints for resumable data collection
 """
 
-import json
+import atexit
+import functools
+import math
+import orjson
+import os
 import pickle
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 from datetime import datetime
 import logging
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
 
 logger = logging.getLogger(__name__)
 
+# Cache file formats in lookup order: JSON for API records, Arrow Feather for
+# DataFrames, pickle for anything else (and caches written by older versions).
+# ".cache.json" keeps entries apart from checkpoint/token/quota JSON files.
+CACHE_SUFFIXES = (".cache.json", ".feather", ".pkl")
+
+# Characters in cache keys that are not safe in file names
+_KEY_SANITIZE_TABLE = str.maketrans({"/": "_", ":": "_"})
+
+# Pickles up to this size are read in one call; larger ones are streamed so the
+# raw bytes and the loaded objects are not both held in memory
+PICKLE_READ_ALL_LIMIT = 64 * 1024 * 1024
+
+# Minimum seconds between checkpoint file writes (pending state is flushed at exit)
+CHECKPOINT_FLUSH_INTERVAL = 5.0
+
+
+def _is_plain_json(value: Any) -> bool:
+    """
+    Check that JSON round-trips value unchanged
+
+    Only dicts with str keys, lists, str, int, finite float, bool and None
+    qualify; tuples, datetimes, NaN etc. would come back as something else.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return all(
+            type(key) is str and _is_plain_json(item) for key, item in value.items()
+        )
+    if value_type is list:
+        return all(_is_plain_json(item) for item in value)
+    if value_type is float:
+        return math.isfinite(value)
+    return value is None or value_type in (str, int, bool)
+
+
+@functools.lru_cache(maxsize=8192)
+def _cache_file_path(cache_dir: str, cache_key: str, suffix: str) -> Path:
+    """Build (and memoize) the sanitized cache file path for a key"""
+    safe_key = cache_key.translate(_KEY_SANITIZE_TABLE)
+    return Path(f"{cache_dir}/{safe_key}{suffix}")
+
 
 class CacheManager:
     """Manages caching of API responses and collection checkpoints"""
@@ -19,67 +68,124 @@ class CacheManager:
     def __init__(self, cache_dir: str = "data/cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_dir_str = str(self.cache_dir)
         self.checkpoint_file = self.cache_dir / "checkpoint.json"
-        logger.info(f"Initialized CacheManager with cache_dir: {self.cache_dir}")
-
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get cache file path for a given key"""
-        # Sanitize key for filename
-        safe_key = cache_key.replace("/", "_").replace(":", "_")
-        return self.cache_dir / f"{safe_key}.pkl"
-
-    def get(self, cache_key: str) -> Optional[Any]:
+        # Append-only log of completed work items (one per line)
+        self.progress_log = self.cache_dir / "checkpoint.log"
+        self._pending_checkpoint: Optional[Dict] = None
+        self._last_checkpoint_ts = float("-inf")
+        self._exit_flush_registered = False
+        logger.info("Initialized CacheManager with cache_dir: %s", self.cache_dir)
+
+    def _get_cache_path(self, cache_key: str, suffix: str = ".pkl") -> Path:
+        """Get cache file path for a given key and format suffix"""
+        return _cache_file_path(self._cache_dir_str, cache_key, suffix)
+
+    def get(self, cache_key: str, max_age: Optional[float] = None) -> Optional[Any]:
         """
         Get cached data by key
 
         Args:
             cache_key: Unique key for cached data
+            max_age: Treat entries written more than this many seconds ago as
+                missing (None: entries never expire)
 
         Returns:
-            Cached data or None if not found
+            Cached data or None if not found or expired
         """
-        cache_path = self._get_cache_path(cache_key)
+        # Open each format directly instead of checking exists() first, JSON
+        # (the usual API record format) first: a JSON hit is one open, a Feather
+        # or pickle hit also pays one or two failed opens, and a miss costs one
+        # failed open per format (stats instead of opens when max_age is set)
+        for suffix in CACHE_SUFFIXES:
+            cache_path = self._get_cache_path(cache_key, suffix)
+            try:
+                if (
+                    max_age is not None
+                    and time.time() - cache_path.stat().st_mtime > max_age
+                ):
+                    logger.debug("Cache expired: %s", cache_key)
+                    return None
+                data = self._read_cache_file(cache_path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning("Failed to load cache %s: %s", cache_key, e)
+                return None
+            logger.debug("Cache hit: %s", cache_key)
+            return data
 
-        if not cache_path.exists():
-            logger.debug(f"Cache miss: {cache_key}")
-            return None
+        logger.debug("Cache miss: %s", cache_key)
+        return None
 
-        try:
-            with open(cache_path, "rb") as f:
-                data = pickle.load(f)
-            logger.debug(f"Cache hit: {cache_key}")
-            return data
-        except Exception as e:
-            logger.warning(f"Failed to load cache {cache_key}: {e}")
-            return None
+    def _read_cache_file(self, cache_path: Path) -> Any:
+        """Read a cache file in the format given by its suffix"""
+        if cache_path.suffix == ".json":
+            return orjson.loads(cache_path.read_bytes())
+        if cache_path.suffix == ".feather":
+            return feather.read_feather(cache_path, memory_map=True)
+        with open(cache_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= PICKLE_READ_ALL_LIMIT:
+                return pickle.loads(f.read())
+            return pickle.load(f)
 
     def set(self, cache_key: str, data: Any) -> None:
         """
         Save data to cache
 
+        Dicts and lists of JSON values are stored as JSON, DataFrames with a
+        default index as Feather, and everything else is pickled.
+
         Args:
             cache_key: Unique key for cached data
             data: Data to cache (must be picklable)
         """
-        cache_path = self._get_cache_path(cache_key)
-
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(data, f)
-            logger.debug(f"Cached: {cache_key}")
+            cache_path = self._write_cache_file(cache_key, data)
+
+            # Drop copies in other formats so get() cannot return stale data
+            for suffix in CACHE_SUFFIXES:
+                stale_path = self._get_cache_path(cache_key, suffix)
+                if stale_path != cache_path:
+                    stale_path.unlink(missing_ok=True)
+            logger.debug("Cached: %s", cache_key)
         except Exception as e:
-            logger.error(f"Failed to save cache {cache_key}: {e}")
-
-    def has(self, cache_key: str) -> bool:
-        """Check if cache exists for key"""
-        return self._get_cache_path(cache_key).exists()
+            logger.error("Failed to save cache %s: %s", cache_key, e)
+
+    def _write_cache_file(self, cache_key: str, data: Any) -> Path:
+        """Write data in the best format for its type and return the path"""
+        # JSON only when it reads back identical (API records are plain
+        # strings/numbers); anything else is pickled
+        if isinstance(data, (dict, list)) and _is_plain_json(data):
+            cache_path = self._get_cache_path(cache_key, ".cache.json")
+            cache_path.write_bytes(orjson.dumps(data))
+            return cache_path
+
+        if isinstance(data, pd.DataFrame) and isinstance(data.index, pd.RangeIndex):
+            cache_path = self._get_cache_path(cache_key, ".feather")
+            try:
+                data.to_feather(cache_path, compression="lz4")
+                return cache_path
+            except (pa.ArrowException, ValueError) as e:
+                # Not Arrow-compatible (e.g. mixed-type object column)
+                cache_path.unlink(missing_ok=True)
+                logger.debug("Pickling %s instead of Feather: %s", cache_key, e)
+
+        cache_path = self._get_cache_path(cache_key, ".pkl")
+        # Binary protocol 5 stores numpy/pandas buffers compactly; serialize
+        # in memory and write once rather than streaming many small writes
+        cache_path.write_bytes(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        return cache_path
 
     def delete(self, cache_key: str) -> None:
         """Delete cached data by key"""
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            cache_path.unlink()
-            logger.debug(f"Deleted cache: {cache_key}")
+        for suffix in CACHE_SUFFIXES:
+            cache_path = self._get_cache_path(cache_key, suffix)
+            try:
+                cache_path.unlink()
+            except FileNotFoundError:
+                continue
+            logger.debug("Deleted cache: %s", cache_path.name)
 
     def clear_all(self) -> int:
         """
@@ -89,17 +195,29 @@ class CacheManager:
             Number of files deleted
         """
         count = 0
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            cache_file.unlink()
+        for entry in self._scan_cache_files():
+            os.unlink(entry.path)
             count += 1
 
-        logger.info(f"Cleared {count} cache files")
+        logger.info("Cleared %s cache files", count)
         return count
 
-    def save_checkpoint(self, checkpoint_data: Dict) -> None:
+    def _scan_cache_files(self):
+        """Yield directory entries of cached data files in every format"""
+        # One directory pass; DirEntry needs no extra stat to match names
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(CACHE_SUFFIXES) and entry.is_file():
+                    yield entry
+
+    def save_checkpoint(self, checkpoint_data: Dict, force: bool = False) -> None:
         """
         Save checkpoint for resumable collection
 
+        Writes are throttled to one per CHECKPOINT_FLUSH_INTERVAL seconds; in
+        between, the latest checkpoint is kept in memory until the next write,
+        flush_checkpoint() or interpreter exit.
+
         Args:
             checkpoint_data: Dictionary with checkpoint information
                 Example: {
@@ -108,15 +226,47 @@ class CacheManager:
                     'total_dates': 100,
                     'timestamp': '2024-10-07T10:30:00'
                 }
+            force: Write the file now regardless of the interval
         """
         checkpoint_data["timestamp"] = datetime.now().isoformat()
+        self._pending_checkpoint = checkpoint_data
+
+        if (
+            force
+            or time.monotonic() - self._last_checkpoint_ts >= CHECKPOINT_FLUSH_INTERVAL
+        ):
+            self.flush_checkpoint()
+        elif not self._exit_flush_registered:
+            # Only instances holding an unwritten checkpoint are kept until exit
+            atexit.register(self.flush_checkpoint)
+            self._exit_flush_registered = True
+
+    def _unregister_exit_flush(self) -> None:
+        """Drop the exit hook once no checkpoint is pending"""
+        if self._exit_flush_registered:
+            atexit.unregister(self.flush_checkpoint)
+            self._exit_flush_registered = False
+
+    def flush_checkpoint(self) -> None:
+        """Write the pending checkpoint, if any, to disk"""
+        checkpoint_data = self._pending_checkpoint
+        if checkpoint_data is None:
+            return
 
         try:
-            with open(self.checkpoint_file, "w", encoding="utf-8") as f:
-                json.dump(checkpoint_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved checkpoint: {checkpoint_data.get('stage')}")
+            # Compact UTF-8 JSON; the checkpoint is only read back by load_checkpoint
+            self.checkpoint_file.write_bytes(
+                orjson.dumps(
+                    checkpoint_data,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                )
+            )
+            self._pending_checkpoint = None
+            self._last_checkpoint_ts = time.monotonic()
+            self._unregister_exit_flush()
+            logger.info("Saved checkpoint: %s", checkpoint_data.get("stage"))
         except Exception as e:
-            logger.error(f"Failed to save checkpoint: {e}")
+            logger.error("Failed to save checkpoint: %s", e)
 
     def load_checkpoint(self) -> Optional[Dict]:
         """
@@ -125,34 +275,87 @@ class CacheManager:
         Returns:
             Checkpoint dictionary or None if not found
         """
-        if not self.checkpoint_file.exists():
-            logger.debug("No checkpoint found")
-            return None
+        if self._pending_checkpoint is not None:
+            return self._pending_checkpoint
 
         try:
-            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
-                checkpoint = json.load(f)
-            logger.info(f"Loaded checkpoint: {checkpoint.get('stage')}")
+            checkpoint = orjson.loads(self.checkpoint_file.read_bytes())
+            logger.info("Loaded checkpoint: %s", checkpoint.get("stage"))
             return checkpoint
+        except FileNotFoundError:
+            logger.debug("No checkpoint found")
+            return None
         except Exception as e:
-            logger.warning(f"Failed to load checkpoint: {e}")
+            logger.warning("Failed to load checkpoint: %s", e)
             return None
 
+    def mark_completed(self, item: str) -> None:
+        """
+        Record a completed work item (e.g. a fetched date) in the progress log
+
+        Appends one line instead of rewriting the whole checkpoint, so the
+        cost per item stays constant however many items are done.
+        """
+        try:
+            with open(self.progress_log, "a", encoding="utf-8") as f:
+                f.write(f"{item}\n")
+        except OSError as e:
+            logger.error("Failed to record progress for %s: %s", item, e)
+
+    def load_completed(self) -> Set[str]:
+        """
+        Load work items recorded by mark_completed
+
+        Returns:
+            Set of completed items (empty if there is no progress log)
+        """
+        try:
+            with open(self.progress_log, encoding="utf-8") as f:
+                completed = {line.rstrip("\n") for line in f}
+        except FileNotFoundError:
+            return set()
+        completed.discard("")
+        logger.info("Loaded progress log: %s completed items", len(completed))
+        return completed
+
     def clear_checkpoint(self) -> None:
-        """Delete checkpoint file"""
-        if self.checkpoint_file.exists():
+        """Delete checkpoint file and progress log"""
+        self._pending_checkpoint = None
+        self._unregister_exit_flush()
+        self.progress_log.unlink(missing_ok=True)
+        try:
             self.checkpoint_file.unlink()
-            logger.info("Cleared checkpoint")
+        except FileNotFoundError:
+            return
+        logger.info("Cleared checkpoint")
+
+    def get_cache_stats(self, include_size: bool = True) -> Dict:
+        """
+        Get cache statistics
 
-    def get_cache_stats(self) -> Dict:
-        """Get cache statistics"""
-        cache_files = list(self.cache_dir.glob("*.pkl"))
-        total_size = sum(f.stat().st_size for f in cache_files)
+        Args:
+            include_size: Also sum file sizes (one stat per file); without it
+                total_size_mb is None and only the directory listing is read
+        """
+        cache_count = 0
+        total_size = 0
+        has_checkpoint = self._pending_checkpoint is not None
+        checkpoint_names = (self.checkpoint_file.name, self.progress_log.name)
+
+        # Single directory pass also answers has_checkpoint (no separate stat)
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name in checkpoint_names:
+                    has_checkpoint = True
+                elif entry.name.endswith(CACHE_SUFFIXES) and entry.is_file():
+                    cache_count += 1
+                    if include_size:
+                        total_size += entry.stat().st_size
 
         return {
-            "cache_count": len(cache_files),
-            "total_size_mb": total_size / (1024 * 1024),
-            "has_checkpoint": self.checkpoint_file.exists(),
+            "cache_count": cache_count,
+            "total_size_mb": total_size / (1024 * 1024) if include_size else None,
+            "has_checkpoint": has_checkpoint,
         }
 
     def generate_date_cache_key(self, api_name: str, date: str) -> str:
@@ -3,27 +3,384 @@ IPO Data Collection Module
 Collects IPO metadata and execution price data from KRX for 2022-2025
 """
 
+import functools
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
-import requests
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 import logging
 from tqdm import tqdm
-from src.api.krx_client import KRXApiClient
+from src.api.frames import records_to_frame
+from src.api.krx_client import KRXApiClient, short_code_from_isu_cd
 from src.config.settings import settings
 from src.data_collection.cache_manager import CacheManager
+from src.utils.dataframe_io import (
+    OUTPUT_FORMATS,
+    parquet_path,
+    save_dataset,
+    write_csv,
+)
+from src.validation import DataValidator
 
 logger = logging.getLogger(__name__)
 
+# Sample intraday grid: 5-minute bars from 09:00 to 15:55, identical every call
+_SAMPLE_HOURS = np.repeat(np.arange(9, 16, dtype=np.int32), 12)
+_SAMPLE_MINUTES = np.tile(np.arange(0, 60, 5, dtype=np.int32), 7)
+SAMPLE_INTRADAY_TIMES = [
+    f"{h:02d}:{m:02d}" for h, m in zip(_SAMPLE_HOURS, _SAMPLE_MINUTES)
+]
+# Shared read-only columns for every sample frame (time labels built once)
+_SAMPLE_TIME_COLUMN = np.array(SAMPLE_INTRADAY_TIMES, dtype=object)
+_SAMPLE_VOLUME_COLUMN = np.full(len(SAMPLE_INTRADAY_TIMES), 1000, dtype=np.int32)
+_SAMPLE_TIME_COLUMN.setflags(write=False)
+_SAMPLE_VOLUME_COLUMN.setflags(write=False)
+
+# Narrow dtypes for IPO metadata in memory: low-cardinality labels as categories,
+# prices as int32 and rates/ratios as float32.
+METADATA_DTYPES = {
+    "ipo_price_lower": "int32",
+    "ipo_price_upper": "int32",
+    "ipo_price_confirmed": "int32",
+    "institutional_demand_rate": "float32",
+    "lockup_ratio": "float32",
+    "subscription_competition_rate": "float32",
+    "allocation_ratio_equal": "float32",
+    "allocation_ratio_proportional": "float32",
+    "listing_method": "category",
+    "industry": "category",
+    "theme": "category",
+}
+
+# Share counts and capital can exceed the int32 range (KRX listed share counts),
+# so they get the narrowest integer type that fits the collected values
+METADATA_DOWNCAST_COLUMNS = (
+    "shares_offered",
+    "paid_in_capital",
+    "estimated_market_cap",
+)
+
+# (high, close) for stocks without trade data on a date
+NO_PRICES = (0.0, 0.0)
+
+
+# Sample IPO metadata used when the KRX API is unavailable (read-only)
+_SAMPLE_COMPANIES = (
+    MappingProxyType(
+        {
+            "company_name": "TechCorp A",
+            "code": "100001",
+            "listing_date": "2024-01-15",
+            "ipo_price_lower": 18000,
+            "ipo_price_upper": 22000,
+            "ipo_price_confirmed": 20000,
+            "shares_offered": 1000000,
+            "institutional_demand_rate": 500.0,
+            "lockup_ratio": 25.0,
+            "subscription_competition_rate": 800.0,
+            "paid_in_capital": 40000000000,
+            "estimated_market_cap": 200000000000,
+            "listing_method": "GENERAL",
+            "allocation_ratio_equal": 40.0,
+            "allocation_ratio_proportional": 60.0,
+            "industry": "IT",
+            "theme": "TECH",
+        }
+    ),
+    MappingProxyType(
+        {
+            "company_name": "BioPharma B",
+            "code": "100002",
+            "listing_date": "2024-02-20",
+            "ipo_price_lower": 25000,
+            "ipo_price_upper": 30000,
+            "ipo_price_confirmed": 28000,
+            "shares_offered": 500000,
+            "institutional_demand_rate": 1200.0,
+            "lockup_ratio": 30.0,
+            "subscription_competition_rate": 1500.0,
+            "paid_in_capital": 50000000000,
+            "estimated_market_cap": 280000000000,
+            "listing_method": "BOOK_BUILDING",
+            "allocation_ratio_equal": 50.0,
+            "allocation_ratio_proportional": 50.0,
+            "industry": "BIOTECH",
+            "theme": "HEALTHCARE",
+        }
+    ),
+    MappingProxyType(
+        {
+            "company_name": "GreenEnergy C",
+            "code": "100003",
+            "listing_date": "2024-03-10",
+            "ipo_price_lower": 15000,
+            "ipo_price_upper": 18000,
+            "ipo_price_confirmed": 17000,
+            "shares_offered": 800000,
+            "institutional_demand_rate": 600.0,
+            "lockup_ratio": 20.0,
+            "subscription_competition_rate": 950.0,
+            "paid_in_capital": 35000000000,
+            "estimated_market_cap": 170000000000,
+            "listing_method": "GENERAL",
+            "allocation_ratio_equal": 45.0,
+            "allocation_ratio_proportional": 55.0,
+            "industry": "ENERGY",
+            "theme": "GREEN",
+        }
+    ),
+    MappingProxyType(
+        {
+            "company_name": "FinTech D",
+            "code": "100004",
+            "listing_date": "2024-04-25",
+            "ipo_price_lower": 30000,
+            "ipo_price_upper": 35000,
+            "ipo_price_confirmed": 33000,
+            "shares_offered": 600000,
+            "institutional_demand_rate": 1500.0,
+            "lockup_ratio": 35.0,
+            "subscription_competition_rate": 2000.0,
+            "paid_in_capital": 60000000000,
+            "estimated_market_cap": 330000000000,
+            "listing_method": "BOOK_BUILDING",
+            "allocation_ratio_equal": 50.0,
+            "allocation_ratio_proportional": 50.0,
+            "industry": "FINANCE",
+            "theme": "FINTECH",
+        }
+    ),
+    MappingProxyType(
+        {
+            "company_name": "AIRobotics E",
+            "code": "100005",
+            "listing_date": "2024-05-30",
+            "ipo_price_lower": 22000,
+            "ipo_price_upper": 26000,
+            "ipo_price_confirmed": 24000,
+            "shares_offered": 700000,
+            "institutional_demand_rate": 900.0,
+            "lockup_ratio": 28.0,
+            "subscription_competition_rate": 1300.0,
+            "paid_in_capital": 45000000000,
+            "estimated_market_cap": 240000000000,
+            "listing_method": "GENERAL",
+            "allocation_ratio_equal": 42.0,
+            "allocation_ratio_proportional": 58.0,
+            "industry": "IT",
+            "theme": "AI",
+        }
+    ),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_sample_metadata() -> pd.DataFrame:
+    """Build and validate the sample IPO metadata once"""
+    # Column-oriented construction (no per-row key hashing)
+    df = pd.DataFrame(
+        {
+            column: [company[column] for company in _SAMPLE_COMPANIES]
+            for column in _SAMPLE_COMPANIES[0]
+        }
+    )
+
+    is_valid, errors = DataValidator.validate_ipo_metadata(df)
+    if not is_valid:
+        logger.warning("Data validation warnings: %s", errors)
+
+    return _apply_metadata_dtypes(df)
+
+
+def _krx_stock_frame(stocks: List[Dict]) -> pd.DataFrame:
+    """Load KRX stock info records into a DataFrame with numeric fields parsed"""
+    # LIST_SHRS (상장주식수) / PARVAL (액면가) arrive as strings with commas
+    return records_to_frame(stocks, {"LIST_SHRS": "int64", "PARVAL": "int64"})
+
+
+def _krx_stocks_to_metadata(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Map KRX stock info (from _krx_stock_frame) to the IPO metadata schema
+
+    Note: KRX API only provides basic stock info. IPO-specific fields
+    (price band, subscription rates, lock-up ratios, etc.) are filled with
+    placeholders or defaults and need to come from other sources.
+    """
+
+    def column(name: str, default) -> pd.Series:
+        if name in raw.columns:
+            return raw[name].fillna(default)
+        return pd.Series(default, index=raw.index)
+
+    list_dd = column("LIST_DD", "").astype(str)
+    parsed_dates = pd.to_datetime(list_dd, format="%Y%m%d", errors="coerce")
+    listing_date = parsed_dates.dt.strftime("%Y-%m-%d").where(
+        parsed_dates.notna(), list_dd
+    )
+    list_shrs = column("LIST_SHRS", 0)
+    parval = column("PARVAL", 0)
+
+    return pd.DataFrame(
+        {
+            "company_name": column("ISU_NM", ""),
+            "code": column("ISU_SRT_CD", ""),
+            "listing_date": listing_date,
+            # Use par value as placeholder for the price band
+            "ipo_price_lower": parval,
+            "ipo_price_upper": parval,
+            "ipo_price_confirmed": parval,
+            "shares_offered": list_shrs,
+            "institutional_demand_rate": 0.0,  # Not available
+            "lockup_ratio": 0.0,  # Not available
+            "subscription_competition_rate": 0.0,  # Not available
+            "paid_in_capital": parval * list_shrs,  # Estimate
+            "estimated_market_cap": parval * list_shrs,  # Estimate
+            "listing_method": column("MKT_TP_NM", "GENERAL"),
+            "allocation_ratio_equal": 50.0,  # Default
+            "allocation_ratio_proportional": 50.0,  # Default
+            "industry": column("SECT_TP_NM", ""),  # KOSDAQ sector classification
+            "theme": column("SECUGRP_NM", ""),  # Security group (주권)
+        },
+        index=raw.index,
+    )
+
+
+def _drop_spacs(df: pd.DataFrame) -> pd.DataFrame:
+    """Filter out SPAC companies (기업인수목적 in the name or a SPAC sector)"""
+    # Literal substring matches (regex=False skips the regex engine); the
+    # schema always has both columns, so no fallback Series is needed
+    is_spac = df["company_name"].str.contains("기업인수목적", na=False, regex=False)
+    is_spac |= df["industry"].str.contains("SPAC", na=False, regex=False)
+    spac_count = int(is_spac.sum())
+    if spac_count > 0:
+        logger.info("Filtered out %s SPAC companies", spac_count)
+    return df.loc[~is_spac]
+
+
+def _apply_metadata_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast IPO metadata columns to the compact METADATA_DTYPES"""
+    dtypes = {col: t for col, t in METADATA_DTYPES.items() if col in df.columns}
+    downcast = {
+        col: pd.to_numeric(df[col], downcast="integer")
+        for col in METADATA_DOWNCAST_COLUMNS
+        if col in df.columns
+    }
+    return df.astype(dtypes).assign(**downcast)
+
+
+def _widen_metadata_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Undo _apply_metadata_dtypes before saving
+
+    The compact dtypes are for in-memory use only: written as-is, the Parquet
+    copy would load with other dtypes than the CSV, and int32 products such as
+    shares * price would overflow.
+    """
+    widened = {}
+    for col in (*METADATA_DTYPES, *METADATA_DOWNCAST_COLUMNS):
+        if col not in df.columns:
+            continue
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            widened[col] = dtype.categories.dtype
+        elif dtype.kind in "iu":
+            widened[col] = "int64"
+        elif dtype.kind == "f":
+            widened[col] = "float64"
+    return df.astype(widened)
+
+
+def _listing_days(metadata_df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Parse the listing_date column once into Day 0 / Day 1 timestamps"""
+    # Dates are ISO (YYYY-MM-DD); naming the format skips per-call inference
+    day0 = pd.to_datetime(metadata_df["listing_date"], format="ISO8601")
+    return day0, day0 + timedelta(days=1)
+
+
+def _prices_by_code(trades: List[Dict]) -> Dict[str, Tuple[float, float]]:
+    """
+    Map one date's daily trade records to (high, close) prices by short code
+
+    Price strings are parsed for the whole date in one vectorized pass;
+    blank or malformed prices become 0.0.
+    """
+    if not trades:
+        return {}
+
+    df = records_to_frame(
+        trades, {"TDD_HGPRC": "float64", "TDD_CLSPRC": "float64"}
+    ).reindex(columns=["ISU_CD", "TDD_HGPRC", "TDD_CLSPRC"])
+    df = df.fillna({"ISU_CD": "", "TDD_HGPRC": 0.0, "TDD_CLSPRC": 0.0})
+    short_codes = [short_code_from_isu_cd(isu_cd) for isu_cd in df["ISU_CD"]]
+    prices = zip(df["TDD_HGPRC"].tolist(), df["TDD_CLSPRC"].tolist())
+
+    # Reversed so the first record wins if a short code repeats
+    return dict(reversed(list(zip(short_codes, prices))))
+
+
+@functools.lru_cache(maxsize=4096)
+def _sample_intraday_price_array(code: str, date_str: str) -> np.ndarray:
+    """
+    Simulate intraday execution prices for a stock and date (read-only array)
+    """
+    # TODO: Implement actual KRX market data API integration
+    # This should fetch tick-by-tick or minute-by-minute execution data
+
+    # Example: Simulate intraday data
+    base_price = 22000
+    prices = (base_price + (_SAMPLE_HOURS - 9) * 100 + _SAMPLE_MINUTES).astype(np.int32)
+    prices.setflags(write=False)
+    return prices
+
+
+@functools.lru_cache(maxsize=4096)
+def _sample_price_summary(code: str, date_str: str) -> Tuple[float, float]:
+    """Highest and closing simulated intraday prices for a stock and date"""
+    prices = _sample_intraday_price_array(code, date_str)
+    return float(prices.max()), float(prices[-1])
+
+
+@functools.lru_cache(maxsize=4096)
+def _sample_intraday_prices(code: str, date_str: str) -> pd.DataFrame:
+    """
+    Build simulated intraday prices for a stock and date (no I/O)
+
+    Cached per (code, date); callers must not modify the returned frame.
+    """
+    return pd.DataFrame(
+        {
+            "time": _SAMPLE_TIME_COLUMN,
+            "price": _sample_intraday_price_array(code, date_str),
+            "volume": _SAMPLE_VOLUME_COLUMN,
+        }
+    )
+
 
 class IPODataCollector:
     """Collects IPO metadata and intraday price data"""
 
-    def __init__(self, data_dir: str = "data/raw", use_sample_data: bool = False):
+    def __init__(
+        self,
+        data_dir: str = "data/raw",
+        use_sample_data: bool = False,
+        debug_csv: bool = False,
+        refresh_cache: bool = False,
+    ):
+        # Reject a bad OUTPUT_FORMAT now rather than after a whole collection run
+        if settings.OUTPUT_FORMAT not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown OUTPUT_FORMAT: {settings.OUTPUT_FORMAT} "
+                f"(expected one of {', '.join(OUTPUT_FORMATS)})"
+            )
+
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.use_sample_data = use_sample_data
+        # Also write intraday data as CSV for manual inspection
+        self.debug_csv = debug_csv
         self.cache_manager = CacheManager()
 
         # Initialize KRX API client if not using sample data
@@ -38,16 +395,41 @@ class IPODataCollector:
                     api_key=settings.KRX_API_KEY,
                     timeout=settings.KRX_API_TIMEOUT,
                     use_cache=True,
+                    # Re-fetch (and re-cache) responses from earlier runs
+                    refresh_cache=refresh_cache,
                 )
                 logger.info("Initialized KRXApiClient with cache enabled")
 
         logger.info(
-            f"Initialized IPODataCollector with data_dir: {self.data_dir}, "
-            f"use_sample_data: {self.use_sample_data}"
+            "Initialized IPODataCollector with data_dir: %s, use_sample_data: %s",
+            self.data_dir,
+            self.use_sample_data,
         )
 
+    def close(self):
+        """Close the KRX client's pooled HTTP connections"""
+        if hasattr(self, "krx_client"):
+            self.krx_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def full_dataset_file(self, start_year: int, end_year: int) -> Path:
+        """Path collect_full_dataset saves to (Parquet when OUTPUT_FORMAT=parquet)"""
+        output_file = self.data_dir / f"ipo_full_dataset_{start_year}_{end_year}.csv"
+        if settings.OUTPUT_FORMAT == "parquet":
+            return parquet_path(output_file)
+        return output_file
+
     def collect_ipo_metadata(
-        self, start_year: int = 2022, end_year: int = 2025, optimized: bool = True
+        self,
+        start_year: int = 2022,
+        end_year: int = 2025,
+        optimized: bool = True,
+        save: bool = True,
     ) -> pd.DataFrame:
         """
         Collect IPO metadata for companies listed between start_year and end_year
@@ -67,135 +449,33 @@ class IPODataCollector:
             start_year: Start year for data collection
             end_year: End year for data collection
             optimized: Use optimized collection (1 API call vs 48) - default True
+            save: Write ipo_metadata_{start_year}_{end_year} files (False when
+                the caller only needs the DataFrame)
         """
         if self.use_sample_data:
-            return self._collect_sample_metadata(start_year, end_year)
-
-        # Use optimized or legacy method
-        if optimized:
-            return self._collect_krx_metadata_optimized(start_year, end_year)
+            df = self._collect_sample_metadata(start_year, end_year)
+        elif optimized:
+            # Single stock info call instead of one per month
+            df = self._collect_krx_metadata_optimized(start_year, end_year)
         else:
-            return self._collect_krx_metadata(start_year, end_year)
+            df = self._collect_krx_metadata(start_year, end_year)
+
+        if save:
+            # Save as CSV plus Parquet copy for pipeline reloads (per OUTPUT_FORMAT)
+            output_file = self.data_dir / f"ipo_metadata_{start_year}_{end_year}.csv"
+            output_file = save_dataset(
+                _widen_metadata_dtypes(df),
+                output_file,
+                bom=True,
+                output_format=settings.OUTPUT_FORMAT,
+            )
+            logger.info("Saved IPO metadata to %s (%s records)", output_file, len(df))
+
+        return df
 
     def _collect_sample_metadata(self, start_year: int, end_year: int) -> pd.DataFrame:
         """Generate sample data for testing"""
-        metadata = []
-
-        sample_companies = [
-            {
-                "company_name": "TechCorp A",
-                "code": "100001",
-                "listing_date": "2024-01-15",
-                "ipo_price_lower": 18000,
-                "ipo_price_upper": 22000,
-                "ipo_price_confirmed": 20000,
-                "shares_offered": 1000000,
-                "institutional_demand_rate": 500.0,
-                "lockup_ratio": 25.0,
-                "subscription_competition_rate": 800.0,
-                "paid_in_capital": 40000000000,
-                "estimated_market_cap": 200000000000,
-                "listing_method": "GENERAL",
-                "allocation_ratio_equal": 40.0,
-                "allocation_ratio_proportional": 60.0,
-                "industry": "IT",
-                "theme": "TECH",
-            },
-            {
-                "company_name": "BioPharma B",
-                "code": "100002",
-                "listing_date": "2024-02-20",
-                "ipo_price_lower": 25000,
-                "ipo_price_upper": 30000,
-                "ipo_price_confirmed": 28000,
-                "shares_offered": 500000,
-                "institutional_demand_rate": 1200.0,
-                "lockup_ratio": 30.0,
-                "subscription_competition_rate": 1500.0,
-                "paid_in_capital": 50000000000,
-                "estimated_market_cap": 280000000000,
-                "listing_method": "BOOK_BUILDING",
-                "allocation_ratio_equal": 50.0,
-                "allocation_ratio_proportional": 50.0,
-                "industry": "BIOTECH",
-                "theme": "HEALTHCARE",
-            },
-            {
-                "company_name": "GreenEnergy C",
-                "code": "100003",
-                "listing_date": "2024-03-10",
-                "ipo_price_lower": 15000,
-                "ipo_price_upper": 18000,
-                "ipo_price_confirmed": 17000,
-                "shares_offered": 800000,
-                "institutional_demand_rate": 600.0,
-                "lockup_ratio": 20.0,
-                "subscription_competition_rate": 950.0,
-                "paid_in_capital": 35000000000,
-                "estimated_market_cap": 170000000000,
-                "listing_method": "GENERAL",
-                "allocation_ratio_equal": 45.0,
-                "allocation_ratio_proportional": 55.0,
-                "industry": "ENERGY",
-                "theme": "GREEN",
-            },
-            {
-                "company_name": "FinTech D",
-                "code": "100004",
-                "listing_date": "2024-04-25",
-                "ipo_price_lower": 30000,
-                "ipo_price_upper": 35000,
-                "ipo_price_confirmed": 33000,
-                "shares_offered": 600000,
-                "institutional_demand_rate": 1500.0,
-                "lockup_ratio": 35.0,
-                "subscription_competition_rate": 2000.0,
-                "paid_in_capital": 60000000000,
-                "estimated_market_cap": 330000000000,
-                "listing_method": "BOOK_BUILDING",
-                "allocation_ratio_equal": 50.0,
-                "allocation_ratio_proportional": 50.0,
-                "industry": "FINANCE",
-                "theme": "FINTECH",
-            },
-            {
-                "company_name": "AIRobotics E",
-                "code": "100005",
-                "listing_date": "2024-05-30",
-                "ipo_price_lower": 22000,
-                "ipo_price_upper": 26000,
-                "ipo_price_confirmed": 24000,
-                "shares_offered": 700000,
-                "institutional_demand_rate": 900.0,
-                "lockup_ratio": 28.0,
-                "subscription_competition_rate": 1300.0,
-                "paid_in_capital": 45000000000,
-                "estimated_market_cap": 240000000000,
-                "listing_method": "GENERAL",
-                "allocation_ratio_equal": 42.0,
-                "allocation_ratio_proportional": 58.0,
-                "industry": "IT",
-                "theme": "AI",
-            },
-        ]
-
-        metadata.extend(sample_companies)
-
-        df = pd.DataFrame(metadata)
-
-        # Validate data
-        from src.validation import DataValidator
-
-        is_valid, errors = DataValidator.validate_ipo_metadata(df)
-        if not is_valid:
-            logger.warning(f"Data validation warnings: {errors}")
-
-        # Save to CSV
-        output_file = self.data_dir / f"ipo_metadata_{start_year}_{end_year}.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Saved sample IPO metadata to {output_file} ({len(df)} records)")
-
-        return df
+        return _build_sample_metadata().copy()
 
     def _collect_krx_metadata(self, start_year: int, end_year: int) -> pd.DataFrame:
         """
@@ -205,9 +485,12 @@ class IPODataCollector:
         Additional IPO-specific data (subscription rates, lock-up ratios, etc.)
         needs to be collected from other sources or manually.
         """
-        logger.info(f"Collecting IPO metadata from KRX API for {start_year}-{end_year}")
+        logger.info(
+            "Collecting IPO metadata from KRX API for %s-%s", start_year, end_year
+        )
 
         all_stocks = []
+        seen_codes = set()
 
         # Collect stock info for each year
         for year in range(start_year, end_year + 1):
@@ -224,103 +507,43 @@ class IPODataCollector:
 
                 try:
                     stocks = self.krx_client.get_stock_info(base_date)
-                    logger.info(f"Retrieved {len(stocks)} stocks for {base_date}")
+                    logger.info("Retrieved %s stocks for %s", len(stocks), base_date)
 
                     # Filter stocks listed in this year
+                    year_prefix = str(year)
                     for stock in stocks:
                         list_date = stock.get("LIST_DD", "")
-                        if list_date.startswith(str(year)):
-                            # Check if already added
-                            if not any(
-                                s.get("ISU_SRT_CD") == stock.get("ISU_SRT_CD")
-                                for s in all_stocks
-                            ):
+                        if list_date.startswith(year_prefix):
+                            # Check if already added (set lookup, not a list scan)
+                            code = stock.get("ISU_SRT_CD")
+                            if code not in seen_codes:
+                                seen_codes.add(code)
                                 all_stocks.append(stock)
 
                 except Exception as e:
-                    logger.error(f"Error collecting data for {base_date}: {e}")
+                    logger.error("Error collecting data for %s: %s", base_date, e)
                     continue
 
-        logger.info(f"Found {len(all_stocks)} IPO stocks from {start_year}-{end_year}")
+        logger.info(
+            "Found %s IPO stocks from %s-%s", len(all_stocks), start_year, end_year
+        )
 
         # Convert to DataFrame with our schema
-        metadata = []
-        for stock in all_stocks:
-            # Parse listing date
-            list_dd = stock.get("LIST_DD", "")
-            try:
-                listing_date = datetime.strptime(list_dd, "%Y%m%d").strftime("%Y-%m-%d")
-            except:
-                listing_date = list_dd
-
-            # Convert LIST_SHRS (상장주식수) - remove commas if present
-            list_shrs_str = str(stock.get("LIST_SHRS", "0")).replace(",", "")
-            try:
-                list_shrs = int(float(list_shrs_str))
-            except:
-                list_shrs = 0
-
-            # Convert PARVAL (액면가) - remove commas if present
-            parval_str = str(stock.get("PARVAL", "0")).replace(",", "")
-            try:
-                parval = int(float(parval_str))
-            except:
-                parval = 0
-
-            record = {
-                "company_name": stock.get("ISU_NM", ""),
-                "code": stock.get("ISU_SRT_CD", ""),
-                "listing_date": listing_date,
-                # Note: These fields are not available from KRX API
-                # They need to be filled from other sources or set to defaults
-                "ipo_price_lower": parval,  # Use par value as placeholder
-                "ipo_price_upper": parval,
-                "ipo_price_confirmed": parval,
-                "shares_offered": list_shrs,
-                "institutional_demand_rate": 0.0,  # Not available
-                "lockup_ratio": 0.0,  # Not available
-                "subscription_competition_rate": 0.0,  # Not available
-                "paid_in_capital": parval * list_shrs,  # Estimate
-                "estimated_market_cap": parval * list_shrs,  # Estimate
-                "listing_method": stock.get("MKT_TP_NM", "GENERAL"),
-                "allocation_ratio_equal": 50.0,  # Default
-                "allocation_ratio_proportional": 50.0,  # Default
-                "industry": stock.get("SECT_TP_NM", ""),  # KOSDAQ sector classification
-                "theme": stock.get("SECUGRP_NM", ""),  # Security group (주권)
-            }
-            metadata.append(record)
-
-        df = pd.DataFrame(metadata)
+        df = _krx_stocks_to_metadata(_krx_stock_frame(all_stocks))
 
         if len(df) == 0:
             logger.warning("No IPO data found. Using sample data instead.")
             return self._collect_sample_metadata(start_year, end_year)
 
         # Filter out SPAC companies
-        initial_count = len(df)
-        df = df[
-            (~df["company_name"].str.contains("기업인수목적", na=False))
-            & (
-                ~df.get("industry", pd.Series([""] * len(df))).str.contains(
-                    "SPAC", na=False
-                )
-            )
-        ]
-        spac_count = initial_count - len(df)
-        if spac_count > 0:
-            logger.info(f"Filtered out {spac_count} SPAC companies")
+        df = _drop_spacs(df)
 
         # Validate data
-        from src.validation import DataValidator
-
         is_valid, errors = DataValidator.validate_ipo_metadata(df)
         if not is_valid:
-            logger.warning(f"Data validation warnings: {errors}")
+            logger.warning("Data validation warnings: %s", errors)
 
-        # Save to CSV
-        output_file = self.data_dir / f"ipo_metadata_{start_year}_{end_year}.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        logger.info(f"Saved KRX IPO metadata to {output_file} ({len(df)} records)")
+        df = _apply_metadata_dtypes(df)
 
         return df
 
@@ -340,150 +563,81 @@ class IPODataCollector:
         Returns:
             DataFrame with IPO metadata
         """
-        logger.info(f"Collecting IPO metadata (optimized) for {start_year}-{end_year}")
+        logger.info(
+            "Collecting IPO metadata (optimized) for %s-%s", start_year, end_year
+        )
 
         # Fetch all stocks from latest date
         latest_date = f"{end_year}1231"
-        logger.info(f"Fetching all stocks from latest date: {latest_date}")
+        logger.info("Fetching all stocks from latest date: %s", latest_date)
 
         try:
             all_stocks = self.krx_client.get_stock_info(latest_date)
-            logger.info(f"Retrieved {len(all_stocks)} total stocks")
+            logger.info("Retrieved %s total stocks", len(all_stocks))
         except Exception as e:
-            logger.error(f"Failed to fetch stock info: {e}")
+            logger.error("Failed to fetch stock info: %s", e)
             logger.warning("Falling back to sample data")
             return self._collect_sample_metadata(start_year, end_year)
 
-        # Filter IPO stocks by listing date (local filtering)
-        ipo_stocks = []
-        for stock in all_stocks:
-            list_date_str = stock.get("LIST_DD", "")
-            if not list_date_str:
-                continue
-
-            try:
-                list_year = int(list_date_str[:4])
-                if start_year <= list_year <= end_year:
-                    ipo_stocks.append(stock)
-            except (ValueError, IndexError):
-                continue
+        # Filter IPO stocks by listing year (local filtering, one vectorized
+        # pass); blank or malformed LIST_DD values parse to NaN and drop out
+        all_df = _krx_stock_frame(all_stocks)
+        list_dd = all_df.get("LIST_DD", pd.Series("", index=all_df.index))
+        list_years = pd.to_numeric(list_dd.astype(str).str[:4], errors="coerce")
+        ipo_df = all_df.loc[list_years.between(start_year, end_year)].reset_index(
+            drop=True
+        )
 
         logger.info(
-            f"Found {len(ipo_stocks)} IPO stocks from {start_year}-{end_year} "
-            f"(filtered locally from {len(all_stocks)} total stocks)"
+            "Found %s IPO stocks from %s-%s (filtered locally from %s total stocks)",
+            len(ipo_df),
+            start_year,
+            end_year,
+            len(all_stocks),
         )
 
-        if len(ipo_stocks) == 0:
+        if ipo_df.empty:
             logger.warning("No IPO stocks found. Using sample data.")
             return self._collect_sample_metadata(start_year, end_year)
 
-        # Convert to DataFrame with our schema
-        metadata = []
-        for stock in ipo_stocks:
-            # Parse listing date
-            list_dd = stock.get("LIST_DD", "")
-            try:
-                listing_date = datetime.strptime(list_dd, "%Y%m%d").strftime("%Y-%m-%d")
-            except:
-                listing_date = list_dd
-
-            # Convert LIST_SHRS (상장주식수)
-            list_shrs_str = str(stock.get("LIST_SHRS", "0")).replace(",", "")
-            try:
-                list_shrs = int(float(list_shrs_str))
-            except:
-                list_shrs = 0
-
-            # Convert PARVAL (액면가)
-            parval_str = str(stock.get("PARVAL", "0")).replace(",", "")
-            try:
-                parval = int(float(parval_str))
-            except:
-                parval = 0
-
-            record = {
-                "company_name": stock.get("ISU_NM", ""),
-                "code": stock.get("ISU_SRT_CD", ""),
-                "listing_date": listing_date,
-                "ipo_price_lower": parval,
-                "ipo_price_upper": parval,
-                "ipo_price_confirmed": parval,
-                "shares_offered": list_shrs,
-                "institutional_demand_rate": 0.0,
-                "lockup_ratio": 0.0,
-                "subscription_competition_rate": 0.0,
-                "paid_in_capital": parval * list_shrs,
-                "estimated_market_cap": parval * list_shrs,
-                "listing_method": stock.get("MKT_TP_NM", "GENERAL"),
-                "allocation_ratio_equal": 50.0,
-                "allocation_ratio_proportional": 50.0,
-                "industry": stock.get("SECT_TP_NM", ""),  # KOSDAQ sector classification
-                "theme": stock.get("SECUGRP_NM", ""),  # Security group (주권)
-            }
-            metadata.append(record)
-
-        df = pd.DataFrame(metadata)
+        # Map to our schema
+        df = _krx_stocks_to_metadata(ipo_df)
 
         # Filter out SPAC companies
-        initial_count = len(df)
-        df = df[
-            (~df["company_name"].str.contains("기업인수목적", na=False))
-            & (
-                ~df.get("industry", pd.Series([""] * len(df))).str.contains(
-                    "SPAC", na=False
-                )
-            )
-        ]
-        spac_count = initial_count - len(df)
-        if spac_count > 0:
-            logger.info(f"Filtered out {spac_count} SPAC companies")
+        df = _drop_spacs(df)
 
         # Validate data
-        from src.validation import DataValidator
-
         is_valid, errors = DataValidator.validate_ipo_metadata(df)
         if not is_valid:
-            logger.warning(f"Data validation warnings: {errors}")
+            logger.warning("Data validation warnings: %s", errors)
 
-        # Save to CSV
-        output_file = self.data_dir / f"ipo_metadata_{start_year}_{end_year}.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        logger.info(
-            f"Saved KRX IPO metadata (optimized) to {output_file} ({len(df)} records)"
-        )
+        df = _apply_metadata_dtypes(df)
 
         return df
 
-    def collect_intraday_prices(self, code: str, date: datetime) -> pd.DataFrame:
+    def collect_intraday_prices(
+        self, code: str, date: datetime, persist: bool = True
+    ) -> pd.DataFrame:
         """
         Collect intraday execution price data for a specific stock on a specific date
 
+        Args:
+            code: Stock code
+            date: Trading date
+            persist: Save the data under data_dir (False: in-memory only)
+
         Returns DataFrame with columns: time, price, volume
         """
-        # TODO: Implement actual KRX market data API integration
-        # This should fetch tick-by-tick or minute-by-minute execution data
-
-        # Placeholder structure
-        intraday_data = []
-
-        # Example: Simulate intraday data
-        base_price = 22000
-        for hour in range(9, 16):
-            for minute in range(0, 60, 5):
-                intraday_data.append(
-                    {
-                        "time": f"{hour:02d}:{minute:02d}",
-                        "price": base_price + (hour - 9) * 100 + minute,
-                        "volume": 1000,
-                    }
-                )
-
-        df = pd.DataFrame(intraday_data)
-
-        # Save to CSV
         date_str = date.strftime("%Y%m%d")
-        output_file = self.data_dir / f"intraday_{code}_{date_str}.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        df = _sample_intraday_prices(code, date_str).copy()
+        if not persist:
+            return df
+
+        # Save as Parquet (CSV copy only when debugging)
+        output_file = self.data_dir / f"intraday_{code}_{date_str}.parquet"
+        df.to_parquet(output_file, engine="pyarrow", compression="zstd", index=False)
+        if self.debug_csv:
+            write_csv(df, output_file.with_suffix(".csv"), bom=True)
 
         return df
 
@@ -497,11 +651,9 @@ class IPODataCollector:
         Intraday tick data will be available via 한국투자 API later.
         """
         if self.use_sample_data:
-            # Use sample intraday data
-            df = self.collect_intraday_prices(code, date)
-            highest_price = df["price"].max()
-            closing_price = df.iloc[-1]["price"]
-            return {"highest": highest_price, "closing": closing_price}
+            # Memoized sample aggregates (no DataFrame, no file write)
+            highest, closing = _sample_price_summary(code, date.strftime("%Y%m%d"))
+            return {"highest": highest, "closing": closing}
 
         # Use KRX daily trade data
         date_str = date.strftime("%Y%m%d")
@@ -518,21 +670,23 @@ class IPODataCollector:
                     highest_price = float(high_str)
                     closing_price = float(close_str)
                 except:
-                    logger.warning(f"Failed to parse prices for {code} on {date_str}")
+                    logger.warning(
+                        "Failed to parse prices for %s on %s", code, date_str
+                    )
                     highest_price = 0.0
                     closing_price = 0.0
 
                 return {"highest": highest_price, "closing": closing_price}
             else:
-                logger.warning(f"No trade data found for {code} on {date_str}")
+                logger.warning("No trade data found for %s on %s", code, date_str)
                 return {"highest": 0.0, "closing": 0.0}
 
         except Exception as e:
-            logger.error(f"Error getting prices for {code} on {date_str}: {e}")
+            logger.error("Error getting prices for %s on %s: %s", code, date_str, e)
             return {"highest": 0.0, "closing": 0.0}
 
     def _collect_prices_batch_optimized(
-        self, metadata_df: pd.DataFrame
+        self, metadata_df: pd.DataFrame, max_workers: int = 8
     ) -> pd.DataFrame:
         """
         Optimized price data collection - Batch by date
@@ -540,28 +694,29 @@ class IPODataCollector:
         Instead of calling API for each stock separately, group by date
         and fetch all stocks for that date at once.
 
-        Reduces API calls from 2N (N stocks × 2 days) to unique dates.
+        Reduces API calls from 2N (N stocks × 2 days) to unique dates, and
+        fetches those dates concurrently on a thread pool.
 
         Args:
             metadata_df: DataFrame with IPO metadata including 'code' and 'listing_date'
+            max_workers: Maximum concurrent date requests
 
         Returns:
             DataFrame with added price columns (day0_high, day0_close, day1_high, day1_close)
         """
         logger.info("Collecting price data (batch optimized)")
 
-        # Collect all unique dates needed
-        dates_needed: Set[str] = set()
-        for _, row in metadata_df.iterrows():
-            listing_date = pd.to_datetime(row["listing_date"])
-            next_day = listing_date + timedelta(days=1)
-
-            dates_needed.add(listing_date.strftime("%Y%m%d"))
-            dates_needed.add(next_day.strftime("%Y%m%d"))
+        # Collect all unique dates needed (Day 0 and Day 1 strings in one pass)
+        codes = metadata_df["code"].tolist()
+        listing_dates, next_days = _listing_days(metadata_df)
+        day0_dates = listing_dates.dt.strftime("%Y%m%d").tolist()
+        day1_dates = next_days.dt.strftime("%Y%m%d").tolist()
+        dates_needed: Set[str] = set(day0_dates) | set(day1_dates)
 
         logger.info(
-            f"Need price data for {len(dates_needed)} unique dates "
-            f"(for {len(metadata_df)} IPOs)"
+            "Need price data for %s unique dates (for %s IPOs)",
+            len(dates_needed),
+            len(metadata_df),
         )
 
         # Check rate limit before proceeding
@@ -569,101 +724,169 @@ class IPODataCollector:
             current_count = self.krx_client.request_count.get("daily_trade", 0)
             if current_count + len(dates_needed) > 9000:
                 logger.warning(
-                    f"Rate limit warning: {current_count} + {len(dates_needed)} "
-                    f"= {current_count + len(dates_needed)} requests"
+                    "Rate limit warning: %s + %s = %s requests",
+                    current_count,
+                    len(dates_needed),
+                    current_count + len(dates_needed),
                 )
 
-        # Fetch all trade data for each date (with progress bar)
+        # Check progress log (and checkpoints written by older versions).
+        # Completed dates are rebuilt from the cached responses instead of
+        # being fetched again; any whose cache is gone are fetched as usual.
+        completed = self.cache_manager.load_completed()
+        checkpoint = self.cache_manager.load_checkpoint()
+        if checkpoint:
+            completed.update(checkpoint.get("completed_dates", []))
+
         date_trade_data = {}
+        for date_str in sorted(dates_needed & completed):
+            prices = self._cached_prices_by_code(date_str)
+            if prices is not None:
+                date_trade_data[date_str] = prices
+        if date_trade_data:
+            logger.info(
+                "Resuming: %s dates already completed (cached)", len(date_trade_data)
+            )
 
-        for date_str in tqdm(
-            sorted(dates_needed), desc="Fetching price data", unit="date"
-        ):
-            try:
-                # Check checkpoint
-                checkpoint = self.cache_manager.load_checkpoint()
-                if checkpoint and date_str in checkpoint.get("completed_dates", []):
-                    logger.debug(f"Skipping {date_str} (already completed)")
+        # Fetch trade data for the remaining dates concurrently (with progress bar)
+        pending_dates = sorted(dates_needed - date_trade_data.keys())
+        failed_dates = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self._fetch_prices_by_code, pending_dates)
+            for date_str, prices in tqdm(
+                zip(pending_dates, results),
+                desc="Fetching price data",
+                unit="date",
+                total=len(pending_dates),
+            ):
+                if prices is None:
+                    # Not logged as completed, so the next run retries it
+                    failed_dates.append(date_str)
                     continue
 
-                trades = self.krx_client.get_daily_trade_data(date_str)
-                date_trade_data[date_str] = {
-                    trade.get("ISU_CD", ""): trade for trade in trades
-                }
-
-                # Save checkpoint periodically (every 10 dates)
-                if len(date_trade_data) % 10 == 0:
-                    completed_dates = list(date_trade_data.keys())
-                    self.cache_manager.save_checkpoint(
-                        {
-                            "stage": "price_collection",
-                            "completed_dates": completed_dates,
-                            "total_dates": len(dates_needed),
-                        }
-                    )
-
-            except Exception as e:
-                logger.error(f"Failed to fetch trade data for {date_str}: {e}")
-                date_trade_data[date_str] = {}
-
-        # Clear checkpoint after successful completion
-        self.cache_manager.clear_checkpoint()
-
-        # Enrich metadata with price data
-        enriched_data = []
+                date_trade_data[date_str] = prices
+                if date_str not in completed:
+                    # Append the date to the progress log (one line, no rewrite)
+                    self.cache_manager.mark_completed(date_str)
+                # Throttled progress summary; the dates live in the progress log
+                self.cache_manager.save_checkpoint(
+                    {
+                        "stage": "price_collection",
+                        "completed_count": len(date_trade_data),
+                        "total_dates": len(dates_needed),
+                    }
+                )
 
-        for _, row in tqdm(
-            metadata_df.iterrows(), desc="Processing IPOs", total=len(metadata_df)
+        if failed_dates:
+            logger.warning(
+                "Failed to fetch %s dates; keeping progress log for retry",
+                len(failed_dates),
+            )
+            self.cache_manager.save_checkpoint(
+                {
+                    "stage": "price_collection",
+                    "completed_count": len(date_trade_data),
+                    "total_dates": len(dates_needed),
+                },
+                force=True,
+            )
+        else:
+            # Clear checkpoint and progress log after successful completion
+            self.cache_manager.clear_checkpoint()
+
+        # Enrich metadata with price data: fill preallocated columns in place
+        n = len(metadata_df)
+        day0_high = np.zeros(n, dtype=np.float64)
+        day0_close = np.zeros(n, dtype=np.float64)
+        day1_high = np.zeros(n, dtype=np.float64)
+        day1_close = np.zeros(n, dtype=np.float64)
+
+        for i, (code, day0_str, day1_str) in enumerate(
+            tqdm(zip(codes, day0_dates, day1_dates), desc="Processing IPOs", total=n)
         ):
-            code = row["code"]
-            listing_date = pd.to_datetime(row["listing_date"])
-            next_day = listing_date + timedelta(days=1)
-
-            day0_str = listing_date.strftime("%Y%m%d")
-            day1_str = next_day.strftime("%Y%m%d")
-
-            # Extract day 0 prices
-            day0_trade = self._extract_trade_for_code(
-                date_trade_data.get(day0_str, {}), code
+            # Extract day 0 prices (already parsed per date)
+            day0_high[i], day0_close[i] = date_trade_data.get(day0_str, {}).get(
+                code, NO_PRICES
             )
-            day0_high = self._parse_price(day0_trade.get("TDD_HGPRC", "0"))
-            day0_close = self._parse_price(day0_trade.get("TDD_CLSPRC", "0"))
 
             # Extract day 1 prices
-            day1_trade = self._extract_trade_for_code(
-                date_trade_data.get(day1_str, {}), code
+            day1_high[i], day1_close[i] = date_trade_data.get(day1_str, {}).get(
+                code, NO_PRICES
             )
-            day1_high = self._parse_price(day1_trade.get("TDD_HGPRC", "0"))
-            day1_close = self._parse_price(day1_trade.get("TDD_CLSPRC", "0"))
 
-            # Combine all data
-            enriched_row = row.to_dict()
-            enriched_row.update(
-                {
-                    "day0_high": day0_high,
-                    "day0_close": day0_close,
-                    "day1_high": day1_high,
-                    "day1_close": day1_close,
-                }
-            )
+        return metadata_df.assign(
+            day0_high=day0_high,
+            day0_close=day0_close,
+            day1_high=day1_high,
+            day1_close=day1_close,
+        )
 
-            enriched_data.append(enriched_row)
+    def _fetch_prices_by_code(
+        self, date_str: str
+    ) -> Optional[Dict[str, Tuple[float, float]]]:
+        """
+        Fetch one date's (high, close) prices keyed by short stock code
+
+        Returns None on failure.
+        """
+        try:
+            trades = self.krx_client.get_daily_trade_data(date_str)
+        except Exception as e:
+            logger.error("Failed to fetch trade data for %s: %s", date_str, e)
+            return None
+        return _prices_by_code(trades)
+
+    def _cached_prices_by_code(
+        self, date_str: str
+    ) -> Optional[Dict[str, Tuple[float, float]]]:
+        """Rebuild one date's prices from its cached response (None if not cached)"""
+        trades = self.krx_client.get_cached_daily_trade_data(date_str)
+        if trades is None:
+            return None
+        return _prices_by_code(trades)
+
+    def _collect_prices_per_stock(
+        self,
+        metadata_df: pd.DataFrame,
+        show_progress: bool = False,
+        max_workers: int = 10,
+    ) -> pd.DataFrame:
+        """
+        Add Day 0 / Day 1 price columns by looking up each stock separately
 
-        return pd.DataFrame(enriched_data)
+        The 2N lookups are independent, so they run concurrently on a thread
+        pool; max_workers bounds the number of in-flight API requests.
 
-    def _extract_trade_for_code(self, date_trades: Dict, code: str) -> Dict:
-        """Extract trade data for a specific stock code from date trades"""
-        for isu_cd, trade in date_trades.items():
-            if code in isu_cd:  # ISU_CD may contain more than just the short code
-                return trade
-        return {}
+        Args:
+            metadata_df: DataFrame with IPO metadata including 'code' and 'listing_date'
+            show_progress: Show a progress bar over the lookups
+            max_workers: Maximum concurrent requests
 
-    def _parse_price(self, price_str: str) -> float:
-        """Parse price string to float"""
-        try:
-            return float(str(price_str).replace(",", ""))
-        except:
-            return 0.0
+        Returns:
+            DataFrame with added price columns (day0_high, day0_close, day1_high, day1_close)
+        """
+        n = len(metadata_df)
+        codes = metadata_df["code"].tolist()
+        listing_dates, next_days = _listing_days(metadata_df)
+
+        # Day 0 lookups first, then Day 1, so results split at n
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(
+                self.get_highest_and_closing_price,
+                codes + codes,
+                list(listing_dates) + list(next_days),
+            )
+            if show_progress:
+                results = tqdm(results, desc="Collecting prices", total=2 * n)
+            prices = list(results)
+
+        return metadata_df.assign(
+            day0_high=[p["highest"] for p in prices[:n]],
+            day0_close=[p["closing"] for p in prices[:n]],
+            day1_high=[p["highest"] for p in prices[n:]],
+            day1_close=[p["closing"] for p in prices[n:]],
+        )
 
     def collect_full_dataset(
         self, start_year: int = 2022, end_year: int = 2025, optimized: bool = True
@@ -680,76 +903,37 @@ class IPODataCollector:
             DataFrame with complete IPO data including prices
         """
         logger.info(
-            f"Collecting full dataset for {start_year}-{end_year} "
-            f"(optimized={optimized})"
+            "Collecting full dataset for %s-%s (optimized=%s)",
+            start_year,
+            end_year,
+            optimized,
         )
 
-        # Get IPO metadata
+        # Get IPO metadata (only the full dataset below is written to disk)
         metadata_df = self.collect_ipo_metadata(
-            start_year, end_year, optimized=optimized
+            start_year, end_year, optimized=optimized, save=False
         )
 
         if self.use_sample_data:
             # For sample data, use legacy method
-            enriched_data = []
-
-            for _, row in metadata_df.iterrows():
-                code = row["code"]
-                listing_date = pd.to_datetime(row["listing_date"])
-                next_day = listing_date + timedelta(days=1)
-
-                day0_prices = self.get_highest_and_closing_price(code, listing_date)
-                day1_prices = self.get_highest_and_closing_price(code, next_day)
-
-                enriched_row = row.to_dict()
-                enriched_row.update(
-                    {
-                        "day0_high": day0_prices["highest"],
-                        "day0_close": day0_prices["closing"],
-                        "day1_high": day1_prices["highest"],
-                        "day1_close": day1_prices["closing"],
-                    }
-                )
-                enriched_data.append(enriched_row)
-
-            full_df = pd.DataFrame(enriched_data)
+            full_df = self._collect_prices_per_stock(metadata_df)
         elif optimized:
             # Use batch optimized price collection
             full_df = self._collect_prices_batch_optimized(metadata_df)
         else:
             # Use legacy method (one API call per stock)
-            enriched_data = []
-
-            for _, row in tqdm(
-                metadata_df.iterrows(),
-                desc="Collecting prices",
-                total=len(metadata_df),
-            ):
-                code = row["code"]
-                listing_date = pd.to_datetime(row["listing_date"])
-                next_day = listing_date + timedelta(days=1)
+            full_df = self._collect_prices_per_stock(metadata_df, show_progress=True)
 
-                day0_prices = self.get_highest_and_closing_price(code, listing_date)
-                day1_prices = self.get_highest_and_closing_price(code, next_day)
-
-                enriched_row = row.to_dict()
-                enriched_row.update(
-                    {
-                        "day0_high": day0_prices["highest"],
-                        "day0_close": day0_prices["closing"],
-                        "day1_high": day1_prices["highest"],
-                        "day1_close": day1_prices["closing"],
-                    }
-                )
-                enriched_data.append(enriched_row)
-
-            full_df = pd.DataFrame(enriched_data)
-
-        # Save complete dataset
+        # Save complete dataset (returned with the same dtypes it loads with)
+        full_df = _widen_metadata_dtypes(full_df)
         output_file = self.data_dir / f"ipo_full_dataset_{start_year}_{end_year}.csv"
-        full_df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        output_file = save_dataset(
+            full_df, output_file, bom=True, output_format=settings.OUTPUT_FORMAT
+        )
         logger.info(
-            f"Saved full dataset to {output_file} ({len(full_df)} records with price data)"
+            "Saved full dataset to %s (%s records with price data)",
+            output_file,
+            len(full_df),
         )
 
         return full_df
@@ -62,7 +62,11 @@ class IPOFeatureEngineer:
             df["estimated_market_cap"] / df["paid_in_capital"],
             0
         )
-        df["total_offering_value"] = df.get("shares_offered", 0) * df["ipo_price_confirmed"]
+        # Widen int32 prices so the product cannot overflow
+        confirmed_price = df["ipo_price_confirmed"]
+        if pd.api.types.is_integer_dtype(confirmed_price):
+            confirmed_price = confirmed_price.astype("int64")
+        df["total_offering_value"] = df.get("shares_offered", 0) * confirmed_price
 
         # Demand indicators
         df["demand_to_lockup_ratio"] = df["institutional_demand_rate"] / (
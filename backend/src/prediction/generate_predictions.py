@@ -56,42 +56,42 @@ class PredictionGenerator:
         # Generate predictions
         predictions = self.predictor.predict(X)
 
-        # Format results
+        # Format results (itertuples: plain tuples instead of a Series per row;
+        # predictions are matched by position, whatever the index labels)
+        has_actual = "day0_high" in df.columns
         results = []
-        for idx, row in df.iterrows():
+        for pos, row in enumerate(df.itertuples(index=False)):
             prediction_dict = {
-                "company_name": row["company_name"],
-                "code": row["code"],
+                "company_name": row.company_name,
+                "code": row.code,
                 "listing_date": (
-                    row["listing_date"].strftime("%Y-%m-%d")
-                    if isinstance(row["listing_date"], pd.Timestamp)
-                    else row["listing_date"]
+                    row.listing_date.strftime("%Y-%m-%d")
+                    if isinstance(row.listing_date, pd.Timestamp)
+                    else row.listing_date
                 ),
-                "ipo_price": int(row["ipo_price_confirmed"]),
+                "ipo_price": int(row.ipo_price_confirmed),
                 "predicted": {
-                    "day0_high": int(round(predictions["day0_high"][idx])),
-                    "day0_close": int(round(predictions["day0_close"][idx])),
-                    "day1_close": int(round(predictions["day1_close"][idx])),
+                    "day0_high": int(round(predictions["day0_high"][pos])),
+                    "day0_close": int(round(predictions["day0_close"][pos])),
+                    "day1_close": int(round(predictions["day1_close"][pos])),
                 },
                 "metadata": {
-                    "shares_offered": int(row["shares_offered"]),
-                    "institutional_demand_rate": float(
-                        row["institutional_demand_rate"]
-                    ),
+                    "shares_offered": int(row.shares_offered),
+                    "institutional_demand_rate": float(row.institutional_demand_rate),
                     "subscription_competition_rate": float(
-                        row["subscription_competition_rate"]
+                        row.subscription_competition_rate
                     ),
-                    "industry": row["industry"],
-                    "theme": row["theme"],
+                    "industry": row.industry,
+                    "theme": row.theme,
                 },
             }
 
             # Add actual values if available (for model validation)
-            if "day0_high" in df.columns and pd.notna(row.get("day0_high")):
+            if has_actual and pd.notna(row.day0_high):
                 prediction_dict["actual"] = {
-                    "day0_high": int(row["day0_high"]),
-                    "day0_close": int(row["day0_close"]),
-                    "day1_close": int(row["day1_close"]),
+                    "day0_high": int(row.day0_high),
+                    "day0_close": int(row.day0_close),
+                    "day1_close": int(row.day1_close),
                 }
 
             results.append(prediction_dict)
@@ -219,10 +219,6 @@ def main():
         print("\nGenerating sample predictions with placeholder models...")
 
         # For demonstration, we'll train on sample data
-        from src.data_collection.ipo_collector import IPODataCollector
-        from src.features.feature_engineering import IPOFeatureEngineer
-        from src.models.ipo_predictor import IPOPricePredictor
-
         collector = IPODataCollector()
         df = collector.collect_full_dataset(2022, 2025)
 
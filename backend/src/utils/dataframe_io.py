@@ -0,0 +1,205 @@
+"""
+DataFrame IO
+Persist pipeline datasets as CSV with a Parquet sibling for fast reloads
+"""
+
+import codecs
+import logging
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+ColumnSelector = Union[Iterable[str], Callable[[str], bool]]
+
+# save_dataset output formats: CSV plus Parquet sibling, or either one alone
+OUTPUT_FORMATS = ("both", "csv", "parquet")
+
+
+def parquet_path(csv_path: Union[str, Path]) -> Path:
+    """Return the Parquet sibling path of a CSV dataset"""
+    return Path(csv_path).with_suffix(".parquet")
+
+
+def _to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert DataFrame to an Arrow table for CSV/Parquet output
+
+    Datetime columns are stored as the text pandas would write to CSV, so
+    the CSV and Parquet copies load identically.
+    """
+    datetime_cols = df.select_dtypes(include=["datetime", "datetimetz"]).columns
+    if len(datetime_cols):
+        formatted = {}
+        for col in datetime_cols:
+            values = df[col].dropna()
+            date_only = (values == values.dt.normalize()).all()
+            formatted[col] = df[col].dt.strftime(
+                "%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S"
+            )
+        df = df.assign(**formatted)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _csv_column(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Format float and boolean values as DataFrame.to_csv writes them
+
+    Arrow writes whole floats without a decimal point (45000 would reload as
+    int64) and booleans as true/false, so both are converted to pandas' text.
+    """
+    if pa.types.is_floating(column.type):
+        text = pc.cast(column, pa.string())
+        whole = pc.match_substring_regex(text, r"^-?\d+$")
+        return pc.if_else(whole, pc.binary_join_element_wise(text, ".0", ""), text)
+    if pa.types.is_boolean(column.type):
+        return pc.if_else(column, "True", "False")
+    return column
+
+
+def _write_table_csv(table: pa.Table, csv_path: Path, bom: bool) -> None:
+    """
+    Write an Arrow table as CSV, optionally prefixed with a UTF-8 BOM
+
+    Floats and booleans are formatted as pandas does, so the file reads back
+    with the same values and dtypes as DataFrame.to_csv output. The text is
+    not byte-identical: the header and all string values are quoted, and
+    float exponents may be spelled differently (1.5e-7 instead of 1.5e-07).
+    """
+    table = pa.table(
+        [_csv_column(column) for column in table.columns],
+        names=table.column_names,
+    )
+    with open(csv_path, "wb") as f:
+        if bom:
+            f.write(codecs.BOM_UTF8)
+        pacsv.write_csv(table, f)
+
+
+def write_csv(df: pd.DataFrame, csv_path: Union[str, Path], bom: bool = False) -> Path:
+    """
+    Write DataFrame as CSV with pyarrow's columnar writer
+
+    Falls back to DataFrame.to_csv when the frame cannot be converted to
+    Arrow (e.g. mixed-type object column).
+
+    Args:
+        df: DataFrame to write
+        csv_path: Output CSV path
+        bom: Prefix a UTF-8 BOM so Excel detects the encoding (utf-8-sig)
+
+    Returns:
+        Path to the written CSV file
+    """
+    csv_path = Path(csv_path)
+    try:
+        table = _to_arrow_table(df)
+    except (pa.ArrowException, ValueError):
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig" if bom else "utf-8")
+    else:
+        _write_table_csv(table, csv_path, bom)
+    return csv_path
+
+
+def save_dataset(
+    df: pd.DataFrame,
+    csv_path: Union[str, Path],
+    bom: bool = False,
+    output_format: str = "both",
+) -> Path:
+    """
+    Save dataset as CSV and/or as a zstd-compressed Parquet sibling
+
+    The CSV stays the human-readable artifact; the Parquet copy is what
+    downstream stages load. If the frame cannot be converted to Arrow
+    (e.g. mixed-type object column), the CSV is written by pandas and any
+    stale Parquet copy is removed so readers fall back to the CSV.
+
+    Args:
+        df: DataFrame to save
+        csv_path: Output CSV path
+        bom: Prefix the CSV with a UTF-8 BOM (utf-8-sig)
+        output_format: "both", "csv" (no Parquet copy) or "parquet" (no CSV;
+            an existing CSV is removed)
+
+    Returns:
+        Path to the saved CSV file (the Parquet file for "parquet")
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    csv_path = Path(csv_path)
+    parquet_file = parquet_path(csv_path)
+
+    try:
+        table = _to_arrow_table(df)
+    except (pa.ArrowException, ValueError) as e:
+        logger.warning(f"Skipping Parquet copy of {csv_path}: {e}")
+        df.to_csv(csv_path, index=False, encoding="utf-8-sig" if bom else "utf-8")
+        parquet_file.unlink(missing_ok=True)
+        return csv_path
+
+    if output_format == "parquet":
+        pq.write_table(table, parquet_file, compression="zstd")
+        # Drop any older CSV so nothing reads it as the current dataset
+        csv_path.unlink(missing_ok=True)
+        return parquet_file
+
+    _write_table_csv(table, csv_path, bom)
+    if output_format == "csv":
+        # Drop any older Parquet copy so load_dataset reads this CSV
+        parquet_file.unlink(missing_ok=True)
+    else:
+        pq.write_table(table, parquet_file, compression="zstd")
+    return csv_path
+
+
+def load_dataset(
+    csv_path: Union[str, Path],
+    usecols: Optional[ColumnSelector] = None,
+    dtype=None,
+    **csv_kwargs,
+) -> pd.DataFrame:
+    """
+    Load dataset, preferring an up-to-date Parquet sibling over the CSV
+
+    Args:
+        csv_path: Dataset CSV path
+        usecols: Column names or predicate, as in pd.read_csv
+        dtype: Column dtypes, as in pd.read_csv
+        **csv_kwargs: Extra arguments for pd.read_csv when falling back to CSV
+
+    Returns:
+        Loaded DataFrame
+    """
+    csv_path = Path(csv_path)
+    parquet_file = parquet_path(csv_path)
+
+    if parquet_file.exists() and (
+        not csv_path.exists()
+        or parquet_file.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        columns = None
+        if usecols is not None:
+            names = pq.read_schema(parquet_file).names
+            if callable(usecols):
+                columns = [name for name in names if usecols(name)]
+            else:
+                wanted = set(usecols)
+                columns = [name for name in names if name in wanted]
+
+        df = pd.read_parquet(parquet_file, engine="pyarrow", columns=columns)
+
+        if isinstance(dtype, dict):
+            dtype = {col: t for col, t in dtype.items() if col in df.columns}
+        if dtype:
+            df = df.astype(dtype)
+        return df
+
+    return pd.read_csv(csv_path, usecols=usecols, dtype=dtype, **csv_kwargs)
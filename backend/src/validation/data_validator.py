@@ -55,72 +55,103 @@ class DataValidator:
         if missing_cols:
             errors.append(f"Missing required columns: {missing_cols}")
 
-        for idx, row in df.iterrows():
-            if pd.isna(row.get("company_name")) or row.get("company_name") == "":
-                errors.append(f"Row {idx}: Missing company_name")
-
-            if pd.isna(row.get("code")) or row.get("code") == "":
-                errors.append(f"Row {idx}: Missing code")
-
-            if "ipo_price_lower" in df.columns and "ipo_price_upper" in df.columns:
-                if row["ipo_price_lower"] >= row["ipo_price_upper"]:
-                    errors.append(
-                        f"Row {idx}: ipo_price_lower must be less than ipo_price_upper"
-                    )
-
-            if (
-                "ipo_price_confirmed" in df.columns
-                and "ipo_price_lower" in df.columns
-                and "ipo_price_upper" in df.columns
-            ):
-                if not (
-                    row["ipo_price_lower"]
-                    <= row["ipo_price_confirmed"]
-                    <= row["ipo_price_upper"]
-                ):
-                    errors.append(
-                        f"Row {idx}: ipo_price_confirmed must be between lower and upper bounds"
-                    )
-
-            if "shares_offered" in df.columns:
-                if row["shares_offered"] <= 0:
-                    errors.append(f"Row {idx}: shares_offered must be positive")
-
-            if "institutional_demand_rate" in df.columns:
-                if row["institutional_demand_rate"] < 0:
-                    errors.append(
-                        f"Row {idx}: institutional_demand_rate cannot be negative"
-                    )
-
-            if "lockup_ratio" in df.columns:
-                if not (0 <= row["lockup_ratio"] <= 100):
-                    errors.append(f"Row {idx}: lockup_ratio must be between 0 and 100")
-
-            if "subscription_competition_rate" in df.columns:
-                if row["subscription_competition_rate"] < 0:
-                    errors.append(
-                        f"Row {idx}: subscription_competition_rate cannot be negative"
+        # Evaluate each rule on whole columns, then report failing rows in
+        # row order (same messages and order as checking row by row)
+        checks = []  # (failed mask, message template, values for the template)
+
+        for col in ("company_name", "code"):
+            if col in df.columns:
+                blank = df[col].isna() | (df[col] == "")
+            else:
+                blank = pd.Series(True, index=df.index)
+            checks.append((blank, f"Missing {col}", None))
+
+        if "ipo_price_lower" in df.columns and "ipo_price_upper" in df.columns:
+            lower, upper = df["ipo_price_lower"], df["ipo_price_upper"]
+            checks.append(
+                (
+                    lower >= upper,
+                    "ipo_price_lower must be less than ipo_price_upper",
+                    None,
+                )
+            )
+            if "ipo_price_confirmed" in df.columns:
+                confirmed = df["ipo_price_confirmed"]
+                checks.append(
+                    (
+                        ~((lower <= confirmed) & (confirmed <= upper)),
+                        "ipo_price_confirmed must be between lower and upper bounds",
+                        None,
                     )
+                )
 
-            if "paid_in_capital" in df.columns:
-                if row["paid_in_capital"] <= 0:
-                    errors.append(f"Row {idx}: paid_in_capital must be positive")
-
-            if "estimated_market_cap" in df.columns:
-                if row["estimated_market_cap"] <= 0:
-                    errors.append(f"Row {idx}: estimated_market_cap must be positive")
-
-            if (
-                "allocation_ratio_equal" in df.columns
-                and "allocation_ratio_proportional" in df.columns
-            ):
-                total = (
-                    row["allocation_ratio_equal"] + row["allocation_ratio_proportional"]
+        if "shares_offered" in df.columns:
+            checks.append(
+                (df["shares_offered"] <= 0, "shares_offered must be positive", None)
+            )
+
+        if "institutional_demand_rate" in df.columns:
+            checks.append(
+                (
+                    df["institutional_demand_rate"] < 0,
+                    "institutional_demand_rate cannot be negative",
+                    None,
                 )
-                if not (99 <= total <= 101):
-                    errors.append(
-                        f"Row {idx}: allocation ratios must sum to ~100% (got {total}%)"
-                    )
+            )
+
+        if "lockup_ratio" in df.columns:
+            checks.append(
+                (
+                    ~df["lockup_ratio"].between(0, 100),
+                    "lockup_ratio must be between 0 and 100",
+                    None,
+                )
+            )
+
+        if "subscription_competition_rate" in df.columns:
+            checks.append(
+                (
+                    df["subscription_competition_rate"] < 0,
+                    "subscription_competition_rate cannot be negative",
+                    None,
+                )
+            )
+
+        if "paid_in_capital" in df.columns:
+            checks.append(
+                (df["paid_in_capital"] <= 0, "paid_in_capital must be positive", None)
+            )
+
+        if "estimated_market_cap" in df.columns:
+            checks.append(
+                (
+                    df["estimated_market_cap"] <= 0,
+                    "estimated_market_cap must be positive",
+                    None,
+                )
+            )
+
+        if (
+            "allocation_ratio_equal" in df.columns
+            and "allocation_ratio_proportional" in df.columns
+        ):
+            total = df["allocation_ratio_equal"] + df["allocation_ratio_proportional"]
+            checks.append(
+                (
+                    ~total.between(99, 101),
+                    "allocation ratios must sum to ~100% (got {}%)",
+                    total.tolist(),
+                )
+            )
+
+        failed = np.column_stack([mask.to_numpy(dtype=bool) for mask, _, _ in checks])
+        for pos in np.flatnonzero(failed.any(axis=1)):
+            idx = df.index[pos]
+            for (_, message, values), row_failed in zip(checks, failed[pos]):
+                if row_failed:
+                    if values is not None:
+                        message = message.format(values[pos])
+                    errors.append(f"Row {idx}: {message}")
 
         is_valid = len(errors) == 0
         return is_valid, errors
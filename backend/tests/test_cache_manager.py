@@ -0,0 +1,155 @@
+"""Unit tests for CacheManager"""
+
+import os
+import pickle
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+from src.data_collection.cache_manager import CacheManager
+
+
+class TestCacheManager:
+    """Test cache formats and housekeeping"""
+
+    def test_records_round_trip_as_json(self, temp_data_dir):
+        """Test API record lists are stored as JSON"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        records = [{"ISU_CD": "KR7000001000", "TDD_CLSPRC": "1,000"}]
+
+        cache.set("daily_trade_20240101", records)
+
+        assert (cache.cache_dir / "daily_trade_20240101.cache.json").exists()
+        assert cache.get("daily_trade_20240101") == records
+
+    def test_dataframe_round_trip_as_feather(self, temp_data_dir):
+        """Test DataFrames are stored as Feather"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        df = pd.DataFrame({"code": ["000001", "000002"], "price": [1.5, 2.5]})
+
+        cache.set("prices", df)
+
+        assert (cache.cache_dir / "prices.feather").exists()
+        pd.testing.assert_frame_equal(cache.get("prices"), df)
+
+    def test_reads_legacy_pickle_and_replaces_it(self, temp_data_dir):
+        """Test pickles from older versions load and are dropped on rewrite"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        legacy_path = cache.cache_dir / "stock_info_20240101.pkl"
+        legacy_path.write_bytes(pickle.dumps([{"code": "000001"}]))
+
+        assert cache.get("stock_info_20240101") == [{"code": "000001"}]
+
+        cache.set("stock_info_20240101", [{"code": "000002"}])
+
+        assert not legacy_path.exists()
+        assert cache.get("stock_info_20240101") == [{"code": "000002"}]
+
+    def test_clear_all_keeps_other_json_files(self, temp_data_dir):
+        """Test clear_all leaves checkpoint and token files alone"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        cache.set("records", [{"a": 1}])
+        cache.set("frame", pd.DataFrame({"a": [1]}))
+        cache.set("other", {1, 2})
+        cache.save_checkpoint({"stage": "test"})
+        token_file = cache.cache_dir / "kis_token.json"
+        token_file.write_text("{}")
+
+        assert cache.get_cache_stats()["cache_count"] == 3
+        assert cache.clear_all() == 3
+        assert cache.checkpoint_file.exists()
+        assert token_file.exists()
+
+    def test_checkpoint_writes_are_throttled(self, temp_data_dir):
+        """Test checkpoints within the flush interval stay in memory until forced"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        cache.save_checkpoint({"stage": "price_collection", "completed_dates": []})
+        cache.save_checkpoint(
+            {"stage": "price_collection", "completed_dates": ["20240101"]}
+        )
+
+        assert cache.load_checkpoint()["completed_dates"] == ["20240101"]
+        assert (
+            CacheManager(cache_dir=temp_data_dir).load_checkpoint()["completed_dates"]
+            == []
+        )
+
+        cache.flush_checkpoint()
+
+        assert CacheManager(cache_dir=temp_data_dir).load_checkpoint()[
+            "completed_dates"
+        ] == ["20240101"]
+
+    def test_exit_flush_registered_only_while_pending(self, temp_data_dir):
+        """Test the atexit hook exists only while a checkpoint is unwritten"""
+        with (
+            patch("atexit.register") as register,
+            patch("atexit.unregister") as unregister,
+        ):
+            cache = CacheManager(cache_dir=temp_data_dir)
+            register.assert_not_called()
+
+            cache.save_checkpoint({"stage": "price_collection"})
+            register.assert_not_called()
+
+            cache.save_checkpoint({"stage": "price_collection"})
+            cache.save_checkpoint({"stage": "price_collection"})
+            register.assert_called_once_with(cache.flush_checkpoint)
+
+            cache.flush_checkpoint()
+            unregister.assert_called_once_with(cache.flush_checkpoint)
+
+    def test_get_respects_max_age(self, temp_data_dir):
+        """Test entries older than max_age are treated as missing"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        cache.set("daily_trade_20240101", [{"a": 1}])
+        cache_path = cache.cache_dir / "daily_trade_20240101.cache.json"
+        written = time.time() - 7200
+        os.utime(cache_path, (written, written))
+
+        assert cache.get("daily_trade_20240101", max_age=3600) is None
+        assert cache.get("daily_trade_20240101", max_age=86400) == [{"a": 1}]
+        assert cache.get("daily_trade_20240101") == [{"a": 1}]
+
+    def test_progress_log_appends_and_clears(self, temp_data_dir):
+        """Test completed items are appended, reloaded and cleared"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        assert cache.load_completed() == set()
+
+        cache.mark_completed("20240101")
+        cache.mark_completed("20240102")
+
+        assert cache.progress_log.read_text() == "20240101\n20240102\n"
+        assert CacheManager(cache_dir=temp_data_dir).load_completed() == {
+            "20240101",
+            "20240102",
+        }
+        assert cache.get_cache_stats()["has_checkpoint"]
+
+        cache.clear_checkpoint()
+
+        assert cache.load_completed() == set()
+
+    def test_non_json_values_round_trip_as_pickle(self, temp_data_dir):
+        """Test values JSON would change (tuples, datetimes) are pickled"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        data = {"dates": (datetime(2024, 1, 1), "20240102"), "rate": float("nan")}
+
+        cache.set("mixed", data)
+
+        assert (cache.cache_dir / "mixed.pkl").exists()
+        loaded = cache.get("mixed")
+        assert loaded["dates"] == data["dates"]
+        assert loaded["rate"] != loaded["rate"]
+
+    def test_mixed_type_dataframe_falls_back_to_pickle(self, temp_data_dir):
+        """Test frames Feather cannot store are pickled, leaving no empty file"""
+        cache = CacheManager(cache_dir=temp_data_dir)
+        df = pd.DataFrame({"a": [1, "x"]})
+
+        cache.set("mixed_frame", df)
+
+        assert not (cache.cache_dir / "mixed_frame.feather").exists()
+        assert (cache.cache_dir / "mixed_frame.pkl").exists()
+        pd.testing.assert_frame_equal(cache.get("mixed_frame"), df)
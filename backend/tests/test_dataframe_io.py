@@ -0,0 +1,97 @@
+"""Unit tests for DataFrame IO helpers"""
+
+import os
+
+import pandas as pd
+from pathlib import Path
+from src.utils.dataframe_io import load_dataset, parquet_path, save_dataset, write_csv
+
+
+class TestDataFrameIO:
+    """Test save_dataset / load_dataset"""
+
+    def test_save_writes_csv_and_parquet(self, temp_data_dir):
+        """Test both CSV and Parquet copies are written"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        df = pd.DataFrame({"code": ["000001", "000002"], "price": [1.5, 2.5]})
+
+        save_dataset(df, csv_path)
+
+        assert csv_path.exists()
+        assert parquet_path(csv_path).exists()
+
+    def test_load_prefers_parquet_with_usecols(self, temp_data_dir):
+        """Test Parquet is read back with column selection and dtypes"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        df = pd.DataFrame(
+            {"code": ["000001", "000002"], "price": [1.5, 2.5], "name": ["A", "B"]}
+        )
+        save_dataset(df, csv_path)
+
+        loaded = load_dataset(
+            csv_path, usecols=lambda col: col != "name", dtype={"code": str}
+        )
+
+        assert list(loaded.columns) == ["code", "price"]
+        assert loaded["code"].tolist() == ["000001", "000002"]
+
+    def test_load_falls_back_to_newer_csv(self, temp_data_dir):
+        """Test CSV edited after the Parquet copy wins"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        save_dataset(pd.DataFrame({"price": [1.0]}), csv_path)
+
+        pd.DataFrame({"price": [2.0]}).to_csv(csv_path, index=False)
+        stat = parquet_path(csv_path).stat()
+        os.utime(csv_path, (stat.st_atime, stat.st_mtime + 10))
+
+        loaded = load_dataset(csv_path, usecols=["price"])
+
+        assert loaded["price"].tolist() == [2.0]
+
+    def test_write_csv_with_bom(self, temp_data_dir):
+        """Test Excel BOM is written once and the CSV round-trips"""
+        csv_path = Path(temp_data_dir) / "report.csv"
+        df = pd.DataFrame({"company_name": ["테스트", "A,B"], "price": [1.5, 2.5]})
+
+        write_csv(df, csv_path, bom=True)
+
+        assert csv_path.read_bytes().startswith(b"\xef\xbb\xbf")
+        loaded = pd.read_csv(csv_path, encoding="utf-8-sig")
+        pd.testing.assert_frame_equal(loaded, df)
+
+    def test_datetime_columns_saved_as_dates(self, temp_data_dir):
+        """Test date-only datetimes are written like DataFrame.to_csv"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        df = pd.DataFrame({"listing_date": pd.to_datetime(["2024-01-15", None])})
+
+        save_dataset(df, csv_path)
+
+        assert csv_path.read_text().splitlines()[1] == '"2024-01-15"'
+        assert load_dataset(csv_path)["listing_date"].tolist()[0] == "2024-01-15"
+
+    def test_save_single_output_format(self, temp_data_dir):
+        """Test csv/parquet output formats write one file and load back"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        df = pd.DataFrame({"price": [1.5, 2.5]})
+
+        save_dataset(df.iloc[:1], csv_path)
+        saved = save_dataset(df, csv_path, output_format="parquet")
+
+        assert saved == parquet_path(csv_path)
+        # The CSV from the earlier save is removed rather than left stale
+        assert not csv_path.exists()
+        pd.testing.assert_frame_equal(load_dataset(csv_path), df)
+
+        save_dataset(df, csv_path, output_format="csv")
+
+        assert csv_path.exists()
+        assert not parquet_path(csv_path).exists()
+
+    def test_csv_keeps_float_and_bool_dtypes(self, temp_data_dir):
+        """Test whole-number floats and booleans read back like to_csv output"""
+        csv_path = Path(temp_data_dir) / "dataset.csv"
+        df = pd.DataFrame({"price": [45000.0, 0.0], "listed": [True, False]})
+
+        write_csv(df, csv_path)
+
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), df)
@@ -17,6 +17,15 @@ class TestIPODataCollector:
         assert collector.data_dir.exists()
         assert collector.data_dir == Path(temp_data_dir)
 
+    def test_init_rejects_unknown_output_format(self, temp_data_dir, monkeypatch):
+        """Test a bad OUTPUT_FORMAT fails before any collection"""
+        from src.config.settings import Settings
+
+        monkeypatch.setattr(Settings, "OUTPUT_FORMAT", "xlsx")
+
+        with pytest.raises(ValueError, match="OUTPUT_FORMAT"):
+            IPODataCollector(data_dir=temp_data_dir, use_sample_data=True)
+
     def test_collect_ipo_metadata(self, temp_data_dir):
         """Test IPO metadata collection"""
         collector = IPODataCollector(data_dir=temp_data_dir, use_sample_data=True)
@@ -62,8 +71,20 @@ class TestIPODataCollector:
         assert "price" in df.columns
         assert "volume" in df.columns
 
-        output_file = Path(temp_data_dir) / "intraday_100000_20240115.csv"
+        output_file = Path(temp_data_dir) / "intraday_100000_20240115.parquet"
         assert output_file.exists()
+        assert not output_file.with_suffix(".csv").exists()
+        pd.testing.assert_frame_equal(pd.read_parquet(output_file), df)
+
+    def test_collect_intraday_prices_without_persist(self, temp_data_dir):
+        """Test in-memory intraday collection writes no files"""
+        collector = IPODataCollector(data_dir=temp_data_dir, use_sample_data=True)
+        df = collector.collect_intraday_prices(
+            "100000", datetime(2024, 1, 15), persist=False
+        )
+
+        assert len(df) > 0
+        assert not any(Path(temp_data_dir).glob("intraday_*"))
 
     def test_get_highest_and_closing_price(self, temp_data_dir):
         """Test extraction of highest and closing prices"""
@@ -95,3 +116,68 @@ class TestIPODataCollector:
 
         output_file = Path(temp_data_dir) / "ipo_full_dataset_2022_2025.csv"
         assert output_file.exists()
+        # Metadata is only an intermediate here and is not written separately
+        assert not (Path(temp_data_dir) / "ipo_metadata_2022_2025.csv").exists()
+
+    def test_saved_dataset_dtypes_match_across_formats(
+        self, temp_data_dir, monkeypatch
+    ):
+        """Test CSV and Parquet outputs load with the same wide dtypes"""
+        from src.config.settings import Settings
+        from src.utils.dataframe_io import load_dataset
+
+        loaded = {}
+        for output_format in ("csv", "parquet"):
+            monkeypatch.setattr(Settings, "OUTPUT_FORMAT", output_format)
+            data_dir = Path(temp_data_dir) / output_format
+            collector = IPODataCollector(data_dir=str(data_dir), use_sample_data=True)
+            collector.collect_full_dataset(2022, 2025)
+            loaded[output_format] = load_dataset(
+                data_dir / "ipo_full_dataset_2022_2025.csv"
+            )
+
+        csv_df, parquet_df = loaded["csv"], loaded["parquet"]
+        for col in ("ipo_price_confirmed", "shares_offered", "lockup_ratio"):
+            assert parquet_df[col].dtype == csv_df[col].dtype
+        assert not isinstance(parquet_df["industry"].dtype, pd.CategoricalDtype)
+
+        # Offering values exceed the int32 range and must not wrap around
+        offering = parquet_df["shares_offered"] * parquet_df["ipo_price_confirmed"]
+        assert offering.max() > np.iinfo(np.int32).max
+        assert (offering > 0).all()
+
+    def test_batch_prices_resume_keeps_completed_dates(self, temp_data_dir):
+        """Test completed dates come from the cache and failed dates are retried"""
+        from unittest.mock import Mock
+        from src.data_collection.cache_manager import CacheManager
+
+        collector = IPODataCollector(data_dir=temp_data_dir, use_sample_data=True)
+        collector.cache_manager = CacheManager(cache_dir=temp_data_dir)
+        collector.cache_manager.mark_completed("20240115")
+
+        def daily_trades(date_str):
+            if date_str == "20240116":
+                raise RuntimeError("API down")
+            return [
+                {"ISU_CD": "KR7100000001", "TDD_HGPRC": "1,200", "TDD_CLSPRC": "1,100"}
+            ]
+
+        collector.krx_client = Mock()
+        collector.krx_client.request_count = {}
+        collector.krx_client.get_cached_daily_trade_data.side_effect = daily_trades
+        collector.krx_client.get_daily_trade_data.side_effect = daily_trades
+        metadata_df = pd.DataFrame({"code": ["100000"], "listing_date": ["2024-01-15"]})
+
+        df = collector._collect_prices_batch_optimized(metadata_df)
+
+        assert df.loc[0, "day0_high"] == 1200.0
+        assert df.loc[0, "day0_close"] == 1100.0
+        assert df.loc[0, "day1_high"] == 0.0
+        # Only the date missing from the progress log hits the API
+        collector.krx_client.get_cached_daily_trade_data.assert_called_once_with(
+            "20240115"
+        )
+        collector.krx_client.get_daily_trade_data.assert_called_once_with("20240116")
+        # The failed date is not logged, so the next run fetches it again
+        assert collector.cache_manager.load_completed() == {"20240115"}
+        assert collector.cache_manager.load_checkpoint()["stage"] == "price_collection"
@@ -0,0 +1,244 @@
+"""
+Tests for KIS API Client
+"""
+
+import asyncio
+import json
+import threading
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from src.api import kis_client
+from src.api.kis_client import AsyncKISApiClient, KISApiClient
+
+
+@pytest.fixture
+def client(temp_data_dir, monkeypatch):
+    """KIS client whose token cache lives in a temporary directory"""
+    monkeypatch.chdir(temp_data_dir)
+    client = KISApiClient(app_key="test_key", app_secret="test_secret")
+    yield client
+    client.close()
+
+
+def write_cached_token(client, token, expires_in=timedelta(hours=1)):
+    """Cache a token as another worker would"""
+    expires_at = datetime.now() + expires_in
+    client.token_cache_file.write_text(
+        json.dumps({"access_token": token, "expires_at": expires_at.isoformat()})
+    )
+
+
+def test_refresh_token_uses_token_cached_by_another_worker(client):
+    """Test a refresh under the lock reuses a token written meanwhile"""
+    write_cached_token(client, "cached_token")
+
+    with patch.object(KISApiClient, "authenticate") as authenticate:
+        client._refresh_token()
+
+    authenticate.assert_not_called()
+    assert client.access_token == "cached_token"
+    assert client._session.headers["authorization"] == "Bearer cached_token"
+
+
+@pytest.mark.skipif(kis_client.fcntl is None, reason="fcntl is POSIX only")
+def test_token_file_lock_uses_flock(client):
+    """Test the token lock takes and releases an exclusive file lock"""
+    with patch.object(kis_client.fcntl, "flock") as flock:
+        with client._token_file_lock():
+            assert flock.call_args.args[1] == kis_client.fcntl.LOCK_EX
+        assert flock.call_args.args[1] == kis_client.fcntl.LOCK_UN
+
+    assert client.token_lock_file.exists()
+
+
+def test_token_file_lock_without_fcntl(client, monkeypatch):
+    """Test the lock falls back to an in-process lock where fcntl is missing"""
+    monkeypatch.setattr(kis_client, "fcntl", None)
+
+    with client._token_file_lock():
+        assert kis_client._TOKEN_REFRESH_LOCK.locked()
+        acquired = []
+        waiter = threading.Thread(
+            target=lambda: acquired.append(
+                kis_client._TOKEN_REFRESH_LOCK.acquire(timeout=0.05)
+            )
+        )
+        waiter.start()
+        waiter.join()
+        assert acquired == [False]
+
+    assert not kis_client._TOKEN_REFRESH_LOCK.locked()
+    assert not client.token_lock_file.exists()
+
+
+def offering_page(code, cts=""):
+    """One page of the IPO offering API"""
+    return {"rt_cd": "0", "output1": [{"sht_cd": code}], "cts": cts}
+
+
+def test_ipo_offering_info_follows_pages(client):
+    """Test pagination follows continuation tokens to the last page"""
+    pages = [offering_page("100000", "next1"), offering_page("200000")]
+
+    with patch.object(KISApiClient, "_make_request", side_effect=pages) as request:
+        offerings = client.get_ipo_offering_info("20240101", "20241231")
+
+    assert [o["sht_cd"] for o in offerings] == ["100000", "200000"]
+    assert request.call_args_list[1].args[1]["cts"] == "next1"
+
+
+def test_ipo_offering_info_stops_on_repeated_token(client):
+    """Test a token seen before ends pagination instead of looping"""
+    pages = [
+        offering_page("100000", "same"),
+        offering_page("200000", "same"),
+        offering_page("300000"),
+    ]
+
+    with patch.object(KISApiClient, "_make_request", side_effect=pages) as request:
+        offerings = client.get_ipo_offering_info("20240101", "20241231")
+
+    assert [o["sht_cd"] for o in offerings] == ["100000", "200000"]
+    assert request.call_count == 2
+
+
+def test_ipo_offering_info_stops_at_max_pages(client, monkeypatch):
+    """Test pagination is capped at MAX_PAGES"""
+    monkeypatch.setattr(kis_client, "MAX_PAGES", 3)
+    pages = [offering_page(str(i), f"token{i}") for i in range(5)]
+
+    with patch.object(KISApiClient, "_make_request", side_effect=pages) as request:
+        offerings = client.get_ipo_offering_info("20240101", "20241231")
+
+    assert len(offerings) == 3
+    assert request.call_count == 3
+
+
+def test_ipo_offering_info_keeps_pages_before_failure(client):
+    """Test a failing later page returns the records already fetched"""
+    pages = [offering_page("100000", "next1"), ValueError("API error")]
+
+    with patch.object(KISApiClient, "_make_request", side_effect=pages):
+        offerings = client.get_ipo_offering_info("20240101", "20241231")
+
+    assert offerings == [{"sht_cd": "100000"}]
+
+
+def test_ipo_offering_info_first_page_failure(client):
+    """Test a failing first page returns no records"""
+    with patch.object(
+        KISApiClient, "_make_request", side_effect=ValueError("API error")
+    ):
+        assert client.get_ipo_offering_info("20240101", "20241231") == []
+
+
+def fake_authenticate(client):
+    """Stand-in for authenticate that issues a one-hour token"""
+    client._set_access_token("new_token", datetime.now() + timedelta(hours=1))
+    return client.access_token
+
+
+def test_token_refresh_scheduled_before_expiry(client):
+    """Test the token is refreshed once, TOKEN_EXPIRY_MARGIN before it expires"""
+    clock = [1000.0]
+
+    with (
+        patch.object(kis_client.time, "monotonic", side_effect=lambda: clock[0]),
+        patch.object(
+            KISApiClient, "authenticate", autospec=True, side_effect=fake_authenticate
+        ) as authenticate,
+    ):
+        client._ensure_authenticated()
+        lifetime = timedelta(hours=1) - kis_client.TOKEN_EXPIRY_MARGIN
+        assert client._token_refresh_at - 1000.0 == pytest.approx(
+            lifetime.total_seconds(), abs=5
+        )
+
+        client._ensure_authenticated()
+        clock[0] = client._token_refresh_at - 1
+        client._ensure_authenticated()
+        assert authenticate.call_count == 1
+
+        clock[0] = client._token_refresh_at
+        client._ensure_authenticated()
+        client._ensure_authenticated()
+        assert authenticate.call_count == 2
+
+
+def test_prefetch_auth_fetches_token_once(temp_data_dir, monkeypatch):
+    """Test the background token fetch is joined instead of repeated"""
+    monkeypatch.chdir(temp_data_dir)
+
+    with patch.object(
+        KISApiClient, "authenticate", autospec=True, side_effect=fake_authenticate
+    ) as authenticate:
+        client = KISApiClient(
+            app_key="test_key", app_secret="test_secret", prefetch_auth=True
+        )
+        assert client._auth_prefetch is not None
+
+        client._ensure_authenticated()
+        client._ensure_authenticated()
+
+    assert client._auth_prefetch is None
+    assert client.access_token == "new_token"
+    authenticate.assert_called_once()
+    client.close()
+
+
+def test_prefetch_auth_skipped_with_cached_token(client):
+    """Test no background fetch starts when a cached token is still valid"""
+    write_cached_token(client, "cached_token")
+
+    cached_client = KISApiClient(
+        app_key="test_key", app_secret="test_secret", prefetch_auth=True
+    )
+
+    assert cached_client._auth_prefetch is None
+    assert cached_client.access_token == "cached_token"
+    cached_client.close()
+
+
+def test_async_client_delegates_to_sync_client(temp_data_dir, monkeypatch):
+    """Test async methods run the sync client method with the same arguments"""
+    monkeypatch.chdir(temp_data_dir)
+
+    async def fetch_prices():
+        async with AsyncKISApiClient(
+            app_key="test_key", app_secret="test_secret"
+        ) as client:
+            return await asyncio.gather(
+                client.get_current_price("100000"),
+                client.get_daily_ohlcv("200000", "20240101", end_date="20240131"),
+            )
+
+    with (
+        patch.object(
+            KISApiClient, "get_current_price", return_value={"stck_prpr": "1000"}
+        ) as get_current_price,
+        patch.object(KISApiClient, "get_daily_ohlcv", return_value=[]) as get_daily,
+    ):
+        price, ohlcv = asyncio.run(fetch_prices())
+
+    assert price == {"stck_prpr": "1000"}
+    assert ohlcv == []
+    get_current_price.assert_called_once_with("100000")
+    get_daily.assert_called_once_with("200000", "20240101", end_date="20240131")
+
+
+def test_async_client_propagates_exceptions(temp_data_dir, monkeypatch):
+    """Test errors raised by the sync client reach the awaiting caller"""
+    monkeypatch.chdir(temp_data_dir)
+
+    async def authenticate():
+        async with AsyncKISApiClient(
+            app_key="test_key", app_secret="test_secret"
+        ) as client:
+            await client.authenticate()
+
+    with patch.object(
+        KISApiClient, "authenticate", side_effect=RuntimeError("auth down")
+    ):
+        with pytest.raises(RuntimeError, match="auth down"):
+            asyncio.run(authenticate())
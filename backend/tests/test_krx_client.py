@@ -2,14 +2,26 @@
 Tests for KRX API Client
 """
 
+import orjson
 import pytest
+import threading
+from datetime import datetime
 from unittest.mock import Mock, patch
-from src.api.krx_client import KRXApiClient, KRXApiError
-
-
-def test_krx_client_initialization():
+from src.api import krx_client
+from src.api.krx_client import (
+    KRXApiClient,
+    KRXApiError,
+    KRXTransientError,
+    RECENT_CACHE_MAX_AGE,
+    SharedRequestQuota,
+    cache_max_age,
+    short_code_from_isu_cd,
+)
+
+
+def test_krx_client_initialization(temp_data_dir):
     """Test KRX client initialization"""
-    client = KRXApiClient(api_key="test_key", timeout=30)
+    client = KRXApiClient(api_key="test_key", timeout=30, quota_dir=temp_data_dir)
 
     assert client.api_key == "test_key"
     assert client.timeout == 30
@@ -17,35 +29,37 @@ def test_krx_client_initialization():
     assert "daily_trade" in client.endpoints
 
 
-def test_get_headers():
-    """Test API headers generation"""
-    client = KRXApiClient(api_key="test_key")
-    headers = client._get_headers()
+def test_session_headers(temp_data_dir):
+    """Test API headers are set once on the session"""
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
+    headers = client._session.headers
 
     assert headers["Authorization"] == "Bearer test_key"
     assert headers["Content-Type"] == "application/json"
 
 
-@patch("requests.get")
-def test_get_stock_info_success(mock_get):
+@patch("requests.Session.get")
+def test_get_stock_info_success(mock_get, temp_data_dir):
     """Test successful stock info retrieval"""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "OutBlock_1": [
-            {
-                "ISU_CD": "KR123456",
-                "ISU_SRT_CD": "123456",
-                "ISU_NM": "테스트기업",
-                "LIST_DD": "20240101",
-                "LIST_SHRS": "1000000",
-                "PARVAL": "5000",
-            }
-        ]
-    }
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {
+                    "ISU_CD": "KR123456",
+                    "ISU_SRT_CD": "123456",
+                    "ISU_NM": "테스트기업",
+                    "LIST_DD": "20240101",
+                    "LIST_SHRS": "1000000",
+                    "PARVAL": "5000",
+                }
+            ]
+        }
+    )
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
     stocks = client.get_stock_info("20240101")
 
     assert len(stocks) == 1
@@ -53,27 +67,29 @@ def test_get_stock_info_success(mock_get):
     mock_get.assert_called_once()
 
 
-@patch("requests.get")
-def test_get_daily_trade_data_success(mock_get):
+@patch("requests.Session.get")
+def test_get_daily_trade_data_success(mock_get, temp_data_dir):
     """Test successful daily trade data retrieval"""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "OutBlock_1": [
-            {
-                "BAS_DD": "20240101",
-                "ISU_CD": "KR123456",
-                "ISU_NM": "테스트기업",
-                "TDD_CLSPRC": "50000",
-                "TDD_HGPRC": "52000",
-                "TDD_LWPRC": "49000",
-                "ACC_TRDVOL": "1000000",
-            }
-        ]
-    }
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {
+                    "BAS_DD": "20240101",
+                    "ISU_CD": "KR123456",
+                    "ISU_NM": "테스트기업",
+                    "TDD_CLSPRC": "50000",
+                    "TDD_HGPRC": "52000",
+                    "TDD_LWPRC": "49000",
+                    "ACC_TRDVOL": "1000000",
+                }
+            ]
+        }
+    )
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
     trades = client.get_daily_trade_data("20240101")
 
     assert len(trades) == 1
@@ -81,41 +97,41 @@ def test_get_daily_trade_data_success(mock_get):
     assert trades[0]["TDD_HGPRC"] == "52000"
 
 
-@patch("requests.get")
-def test_api_timeout_error(mock_get):
+@patch("src.api.retry.time.sleep")
+@patch("requests.Session.get")
+def test_api_timeout_error(mock_get, mock_sleep, temp_data_dir):
     """Test API timeout handling"""
     import requests
-    from tenacity import RetryError
 
     mock_get.side_effect = requests.exceptions.Timeout()
 
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
 
-    # Retry logic wraps the error in RetryError
-    with pytest.raises(RetryError):
+    # Timeouts are retried, then the last error is raised
+    with pytest.raises(KRXTransientError):
         client.get_stock_info("20240101")
 
 
-@patch("requests.get")
-def test_api_http_error(mock_get):
+@patch("src.api.retry.time.sleep")
+@patch("requests.Session.get")
+def test_api_http_error(mock_get, mock_sleep, temp_data_dir):
     """Test API HTTP error handling"""
     import requests
-    from tenacity import RetryError
 
     mock_response = Mock()
     mock_response.status_code = 500
     mock_get.side_effect = requests.exceptions.HTTPError(response=mock_response)
 
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
 
-    # Retry logic wraps the error in RetryError
-    with pytest.raises(RetryError):
+    # Server errors are retried, then the last error is raised
+    with pytest.raises(KRXTransientError):
         client.get_stock_info("20240101")
 
 
-def test_rate_limit_tracking():
+def test_rate_limit_tracking(temp_data_dir):
     """Test rate limit tracking"""
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
 
     initial_count = client.request_count["stock_info"]
     assert initial_count == 0
@@ -129,33 +145,34 @@ def test_rate_limit_tracking():
     assert client.request_count["stock_info"] == 0
 
 
-@patch("requests.get")
-def test_rate_limit_exceeded(mock_get):
+@patch("requests.Session.get")
+def test_rate_limit_exceeded(mock_get, temp_data_dir):
     """Test rate limit exceeded error"""
-    from tenacity import RetryError
-
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
     client.request_count["stock_info"] = 10000
 
-    # Rate limit check happens before retry, so it raises RetryError
-    with pytest.raises(RetryError):
+    # Rate limit is not a transient error, so it fails fast without retrying
+    with pytest.raises(KRXApiError, match="rate limit"):
         client.get_stock_info("20240101")
+    mock_get.assert_not_called()
 
 
-@patch("requests.get")
-def test_get_stock_info_by_code(mock_get):
+@patch("requests.Session.get")
+def test_get_stock_info_by_code(mock_get, temp_data_dir):
     """Test getting stock info by code"""
     mock_response = Mock()
-    mock_response.json.return_value = {
-        "OutBlock_1": [
-            {"ISU_SRT_CD": "123456", "ISU_NM": "기업A"},
-            {"ISU_SRT_CD": "789012", "ISU_NM": "기업B"},
-        ]
-    }
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {"ISU_SRT_CD": "123456", "ISU_NM": "기업A"},
+                {"ISU_SRT_CD": "789012", "ISU_NM": "기업B"},
+            ]
+        }
+    )
     mock_response.raise_for_status = Mock()
     mock_get.return_value = mock_response
 
-    client = KRXApiClient(api_key="test_key")
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
     stock = client.get_stock_info_by_code("20240101", "123456")
 
     assert stock is not None
@@ -164,3 +181,268 @@ def test_get_stock_info_by_code(mock_get):
     # Test not found
     stock_not_found = client.get_stock_info_by_code("20240101", "999999")
     assert stock_not_found is None
+
+
+@patch("requests.Session.get")
+def test_get_daily_trade_data_batch(mock_get, temp_data_dir):
+    """Test concurrent daily trade retrieval keeps dates aligned"""
+
+    def fake_get(url, params=None, **kwargs):
+        response = Mock()
+        response.content = orjson.dumps(
+            {"OutBlock_1": [{"BAS_DD": params["basDd"], "ISU_CD": "KR123456"}]}
+        )
+        response.raise_for_status = Mock()
+        return response
+
+    mock_get.side_effect = fake_get
+
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
+    dates = ["20240102", "20240103", "20240104"]
+    results = client.get_daily_trade_data_batch(dates, max_workers=3)
+
+    assert list(results) == dates
+    for date in dates:
+        assert results[date][0]["BAS_DD"] == date
+    assert client.request_count["daily_trade"] == 3
+
+
+def test_short_code_from_isu_cd():
+    """Test short code extraction from standard and short ISU_CD values"""
+    assert short_code_from_isu_cd("KR7123450001") == "123450"
+    assert short_code_from_isu_cd("KR123456") == "123456"
+    assert short_code_from_isu_cd("123456") == "123456"
+
+
+def test_cache_max_age():
+    """Test settled dates never expire while recent dates get a short max age"""
+    today = datetime.now().strftime("%Y%m%d")
+    assert cache_max_age("20240102") is None
+    assert cache_max_age(today) == RECENT_CACHE_MAX_AGE
+
+
+@patch("requests.Session.get")
+def test_get_daily_trade_by_code_exact_match(mock_get, temp_data_dir):
+    """Test trade lookup matches whole codes and fetches each date once"""
+    mock_response = Mock()
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {"ISU_CD": "KR7112345001", "ISU_NM": "기업A"},
+                {"ISU_CD": "KR7123450001", "ISU_NM": "기업B"},
+            ]
+        }
+    )
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
+
+    assert client.get_daily_trade_by_code("20240101", "123450")["ISU_NM"] == "기업B"
+    assert client.get_daily_trade_by_code("20240101", "112345")["ISU_NM"] == "기업A"
+    assert client.get_daily_trade_by_code("20240101", "234500") is None
+    mock_get.assert_called_once()
+
+
+@patch("requests.Session.get")
+def test_get_ipo_stocks_range(mock_get, temp_data_dir):
+    """Test listing dates are bucketed from a single stock info fetch"""
+    mock_response = Mock()
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {"ISU_SRT_CD": "123456", "LIST_DD": "20240102"},
+                {"ISU_SRT_CD": "234567", "LIST_DD": "20240103"},
+                {"ISU_SRT_CD": "345678", "LIST_DD": "20240102"},
+            ]
+        }
+    )
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
+    result = client.get_ipo_stocks_range("20240131", ["20240102", "20240104"])
+
+    assert [s["ISU_SRT_CD"] for s in result["20240102"]] == ["123456", "345678"]
+    assert result["20240104"] == []
+    assert len(client.get_ipo_stocks("20240131", "20240103")) == 1
+    mock_get.assert_called_once()
+
+
+@patch("requests.Session.get")
+def test_cached_responses_memoized_in_process(mock_get, temp_data_dir):
+    """Test repeated lookups for a date skip both the API and the disk cache"""
+    from src.data_collection.cache_manager import CacheManager
+
+    mock_response = Mock()
+    mock_response.content = orjson.dumps({"OutBlock_1": [{"ISU_SRT_CD": "123456"}]})
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
+    client.cache_manager = CacheManager(cache_dir=temp_data_dir)
+
+    with patch.object(
+        client.cache_manager, "get", wraps=client.cache_manager.get
+    ) as cache_get:
+        first = client.get_stock_info("20240101")
+        second = client.get_stock_info("20240101")
+
+    assert first == second == [{"ISU_SRT_CD": "123456"}]
+    mock_get.assert_called_once()
+    cache_get.assert_called_once()
+
+
+@patch("requests.Session.get")
+def test_recent_responses_not_memoized(mock_get, temp_data_dir):
+    """Test recent dates go back to the disk cache so max age still applies"""
+    from src.data_collection.cache_manager import CacheManager
+
+    mock_response = Mock()
+    mock_response.content = orjson.dumps({"OutBlock_1": [{"ISU_CD": "KR123456"}]})
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
+    client.cache_manager = CacheManager(cache_dir=temp_data_dir)
+    today = datetime.now().strftime("%Y%m%d")
+
+    with patch.object(
+        client.cache_manager, "get", wraps=client.cache_manager.get
+    ) as cache_get:
+        client.get_daily_trade_data(today)
+        client.get_daily_trade_data(today)
+
+    mock_get.assert_called_once()
+    assert cache_get.call_count == 2
+    assert client._response_memo == {}
+
+
+@patch("requests.Session.get")
+def test_get_cached_daily_trade_data_never_calls_api(mock_get, temp_data_dir):
+    """Test the cache-only lookup returns cached trades or None"""
+    from src.data_collection.cache_manager import CacheManager
+
+    client = KRXApiClient(api_key="test_key", quota_dir=temp_data_dir)
+    client.cache_manager = CacheManager(cache_dir=temp_data_dir)
+    client.cache_manager.set("daily_trade_20240102", [{"ISU_CD": "KR123456"}])
+
+    assert client.get_cached_daily_trade_data("20240102") == [{"ISU_CD": "KR123456"}]
+    assert client.get_cached_daily_trade_data("20240103") is None
+    mock_get.assert_not_called()
+
+
+@patch("requests.Session.get")
+def test_refresh_cache_refetches_cached_responses(mock_get, temp_data_dir):
+    """Test refresh_cache ignores earlier cached responses but re-caches"""
+    from src.data_collection.cache_manager import CacheManager
+
+    mock_response = Mock()
+    mock_response.content = orjson.dumps({"OutBlock_1": [{"ISU_CD": "new"}]})
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(
+        api_key="test_key", quota_dir=temp_data_dir, refresh_cache=True
+    )
+    client.cache_manager = CacheManager(cache_dir=temp_data_dir)
+    client.cache_manager.set("daily_trade_20240101", [{"ISU_CD": "old"}])
+
+    assert client.get_daily_trade_data("20240101") == [{"ISU_CD": "new"}]
+    assert client.cache_manager.get("daily_trade_20240101") == [{"ISU_CD": "new"}]
+    mock_get.assert_called_once()
+
+
+def test_shared_quota_across_clients(temp_data_dir):
+    """Test clients in different workers draw from one daily quota file"""
+    quota = SharedRequestQuota(quota_dir=temp_data_dir, limit=2)
+    other = SharedRequestQuota(quota_dir=temp_data_dir, limit=2)
+
+    assert quota.acquire("stock_info") == 1
+    assert other.acquire("stock_info") == 2
+    with pytest.raises(KRXApiError):
+        quota.acquire("stock_info")
+
+    assert other.get_counts() == {"stock_info": 2}
+    assert quota.acquire("daily_trade") == 1
+
+
+def test_shared_quota_removes_stale_files(temp_data_dir):
+    """Test the first request of a day removes earlier days' quota files"""
+    quota = SharedRequestQuota(quota_dir=temp_data_dir, limit=2)
+    stale_file = quota.quota_dir / "krx_quota_20000101.json"
+    stale_file.write_text('{"stock_info": 5}')
+
+    quota.acquire("stock_info")
+
+    assert not stale_file.exists()
+    assert quota._quota_file().exists()
+
+
+def test_quota_file_lock_without_fcntl(temp_data_dir, monkeypatch):
+    """Test the quota falls back to an in-process lock where fcntl is missing"""
+    monkeypatch.setattr(krx_client, "fcntl", None)
+    quota = SharedRequestQuota(quota_dir=temp_data_dir, limit=2)
+
+    with open(quota._quota_file(), "a+") as f:
+        with krx_client._quota_file_lock(f):
+            assert krx_client._QUOTA_FILE_LOCK.locked()
+            acquired = []
+            waiter = threading.Thread(
+                target=lambda: acquired.append(
+                    krx_client._QUOTA_FILE_LOCK.acquire(timeout=0.05)
+                )
+            )
+            waiter.start()
+            waiter.join()
+            assert acquired == [False]
+
+    assert not krx_client._QUOTA_FILE_LOCK.locked()
+    assert quota.acquire("stock_info") == 1
+    assert quota.get_counts() == {"stock_info": 1}
+
+
+@patch("requests.Session.get")
+def test_get_daily_trade_data_as_dataframe(mock_get, temp_data_dir):
+    """Test trade data is returned with numeric columns parsed"""
+    mock_response = Mock()
+    mock_response.content = orjson.dumps(
+        {
+            "OutBlock_1": [
+                {"ISU_CD": "123456", "TDD_CLSPRC": "50,000", "ACC_TRDVOL": "1000"},
+                {"ISU_CD": "234567", "TDD_CLSPRC": "-", "ACC_TRDVOL": ""},
+            ]
+        }
+    )
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
+    df = client.get_daily_trade_data("20240101", return_dataframe=True)
+
+    assert df["TDD_CLSPRC"].dtype == "float32"
+    assert df["ACC_TRDVOL"].dtype == "int64"
+    assert df["TDD_CLSPRC"].tolist() == [50000.0, 0.0]
+    assert df["ACC_TRDVOL"].tolist() == [1000, 0]
+    assert df["ISU_CD"].tolist() == ["123456", "234567"]
+
+
+@patch("src.api.retry.time.sleep")
+@patch("requests.Session.get")
+def test_only_transient_errors_retried(mock_get, mock_sleep, temp_data_dir):
+    """Test 5xx responses are retried and 4xx responses fail fast"""
+    import requests
+
+    client = KRXApiClient(api_key="test_key", use_cache=False, quota_dir=temp_data_dir)
+
+    mock_get.side_effect = requests.exceptions.HTTPError(response=Mock(status_code=503))
+    with pytest.raises(KRXTransientError):
+        client.get_stock_info("20240101")
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+
+    mock_get.reset_mock()
+    mock_get.side_effect = requests.exceptions.HTTPError(response=Mock(status_code=404))
+    with pytest.raises(KRXApiError):
+        client.get_stock_info("20240102")
+    assert mock_get.call_count == 1
@@ -40,3 +40,11 @@ class TestSettings:
         assert Settings.DATA_PROCESSED_DIR == "data/processed"
         assert Settings.MODELS_DIR == "models"
         assert Settings.OUTPUT_DIR == "output"
+
+    def test_settings_instance_read_only(self):
+        """Test the shared settings instance cannot be modified"""
+        from src.config.settings import settings
+
+        with pytest.raises(AttributeError):
+            settings.ENVIRONMENT = "production"
+        assert settings.ENVIRONMENT == "development"
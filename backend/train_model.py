@@ -9,6 +9,7 @@ import argparse
 from datetime import datetime
 from src.features.feature_engineering import IPOFeatureEngineer
 from src.models.ipo_predictor import IPOPricePredictor
+from src.utils.dataframe_io import load_dataset
 import logging
 
 # Setup logging
@@ -43,7 +44,7 @@ def main():
     print("=" * 80)
 
     input_file = args.data_path
-    df = pd.read_csv(input_file)
+    df = load_dataset(input_file)
 
     print(f"Loaded {len(df)} enhanced IPO records (with KIS API indicators)")
     print(f"Date range: {df['listing_date'].min()} to {df['listing_date'].max()}")
@@ -51,14 +52,10 @@ def main():
 
     # Filter out SPAC companies
     initial_count = len(df)
-    df = df[
-        (~df["company_name"].str.contains("기업인수목적", na=False))
-        & (
-            ~df.get("industry", pd.Series([""] * len(df))).str.contains(
-                "SPAC", na=False
-            )
-        )
-    ]
+    is_spac = df["company_name"].str.contains("기업인수목적", na=False, regex=False)
+    if "industry" in df.columns:
+        is_spac |= df["industry"].str.contains("SPAC", na=False, regex=False)
+    df = df[~is_spac]
     spac_count = initial_count - len(df)
     if spac_count > 0:
         print(f"Filtered out {spac_count} SPAC companies")
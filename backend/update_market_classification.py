@@ -1,6 +1,8 @@
 """Update listing_method in existing datasets with correct market classification"""
 import pandas as pd
 
+from src.utils.dataframe_io import load_dataset, save_dataset
+
 # Load market classification data
 df_market = pd.read_csv('data/raw/38_market_classification.csv')
 
@@ -23,7 +25,7 @@ datasets = [
 
 for dataset_path in datasets:
     try:
-        df = pd.read_csv(dataset_path)
+        df = load_dataset(dataset_path)
         print(f"\n{'='*80}")
         print(f"Updating: {dataset_path}")
         print(f"{'='*80}")
@@ -72,7 +74,7 @@ for dataset_path in datasets:
         print(df_updated['listing_method'].value_counts())
 
         # Save updated dataset
-        df_updated.to_csv(dataset_path, index=False, encoding='utf-8-sig')
+        save_dataset(df_updated, dataset_path, bom=True)
         print(f"\n✅ Saved updated dataset to: {dataset_path}")
 
     except Exception as e:
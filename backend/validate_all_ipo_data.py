@@ -6,6 +6,8 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from src.utils.dataframe_io import load_dataset
+
 
 def main():
     print("=" * 80)
@@ -14,7 +16,7 @@ def main():
     print()
 
     # Load datasets
-    full_dataset = pd.read_csv("data/raw/ipo_full_dataset_2022_2025.csv")
+    full_dataset = load_dataset("data/raw/ipo_full_dataset_2022_2025.csv")
     subscription_data = pd.read_csv("data/raw/38_subscription_data.csv")
 
     print(f"Full dataset: {len(full_dataset)} records")